@@ -0,0 +1,268 @@
+import os
+import pathlib
+import argparse
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from concurrent.futures import ProcessPoolExecutor
+
+from toolviper.utils import logger
+
+from mio.core import binary
+from mio.core.casams import CasaMeasurementSet, read_sync_data
+from mio.managers.managers import cell_shape
+from mio.utilities import types
+
+from typing import Union
+
+SCHEMA = pa.schema([
+    pa.field("path", pa.string(), nullable=False),
+    pa.field("mtime_ns", pa.int64(), nullable=False),
+    pa.field("size_bytes", pa.int64()),
+    pa.field("nrows", pa.int64()),
+    pa.field("columns", pa.list_(pa.string())),
+    pa.field("value_types", pa.list_(pa.string())),
+    pa.field("shapes", pa.list_(pa.list_(pa.int64()))),
+    pa.field("managers", pa.list_(pa.string())),
+    pa.field("subtables", pa.list_(pa.string())),
+    pa.field("subtable_rows", pa.list_(pa.int64())),
+    pa.field("error", pa.string()),
+])
+
+
+def find_tables(root: Union[str, pathlib.Path]):
+    """
+    Walk a directory tree and yield every table directory (holding a table.dat). Tables are not descended into, their
+    subtables are described with the table itself.
+    """
+    for directory, names, files in os.walk(root):
+        if "table.dat" in files:
+            names.clear()
+            yield pathlib.Path(directory)
+
+        else:
+            names.sort()
+
+
+def modification_time(directory: pathlib.Path) -> int:
+    """
+    Latest modification time of the table.* files of a table and its subtables (every directory below it) and of
+    the directories themselves. Any write to the table or to one of its subtables changes it, as does adding or
+    removing a file.
+    """
+    latest = 0
+
+    for path, _, files in os.walk(directory):
+        names = [os.curdir] + [name for name in files if name.startswith("table.")]
+
+        for name in names:
+            try:
+                latest = max(latest, os.stat(os.path.join(path, name)).st_mtime_ns)
+
+            except OSError:
+                pass
+
+    return latest
+
+
+def disk_size(directory: pathlib.Path) -> int:
+    size = 0
+
+    for path, _, files in os.walk(directory):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(path, name)).st_size
+
+            except OSError:
+                pass
+
+    return size
+
+
+def table_rows(filename: pathlib.Path) -> int:
+    """
+    Number of rows of a table without parsing its table.dat. casacore doesn't rewrite table.dat when rows are
+    added, the number of rows is taken from the sync record of table.lock and only read from the start of table.dat
+    for tables without one.
+    """
+    sync = read_sync_data(str(filename))
+
+    if sync is not None:
+        return sync.nrows
+
+    handle = binary.open_file(str(filename))
+
+    try:
+        handle.header()
+
+        return int(handle.integer(size=types.FOUR_BYTES, dtype=np.int32))
+
+    finally:
+        handle.close()
+
+
+def describe(directory: pathlib.Path, mtime_ns: int) -> dict:
+    """
+    Catalog entry of a single table, errors are recorded in the entry instead of raised so one broken table doesn't
+    stop a scan.
+    """
+    entry = {name: None for name in SCHEMA.names}
+    entry.update(path=str(directory), mtime_ns=mtime_ns)
+
+    try:
+        measurement_set = CasaMeasurementSet(str(directory.joinpath("table.dat")), memory_map=True)
+        measurement_set.read()
+        measurement_set.close()
+
+        plain_columns = {column.name: column for column in measurement_set.column_set.columns}
+        managers = {}
+
+        for plain_column in measurement_set.column_set.columns:
+            manager = measurement_set.column_set.data_managers[plain_column.data.sequence_number]
+            managers[plain_column.name] = type(manager).__name__
+
+        shapes = []
+
+        for description in measurement_set.description:
+            shape = cell_shape(description, plain_columns.get(description.name))
+            shapes.append(list(shape) if shape is not None else ([] if description.ndims == 0 else None))
+
+        keywords = measurement_set.table.keywords
+        subtables = [
+            name for name, record_type in zip(keywords.description.names, keywords.description.types)
+            if record_type == "table" and pathlib.Path(keywords.records[name]).joinpath("table.dat").is_file()
+        ]
+
+        entry.update(
+            size_bytes=disk_size(directory),
+            nrows=int(measurement_set.nrows),
+            columns=[description.name for description in measurement_set.description],
+            value_types=[description.value_type for description in measurement_set.description],
+            shapes=shapes,
+            managers=[managers.get(description.name) for description in measurement_set.description],
+            subtables=subtables,
+            subtable_rows=[
+                table_rows(pathlib.Path(keywords.records[name]).joinpath("table.dat")) for name in subtables
+            ]
+        )
+
+    except Exception as error:
+        entry["error"] = f"{type(error).__name__}: {error}"
+
+    return entry
+
+
+def load_catalog(output: pathlib.Path) -> dict:
+    """
+    :return: dict
+        Entries of an existing catalog by path, empty when there is none or it can't be read.
+    """
+    if not output.exists():
+        return {}
+
+    try:
+        return {entry["path"]: entry for entry in pq.read_table(output, schema=SCHEMA).to_pylist()}
+
+    except Exception as error:
+        logger.warning(f"Ignoring unreadable catalog {output}: {error}")
+        return {}
+
+
+def write_catalog(output: pathlib.Path, entries: list):
+    table = pa.Table.from_pylist(entries, schema=SCHEMA)
+
+    # Write to a temporary file first so an interrupted scan leaves the previous catalog intact.
+    descriptor, temporary = tempfile.mkstemp(dir=output.parent, suffix=".tmp")
+    os.close(descriptor)
+
+    try:
+        pq.write_table(table, temporary)
+        os.replace(temporary, output)
+
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def scan(
+        root: Union[str, pathlib.Path],
+        output: Union[str, pathlib.Path] = "catalog.parquet",
+        workers: int = None,
+        incremental: bool = True
+) -> pa.Table:
+    """
+    Catalog every table below a directory: rows, columns with their value types, cell shapes and storage managers,
+    subtables with their rows, and the size on disk. The table.dat files are parsed in a process pool.
+
+    :param root: str
+        Directory tree to scan.
+    :param output: str
+        Parquet file holding the catalog.
+    :param workers: int
+        Number of worker processes, defaults to the number of CPUs.
+    :param incremental: bool
+        Keep the entries of an existing catalog for tables whose files haven't been modified since, only new and
+        modified tables are parsed. Tables that no longer exist are dropped.
+    :return: pa.Table
+        The catalog.
+    """
+    output = pathlib.Path(output).resolve()
+    previous = load_catalog(output) if incremental else {}
+
+    entries = {}
+    pending = []
+
+    for directory in find_tables(root):
+        directory = directory.resolve()
+        mtime_ns = modification_time(directory)
+
+        entry = previous.get(str(directory))
+
+        if entry is not None and entry["mtime_ns"] == mtime_ns and entry["error"] is None:
+            entries[str(directory)] = entry
+
+        else:
+            pending.append((directory, mtime_ns))
+
+    logger.info(f"Cataloging {len(pending)} tables, {len(entries)} unchanged")
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            described = executor.map(
+                describe,
+                [directory for directory, _ in pending],
+                [mtime_ns for _, mtime_ns in pending],
+                chunksize=max(1, len(pending) // (4 * (workers or os.cpu_count() or 1)))
+            )
+
+            for entry in described:
+                if entry["error"] is not None:
+                    logger.warning(f"Failed to catalog {entry['path']}: {entry['error']}")
+
+                entries[entry["path"]] = entry
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_catalog(output, [entries[path] for path in sorted(entries)])
+
+    return pq.read_table(output)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Catalog the casacore tables below a directory into Parquet.")
+    parser.add_argument("root", help="Directory tree to scan.")
+    parser.add_argument("--output", default="catalog.parquet", help="Parquet file holding the catalog.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--full", action="store_true", help="Parse every table, even unchanged ones.")
+
+    arguments = parser.parse_args(argv)
+
+    catalog = scan(arguments.root, output=arguments.output, workers=arguments.workers, incremental=not arguments.full)
+
+    print(f"{catalog.num_rows} tables in {arguments.output}")
+
+
+if __name__ == "__main__":
+    main()
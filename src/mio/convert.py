@@ -0,0 +1,278 @@
+import pathlib
+
+import numpy as np
+import zarr
+
+from concurrent.futures import ThreadPoolExecutor
+
+from dask.utils import parse_bytes
+from toolviper.utils import logger
+
+from mio import reader
+
+from typing import Union
+
+# Bytes per row assumed for variable length strings when sizing chunks.
+STRING_ROW_BYTES: int = 64
+
+# Rows whose cells are read to estimate the size of the rows of a variable shape column.
+SAMPLE_ROWS: int = 64
+
+
+def find_subtables(path: pathlib.Path) -> list:
+    """
+    Subtables (ANTENNA, SPECTRAL_WINDOW, ...) are tables stored in sub directories of the main table.
+    """
+    return sorted(entry for entry in path.iterdir() if entry.joinpath("table.dat").is_file())
+
+
+def row_bytes(column: reader.Column) -> int:
+    itemsize = column.dtype.itemsize
+
+    if column.description.value_type == "string":
+        itemsize = column.description.max_length if column.description.max_length > 0 else STRING_ROW_BYTES
+
+    return int(np.prod(column.cell_shape, dtype=np.int64)) * max(itemsize, 1)
+
+
+def sampled_row_bytes(column: reader.Column) -> int:
+    """
+    Bytes per row of a variable shape column, estimated from the largest of its first SAMPLE_ROWS cells.
+    """
+    cells = column.cells(rows=slice(0, min(len(column), SAMPLE_ROWS)))
+
+    if len(cells) == 0:
+        return 1
+
+    return int(np.max(np.diff(cells.offsets))) * max(cells.values.dtype.itemsize, 1)
+
+
+def table_columns(table: reader.Table) -> tuple:
+    """
+    :return: tuple
+        Names of the columns with a fixed cell shape and of the indirect columns without one, of which the storage
+        managers can decode the values. Variable shape columns are written per cell shape, see write_cells(), other
+        columns are logged and left out.
+    """
+    fixed, variable = [], []
+
+    for name in table.columns:
+        column = table[name]
+
+        try:
+            if column.cell_shape is None:
+                column.cells(rows=slice(0, 0))
+                variable.append(name)
+
+            else:
+                column.read(rows=slice(0, 0))
+                fixed.append(name)
+
+        except NotImplementedError as error:
+            logger.warning(f"Skipping column {name} of {table.path.name}: {error}")
+
+    return fixed, variable
+
+
+def chunk_rows(table: reader.Table, columns: list, budget: int, variable: list = ()) -> int:
+    """
+    Rows per chunk so that decoding one column chunk stays within the budget, a chunk is held twice while it is
+    decoded (raw and native byte order). The size is rounded down to whole time integrations when the table has a
+    TIME column with a constant number of rows per integration.
+    """
+    largest = max(
+        [row_bytes(table[name]) for name in columns] + [sampled_row_bytes(table[name]) for name in variable],
+        default=1
+    )
+    rows = max(int(budget // (2 * largest)), 1)
+
+    if "TIME" in columns and table.nrows > 0:
+        runs = table["TIME"].runs(rows=slice(0, min(table.nrows, rows + 1)))
+
+        if runs.values.size > 1:
+            integration = int(runs.lengths()[0])
+
+            if rows >= integration:
+                rows = (rows // integration) * integration
+
+    return max(min(rows, table.nrows), 1)
+
+
+def create_arrays(group: zarr.Group, table: reader.Table, columns: list, rows: int):
+    for name in columns:
+        column = table[name]
+        shape = (table.nrows,) + column.cell_shape
+
+        dtype = str if column.dtype.kind == "U" else column.dtype
+
+        group.create_array(
+            name,
+            shape=shape,
+            chunks=(rows,) + column.cell_shape,
+            dtype=dtype,
+            dimension_names=["row"] + [f"{name.lower()}_dim_{axis}" for axis in range(len(column.cell_shape))],
+            overwrite=True
+        )
+
+
+def shape_key(shape: tuple) -> str:
+    return "x".join(str(axis) for axis in shape) if len(shape) > 0 else "scalar"
+
+
+def write_cells(group: zarr.Group, name: str, cells, start: int, rows: int):
+    """
+    Append the cells of a chunk of a variable shape column. The column is a group holding a subgroup per cell shape
+    (e.g. VAR/16x4), with the table rows of its cells ("rows") and the cells stacked into one array ("values").
+    """
+    column_group = group.require_group(name)
+
+    for shape, (numbers, values) in cells.groups().items():
+        key = shape_key(shape)
+
+        if key not in column_group:
+            shape_group = column_group.create_group(key)
+            shape_group.attrs["shape"] = list(shape)
+
+            shape_group.create_array("rows", shape=(0,), chunks=(rows,), dtype=np.int64, dimension_names=["cell"])
+            shape_group.create_array(
+                "values",
+                shape=(0,) + shape,
+                chunks=(rows,) + tuple(max(axis, 1) for axis in shape),
+                dtype=str if values.dtype.kind == "U" else values.dtype,
+                dimension_names=["cell"] + [f"{name.lower()}_dim_{axis}" for axis in range(len(shape))]
+            )
+
+        shape_group = column_group[key]
+        shape_group["rows"].append(numbers + start)
+        shape_group["values"].append(values.astype(object) if values.dtype.kind == "U" else values)
+
+
+def truncate_cells(group: zarr.Group, name: str, stop: int):
+    """
+    Drop the cells of rows from `stop` on, appended by a conversion interrupted in the middle of a chunk.
+    """
+    if name not in group:
+        return
+
+    for _, shape_group in group[name].groups():
+        keep = int(np.searchsorted(shape_group["rows"][:], stop))
+
+        shape_group["rows"].resize((keep,))
+        shape_group["values"].resize((keep,) + shape_group["values"].shape[1:])
+
+
+def convert_table(path: pathlib.Path, group: zarr.Group, budget: int, resume: bool = True) -> zarr.Group:
+    """
+    Stream the columns of a single table into a zarr group, one row chunk at a time. Progress is kept in the group
+    attributes so an interrupted conversion restarts at the first unfinished chunk. Variable shape columns are
+    written per cell shape, see write_cells().
+
+    :param path: pathlib.Path
+        Table directory.
+    :param group: zarr.Group
+        Destination group.
+    :param budget: int
+        Memory budget in bytes.
+    :param resume: bool
+        Continue a previous conversion of the same table into the group.
+    :return: zarr.Group
+    """
+    with reader.open(path) as table:
+        columns, variable = table_columns(table)
+        rows = chunk_rows(table, columns, budget, variable)
+
+        source = {
+            "source": str(table.path), "nrows": int(table.nrows), "chunk_rows": rows, "columns": columns,
+            "variable_columns": variable
+        }
+        progress = dict(group.attrs.get("mio", {}))
+
+        if resume and all(progress.get(key) == value for key, value in source.items()):
+            completed = int(progress.get("completed", 0))
+
+            for name in variable:
+                truncate_cells(group, name, completed * rows)
+
+        else:
+            create_arrays(group, table, columns, rows)
+            completed = 0
+
+            for name in variable:
+                if name in group:
+                    del group[name]
+
+        nchunks = -(-table.nrows // rows)
+
+        if completed > 0:
+            logger.info(f"Resuming {table.path.name} at chunk {completed} of {nchunks}")
+
+        for chunk in range(completed, nchunks):
+            start = chunk * rows
+            stop = min(start + rows, table.nrows)
+
+            for name in columns:
+                values = table[name].read(rows=slice(start, stop))
+                group[name][start:stop] = values.astype(object) if values.dtype.kind == "U" else values
+
+            for name in variable:
+                write_cells(group, name, table[name].cells(rows=slice(start, stop)), start, rows)
+
+            group.attrs["mio"] = {**source, "completed": chunk + 1}
+
+        group.attrs["mio"] = {**source, "completed": nchunks}
+
+    return group
+
+
+def convert(
+        path: Union[str, pathlib.Path],
+        store,
+        memory_budget: Union[int, str] = "512MiB",
+        subtables: bool = True,
+        workers: int = 4,
+        resume: bool = True
+) -> zarr.Group:
+    """
+    Convert a measurement set into zarr, readable with xarray.open_zarr(store) for the main table and
+    xarray.open_zarr(store, group=<SUBTABLE>) for the subtables.
+
+    :param path: str
+        Measurement set directory.
+    :param store: str or zarr store
+        Destination zarr store.
+    :param memory_budget: int or str
+        Peak memory used for decoding, e.g. "2GiB". It is shared by the tables converted concurrently.
+    :param subtables: bool
+        Also convert the subtables, in parallel with the main table.
+    :param workers: int
+        Number of subtables converted concurrently.
+    :param resume: bool
+        Continue an interrupted conversion into the same store.
+    :return: zarr.Group
+        Root group holding the main table.
+    """
+    path = pathlib.Path(path).resolve()
+
+    if path.name == "table.dat":
+        path = path.parent
+
+    root = zarr.open_group(store, mode="a" if resume else "w")
+
+    names = find_subtables(path) if subtables else []
+    budget = parse_bytes(memory_budget) if isinstance(memory_budget, str) else int(memory_budget)
+    budget = budget // (min(workers, len(names)) + 1) if names else budget
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        futures = [
+            executor.submit(convert_table, subtable, root.require_group(subtable.name), budget, resume)
+            for subtable in names
+        ]
+
+        convert_table(path, root, budget, resume)
+
+        for future in futures:
+            future.result()
+
+    zarr.consolidate_metadata(root.store)
+
+    return root
@@ -1,4 +1,16 @@
+from . import decode
+from . import packed
 from . import binary
 from . import table
 from . import casams
-from . import block
\ No newline at end of file
+from . import block
+from . import graph
+from . import cache
+from . import arrow
+from . import stats
+from . import lru
+from . import index
+from . import selection
+from . import chunks
+from . import shared
+from . import averaging
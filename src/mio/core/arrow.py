@@ -0,0 +1,76 @@
+import numpy as np
+import pyarrow as pa
+
+# Arrow has no complex type, complex values are exported as fixed size lists of (real, imaginary) pairs.
+COMPLEX_TYPE = {
+    np.dtype(np.complex64): np.dtype(np.float32),
+    np.dtype(np.complex128): np.dtype(np.float64),
+}
+
+
+def primitive_array(values: np.ndarray) -> pa.Array:
+    """
+    Wrap a flat numpy array as an Arrow array without copying, only booleans are packed into Arrow's bitmap.
+    """
+    if values.dtype == bool:
+        bitmap = np.packbits(values, bitorder="little")
+
+        return pa.Array.from_buffers(pa.bool_(), values.size, [None, pa.py_buffer(bitmap)])
+
+    values = np.ascontiguousarray(values)
+
+    return pa.Array.from_buffers(pa.from_numpy_dtype(values.dtype), values.size, [None, pa.py_buffer(values)])
+
+
+def to_arrow(values: np.ndarray) -> pa.Array:
+    """
+    :param values: np.ndarray
+        Column values with the row axis first.
+    :return: pa.Array
+        Scalars as primitive arrays, strings as string arrays and cells as (nested) FixedSizeList arrays with the
+        last numpy axis innermost.
+    """
+    if values.dtype.kind in ("U", "S", "O"):
+        if values.ndim != 1:
+            raise NotImplementedError("String array columns can't be exported to arrow")
+
+        return pa.array(values, type=pa.string())
+
+    shape = values.shape[1:]
+
+    if values.dtype in COMPLEX_TYPE:
+        values = np.ascontiguousarray(values).view(COMPLEX_TYPE[values.dtype])
+        shape = shape + (2,)
+
+    array = primitive_array(values.reshape(-1))
+
+    for length in shape[::-1]:
+        array = pa.FixedSizeListArray.from_arrays(array, length)
+
+    return array
+
+
+def column_field(name: str, values: np.ndarray, array: pa.Array) -> pa.Field:
+    metadata = {}
+
+    if values.ndim > 1:
+        metadata["shape"] = ",".join(str(length) for length in values.shape[1:])
+
+    if values.dtype in COMPLEX_TYPE:
+        metadata["complex"] = "true"
+
+    return pa.field(name, array.type, nullable=False, metadata=metadata or None)
+
+
+def record_batch(names: list, columns: list) -> pa.RecordBatch:
+    """
+    :param names: list
+        Column names.
+    :param columns: list
+        Decoded numpy values of the columns, with the same number of rows.
+    :return: pa.RecordBatch
+    """
+    arrays = [to_arrow(values) for values in columns]
+    schema = pa.schema([column_field(name, values, array) for name, values, array in zip(names, columns, arrays)])
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
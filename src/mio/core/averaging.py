@@ -0,0 +1,219 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.core.casams import CasaMeasurementSet
+from mio.utilities import tools
+
+# Columns whose values must match for rows to be averaged together over time, those present in the table are used.
+BASELINE_COLUMNS: list = ["ANTENNA1", "ANTENNA2", "FEED1", "FEED2", "DATA_DESC_ID", "FIELD_ID", "SCAN_NUMBER"]
+
+# Rows are read and reduced in blocks of about this many bytes, aligned to the buckets or tiles of the column.
+BLOCK_BYTES: int = 2 ** 24
+
+
+@dataclass(init=False)
+class AveragedColumn:
+    """
+    Column averaged (or decimated) over channels and time. Row i of the output combines the input rows mapped to it,
+    rows[i] is the first of them, e.g. to look up ANTENNA1 or TIME of the output rows.
+    """
+    values: np.ndarray
+    flags: np.ndarray
+    weights: np.ndarray
+    rows: np.ndarray
+
+
+def column_names(measurement_set: CasaMeasurementSet) -> list:
+    return [description.name for description in measurement_set.description]
+
+
+def output_rows(measurement_set: CasaMeasurementSet, time_bin: float) -> tuple:
+    """
+    Map the input rows to output rows, rows of the same baseline (see BASELINE_COLUMNS) whose TIME falls in the same
+    bin of time_bin seconds share an output row. Output rows are ordered by their first input row.
+
+    :return: tuple
+        Output row of every input row and first input row of every output row.
+    """
+    nrows = int(measurement_set.nrows)
+
+    if time_bin is None:
+        rows = np.arange(nrows, dtype=np.int64)
+
+        return rows, rows
+
+    time = measurement_set.read_column("TIME")
+    keys = [np.floor((time - time.min()) / time_bin).astype(np.int64)] if nrows > 0 else [np.zeros(0, np.int64)]
+
+    present = column_names(measurement_set)
+
+    for name in BASELINE_COLUMNS:
+        if name in present:
+            keys.append(measurement_set.read_column(name).astype(np.int64))
+
+    _, first, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_index=True, return_inverse=True)
+
+    # Number the groups in the order of their first row.
+    order = np.argsort(first, kind="stable")
+    number = np.empty_like(order)
+    number[order] = np.arange(order.size)
+
+    return number[inverse.ravel()], first[order].astype(np.int64)
+
+
+def cell_weights(weights: np.ndarray, shape: tuple) -> np.ndarray:
+    """
+    Broadcast a block of weights, e.g. WEIGHT (nrows, ncorr) or WEIGHT_SPECTRUM (nrows, nchan, ncorr), against a block
+    of values of the given shape.
+    """
+    if weights.shape == shape:
+        return weights
+
+    if weights.shape == shape[:1] + shape[2:]:
+        return np.expand_dims(weights, 1)
+
+    if weights.shape == shape[:1]:
+        return weights.reshape(shape[:1] + (1,) * (len(shape) - 1))
+
+    raise ValueError(f"Weights of shape {weights.shape[1:]} don't match cells of shape {shape[1:]}")
+
+
+def average(
+        measurement_set: CasaMeasurementSet,
+        name: str,
+        channels: int = 1,
+        time_bin: float = None,
+        decimate: bool = False,
+        flag: str = "FLAG",
+        flag_row: str = "FLAG_ROW",
+        weight: str = "WEIGHT",
+        block_bytes: int = BLOCK_BYTES
+) -> AveragedColumn:
+    """
+    Average a visibility like column (cells of (channel, ...) in numpy order) over bins of channels and time while
+    it is read. The column is read in blocks aligned to its buckets or tiles and every block is reduced before the
+    next one is read, only the reduced output is allocated for the whole table. Its shape follows from the cell shape
+    of the column description and its type from the value type.
+
+    The mean is weighted and leaves flagged samples out: sum(w * v) / sum(w) over the unflagged samples of a bin.
+    Bins without unflagged samples are flagged and zero.
+
+    :param name: str
+        Column name, e.g. DATA or CORRECTED_DATA.
+    :param channels: int
+        Number of adjacent channels averaged together, the last bin may hold fewer.
+    :param time_bin: float
+        Seconds of TIME averaged together per baseline, None keeps the rows.
+    :param decimate: bool
+        Keep the first channel and row of every bin instead of averaging them.
+    :param flag: str
+        Flag column of the same cell shape, None or missing to use no flags.
+    :param flag_row: str
+        Row flag column, None or missing to use no row flags.
+    :param weight: str
+        Weight column, per correlation (WEIGHT) or per sample (WEIGHT_SPECTRUM). None or missing weighs all
+        samples equally.
+    :param block_bytes: int
+        Preferred size of the blocks of rows read at a time.
+    :return: AveragedColumn
+    """
+    manager = measurement_set.data_manager(name)
+    description = manager.columns[name]
+
+    dtype = tools.column_dtype(description.value_type)
+    shape = manager.shapes[name]
+
+    if dtype.kind not in "iufc":
+        raise ValueError(f"Can't average column {name} of type {description.value_type}")
+
+    if shape is None:
+        raise ValueError(f"Column {name} has no fixed cell shape")
+
+    if channels < 1 or (channels > 1 and len(shape) == 0):
+        raise ValueError(f"Can't average {name} over {channels} channels")
+
+    present = column_names(measurement_set)
+    flag = flag if flag in present else None
+    flag_row = flag_row if flag_row in present else None
+    weight = weight if weight in present else None
+
+    nrows = int(measurement_set.nrows)
+    out_rows, first_rows = output_rows(measurement_set, time_bin)
+
+    # Output sized up front from the cell shape of the column.
+    edges = np.arange(0, shape[0], channels) if len(shape) > 0 else np.zeros(0, dtype=np.int64)
+    out_shape = (first_rows.size,) + ((edges.size,) + tuple(shape[1:]) if len(shape) > 0 else tuple())
+
+    accumulator = np.complex128 if dtype.kind == "c" else np.float64
+    sums = np.zeros(out_shape, dtype=dtype if decimate else accumulator)
+    weights = np.zeros(out_shape, dtype=np.float64)
+
+    row_bytes = max(manager.row_bytes(name), 1)
+    boundaries = tools.snap_boundaries(manager.row_boundaries(name), nrows, max(1, block_bytes // row_bytes))
+
+    for start, stop in zip(boundaries[:-1], boundaries[1:]):
+        rows = slice(int(start), int(stop))
+
+        values = measurement_set.read_column(name, rows=rows)
+        valid = np.ones(values.shape, dtype=bool)
+
+        if flag is not None:
+            valid &= ~measurement_set.read_column(flag, rows=rows)
+
+        if flag_row is not None:
+            valid &= ~measurement_set.read_column(flag_row, rows=rows).reshape((-1,) + (1,) * len(shape))
+
+        sample_weights = valid.astype(np.float64)
+
+        if weight is not None:
+            sample_weights *= cell_weights(measurement_set.read_column(weight, rows=rows), values.shape)
+
+        block_rows = out_rows[rows]
+
+        if decimate:
+            # First row of every bin, first channel of every channel bin.
+            keep = np.flatnonzero(first_rows[block_rows] == np.arange(rows.start, rows.stop))
+
+            if len(shape) > 0:
+                values, sample_weights = values[:, ::channels], sample_weights[:, ::channels]
+
+            sums[block_rows[keep]] = values[keep]
+            weights[block_rows[keep]] = sample_weights[keep]
+
+            continue
+
+        weighted = values * sample_weights
+
+        if channels > 1:
+            weighted = np.add.reduceat(weighted, edges, axis=1)
+            sample_weights = np.add.reduceat(sample_weights, edges, axis=1)
+
+        if time_bin is None:
+            sums[rows] = weighted
+            weights[rows] = sample_weights
+
+            continue
+
+        # Sum the rows of each output row of the block, a bin may continue in the next block.
+        order = np.argsort(block_rows, kind="stable")
+        ordered = block_rows[order]
+        starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+
+        sums[ordered[starts]] += np.add.reduceat(weighted[order], starts, axis=0)
+        weights[ordered[starts]] += np.add.reduceat(sample_weights[order], starts, axis=0)
+
+    flags = weights <= 0
+
+    if not decimate:
+        # Divided in place, the output is the only array of its size besides the weights.
+        np.divide(sums, weights, out=sums, where=~flags)
+        sums[flags] = 0
+
+    averaged = AveragedColumn()
+    averaged.values = sums.astype(dtype, copy=False)
+    averaged.flags = flags
+    averaged.weights = weights
+    averaged.rows = first_rows
+
+    return averaged
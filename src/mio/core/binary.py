@@ -1,3 +1,4 @@
+import mmap
 import struct
 import numpy as np
 
@@ -5,12 +6,29 @@ import graphviper.utils.logger as logger
 
 from io import FileIO
 
+from mio.core import decode
 from mio.utilities import types
 
+# Compiled struct.Struct objects keyed by the full format string (endianess included). Building the format string
+# and parsing it on every call was a measurable fraction of the table.dat parse time.
+_STRUCT_CACHE = {}
+
+
+def get_struct(fmt: str) -> struct.Struct:
+    unpacker = _STRUCT_CACHE.get(fmt)
+
+    if unpacker is None:
+        unpacker = _STRUCT_CACHE[fmt] = struct.Struct(fmt)
+
+    return unpacker
+
 
 class BinaryFileReader(FileIO):
     logger.get_logger().setLevel('DEBUG')
 
+    # IOStats collecting the reads of instrumented readers, see open_file().
+    stats = None
+
     def __init__(self, file, mode):
         super().__init__(file, mode)
         self.filename = file
@@ -28,9 +46,11 @@ class BinaryFileReader(FileIO):
         logger.debug("Reading magic code ...")
 
     def _check_endianess(self):
+        # The first byte of the (small) object length following the magic code is zero only for big endian files.
         if self.read(types.ONE_BYTE) == b"\x00":
             self.endian = ">"
-            self.seek(types.FOUR_BYTES)
+
+        self.seek(types.FOUR_BYTES)
 
         logger.debug(f"Reading endianess ... {self.endian}")
 
@@ -66,30 +86,40 @@ class BinaryFileReader(FileIO):
         :return: int
             Converted data buffer.
         """
-        return dtype(struct.unpack(f"{self.endian}{types.BUFFER_FORMAT[dtype.__name__]}", self.read(size))[0])
+        return dtype(get_struct(self.endian + types.BUFFER_FORMAT[dtype.__name__]).unpack(self.read(size))[0])
 
     def float(self, size, dtype):
-        return dtype(struct.unpack(f"{self.endian}{types.BUFFER_FORMAT[dtype.__name__]}", self.read(size))[0])
+        return dtype(get_struct(self.endian + types.BUFFER_FORMAT[dtype.__name__]).unpack(self.read(size))[0])
 
     def complex(self, size, dtype):
         csize = types.EIGHT_BYTES if size == types.SIXTEEN_BYTES else types.FOUR_BYTES
         ctype = np.float64 if size == types.SIXTEEN_BYTES else np.float32
 
-        return dtype(self.float(size=csize, dtype=ctype) + ij * self.float(size=csize, dtype=ctype))
+        return dtype(self.float(size=csize, dtype=ctype) + 1j * self.float(size=csize, dtype=ctype))
 
     def array(self, atype):
+        start = self.tell()
         self.header()
 
         ndim = self.integer(size=types.FOUR_BYTES, dtype=np.int32)
-        shape = [self.integer(size=types.FOUR_BYTES, dtype=np.int32) for _ in range(ndim)]
+        shape = self.position_values(ndim).tolist()
         size = self.integer(size=types.FOUR_BYTES, dtype=np.int32)
 
-        if atype == 'string':
+        if atype == 'string' and size < decode.KERNEL_THRESHOLD:
             array = np.array([self.string(size=types.FOUR_BYTES) for i in range(size)])
 
+        elif atype == 'string':
+            # The object length bounds the strings, read them with a single call and decode them in one pass.
+            position = self.tell()
+            self.seek(start)
+            end = start + self.integer(size=types.FOUR_BYTES, dtype=np.uint32)
+            self.seek(position)
+
+            array, _ = decode.strings(self.read(end - position), 0, size, self.endian)
+
         elif atype == 'bool':
-            length = int(np.ceil(size / 8)) * 8
-            array = np.unpackbits(
+            length = -(-size // 8)
+            array = decode.bits(self.read(length), size) if size >= decode.KERNEL_THRESHOLD else np.unpackbits(
                 np.frombuffer(self.read(length), dtype='uint8'), bitorder='little'
             ).astype(bool)[:size]
 
@@ -105,8 +135,285 @@ class BinaryFileReader(FileIO):
 
         return array
 
+    def position_values(self, length, size=types.FOUR_BYTES):
+        return np.frombuffer(self.read(length * size), dtype=f"{self.endian}i{size}").astype(int)
+
     def position(self, size, dtype):
         table_type, version = self.header()
         length = self.integer(size=size, dtype=dtype)
 
-        return np.array([self.integer(size=size, dtype=dtype) for _ in range(length)], dtype=int)
+        return self.position_values(length, size)
+
+
+class BufferReader:
+    """
+    Cursor based decoder over an in-memory buffer (bytes, bytearray or mmap). It exposes the same
+    integer/float/string/array/position/header interface as BinaryFileReader without issuing a syscall per value.
+    """
+    stats = None
+
+    def __init__(self, buffer, endian="<", filename=None):
+        self.filename = filename
+        self.endian = endian
+        self.buffer = buffer
+        self.view = memoryview(buffer)
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def read(self, size=-1):
+        available = len(self.buffer) - self.cursor
+        size = available if size is None or size < 0 else min(size, available)
+
+        start = self._advance(size)
+
+        return bytes(self.view[start:self.cursor])
+
+    def _advance(self, size):
+        # Every decode moves the cursor through here, returns the offset of the consumed bytes.
+        start = self.cursor
+        self.cursor = start + size
+
+        return start
+
+    def seek(self, offset, whence=0):
+        if whence == 0:
+            self.cursor = offset
+
+        elif whence == 1:
+            self.cursor += offset
+
+        else:
+            self.cursor = len(self.buffer) + offset
+
+        return self.cursor
+
+    def tell(self):
+        return self.cursor
+
+    def close(self):
+        try:
+            self.view.release()
+
+        except BufferError:
+            # Arrays handed out by array() still reference the buffer, it is released when they are collected.
+            pass
+
+    def _unpack(self, fmt, size):
+        return get_struct(fmt).unpack_from(self.buffer, self._advance(size))[0]
+
+    def header(self):
+        _ = self.integer(size=types.FOUR_BYTES, dtype=np.int32)
+        table_type = self.string(size=types.FOUR_BYTES)
+        version = self.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+        return table_type, version
+
+    def string(self, size):
+        length = self._unpack(self.endian + "i", size)
+        data = self.read(length)
+
+        try:
+            return data.replace(b"\x00", b"").decode("ascii")
+
+        except UnicodeDecodeError as error:
+            logger.warning(f"Couldn't decode string, returning raw data: {error}")
+
+            return data
+
+    def boolean(self):
+        return self.buffer[self._advance(types.ONE_BYTE)] == 1
+
+    def integer(self, size, dtype):
+        return dtype(self._unpack(self.endian + types.BUFFER_FORMAT[dtype.__name__], size))
+
+    def float(self, size, dtype):
+        return dtype(self._unpack(self.endian + types.BUFFER_FORMAT[dtype.__name__], size))
+
+    def complex(self, size, dtype):
+        csize = types.EIGHT_BYTES if size == types.SIXTEEN_BYTES else types.FOUR_BYTES
+        ctype = np.float64 if size == types.SIXTEEN_BYTES else np.float32
+
+        return dtype(self.float(size=csize, dtype=ctype) + 1j * self.float(size=csize, dtype=ctype))
+
+    def array(self, atype):
+        self.header()
+
+        ndim = self.integer(size=types.FOUR_BYTES, dtype=np.int32)
+        shape = np.frombuffer(
+            self.view, dtype=self.endian + "i4", count=ndim, offset=self._advance(ndim * types.FOUR_BYTES)
+        ).tolist()
+        size = self.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+        if atype == 'string' and size < decode.KERNEL_THRESHOLD:
+            array = np.array([self.string(size=types.FOUR_BYTES) for i in range(size)])
+
+        elif atype == 'string':
+            array, end = decode.strings(self.view, self.cursor, size, self.endian)
+            self._advance(end - self.cursor)
+
+        elif atype == 'bool':
+            length = -(-size // 8)
+            packed = np.frombuffer(self.view, dtype='uint8', count=length, offset=self._advance(length))
+
+            array = decode.bits(packed, size) if size >= decode.KERNEL_THRESHOLD else np.unpackbits(
+                packed, bitorder='little'
+            ).astype(bool)[:size]
+
+        elif atype in types.DATA_TYPE:
+            dtype = np.dtype(self.endian + types.DATA_TYPE[atype])
+            array = np.frombuffer(self.view, dtype=dtype, count=size, offset=self._advance(int(size * dtype.itemsize)))
+
+        else:
+            raise NotImplementedError(f"Can't read in data of type {atype}")
+
+        if shape is not None:
+            array = array.reshape(shape)
+
+        return array
+
+    def position(self, size, dtype):
+        """
+        :return: np.ndarray
+            Read-only view of the IPosition values into the buffer, in the byte order of the file. Callers keeping
+            the values beyond the life of the reader copy them, e.g. with tolist().
+        """
+        table_type, version = self.header()
+        length = self.integer(size=size, dtype=dtype)
+
+        # Positions are always stored as 4 byte integers, decode them in one go.
+        return np.frombuffer(self.view, dtype=f"{self.endian}i{size}", count=length, offset=self._advance(length * size))
+
+
+class MappedFileReader(BufferReader, BinaryFileReader):
+    """
+    Zero-copy variant of BinaryFileReader. The file is memory mapped once (or read into a single buffer when it
+    can't be mapped, e.g. empty files or special filesystems) and every decode works on a cursor offset into that
+    buffer instead of issuing a read() syscall per value. Arrays are returned as read-only np.frombuffer views into
+    the map.
+    """
+
+    def __init__(self, file, mode="rb"):
+        # Skip BinaryFileReader.__init__, the magic/endianess checks need the buffer in place first.
+        FileIO.__init__(self, file, mode)
+
+        try:
+            buffer = mmap.mmap(self.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except (ValueError, OSError):
+            buffer = FileIO.read(self)
+
+        BufferReader.__init__(self, buffer, filename=file)
+
+        self._check_magic()
+        self._check_endianess()
+
+    def close(self):
+        if self.closed:
+            return
+
+        BufferReader.close(self)
+
+        if isinstance(self.buffer, mmap.mmap):
+            try:
+                self.buffer.close()
+
+            except BufferError:
+                pass
+
+        FileIO.close(self)
+
+
+class InstrumentedFileReader(BinaryFileReader):
+    """
+    BinaryFileReader counting every read() and seek() into an IOStats.
+    """
+
+    def __init__(self, file, mode, stats):
+        self.stats = stats
+
+        super().__init__(file, mode)
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.stats.record(len(data))
+
+        return data
+
+    def seek(self, offset, whence=0):
+        self.stats.record_seek()
+
+        return super().seek(offset, whence)
+
+
+class InstrumentedMappedReader(MappedFileReader):
+    """
+    MappedFileReader counting every decode into an IOStats, reads are counted per decoded value since the map has no
+    read syscalls.
+    """
+
+    def __init__(self, file, mode, stats):
+        self.stats = stats
+
+        super().__init__(file, mode)
+
+    def _advance(self, size):
+        self.stats.record(size)
+
+        return super()._advance(size)
+
+    def seek(self, offset, whence=0):
+        self.stats.record_seek()
+
+        return super().seek(offset, whence)
+
+
+def map_file(file, random_access: bool = False):
+    """
+    :param file: str
+        Path to a raw data file (no AipsIO magic code), e.g. tiled storage manager hypercube files.
+    :param random_access: bool
+        Advise the kernel that the map is read at scattered offsets (MADV_RANDOM, where available), so that a read
+        of a few tiles doesn't pull the neighbouring tiles in through readahead.
+    :return: mmap.mmap or bytes
+        Read-only memory map of the file, or its content when it can't be mapped.
+    """
+    with open(file, "rb") as handle:
+        try:
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except (ValueError, OSError):
+            return handle.read()
+
+    if random_access and hasattr(mmap, "MADV_RANDOM"):
+        try:
+            buffer.madvise(mmap.MADV_RANDOM)
+
+        except OSError:
+            # Advice only, the map works without it.
+            pass
+
+    return buffer
+
+
+def open_file(file, memory_map=False, stats=None) -> BinaryFileReader:
+    """
+    :param file: str
+        Path to the binary table file.
+    :param memory_map: bool
+        Use the memory mapped, zero-copy reader instead of the syscall per value reader.
+    :param stats: IOStats
+        Count the reads and seeks of the reader, the uninstrumented readers are used when None.
+    :return: BinaryFileReader
+        Reader exposing the integer/float/string/array/position/header decode interface.
+    """
+    if stats is not None:
+        reader = InstrumentedMappedReader if memory_map else InstrumentedFileReader
+
+        return reader(file, mode="rb", stats=stats)
+
+    if memory_map:
+        return MappedFileReader(file, mode="rb")
+
+    return BinaryFileReader(file, mode="rb")
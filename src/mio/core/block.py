@@ -35,3 +35,28 @@ def read_block(file_handle: BinaryFileReader, function: Callable) -> Block:
 
     return block
 
+
+def read_array_block(file_handle: BinaryFileReader) -> Block:
+    block = Block()
+
+    start = file_handle.tell()
+
+    # Version(1) header, nrows is the AipsIO object length which includes the length field itself.
+    block.nrows = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    block.name = file_handle.string(size=types.FOUR_BYTES)
+
+    block.version = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    # Block
+    block.size = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    # Blocks of row numbers are written with 4 or 8 byte elements depending on the casacore version, the object
+    # length tells us which.
+    itemsize = (start + block.nrows - file_handle.tell()) // block.size if block.size > 0 else types.FOUR_BYTES
+
+    block.elements = np.frombuffer(
+        file_handle.read(block.size * itemsize), dtype=f"{file_handle.endian}i{itemsize}"
+    ).astype(np.int64)
+
+    return block
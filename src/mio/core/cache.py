@@ -0,0 +1,85 @@
+import os
+import pickle
+import hashlib
+import pathlib
+import tempfile
+
+from toolviper.utils import logger
+
+from typing import Union
+
+# Cache entries are written for this layout only, a new version invalidates all of them.
+CACHE_VERSION: int = 3
+
+DEFAULT_DIRECTORY = pathlib.Path(os.environ.get("MIO_CACHE_DIR", pathlib.Path.home().joinpath(".cache", "mio")))
+
+
+def cache_directory(cache: Union[bool, str, pathlib.Path]) -> pathlib.Path:
+    """
+    :param cache: bool, str or pathlib.Path
+        True for the default directory ($MIO_CACHE_DIR or ~/.cache/mio), otherwise the cache directory.
+    """
+    return DEFAULT_DIRECTORY if cache is True else pathlib.Path(cache)
+
+
+def signature(filename: Union[str, pathlib.Path]) -> tuple:
+    """
+    Identity of a table.dat file, any rewrite of the table changes at least one of these values.
+    """
+    status = os.stat(filename)
+
+    return CACHE_VERSION, str(pathlib.Path(filename).resolve()), status.st_mtime_ns, status.st_size, status.st_ino
+
+
+def entry(directory: pathlib.Path, filename: Union[str, pathlib.Path]) -> pathlib.Path:
+    # One entry per table, a changed table overwrites its stale entry instead of leaving it behind.
+    digest = hashlib.sha1(str(pathlib.Path(filename).resolve()).encode("utf-8")).hexdigest()
+
+    return directory.joinpath(f"{digest}.mio")
+
+
+def load(cache: Union[bool, str, pathlib.Path], filename: Union[str, pathlib.Path]) -> Union[dict, None]:
+    """
+    :return: dict
+        Cached state of the table, None when there is no valid entry.
+    """
+    path = entry(cache_directory(cache), filename)
+
+    try:
+        with open(path, "rb") as file:
+            cached_signature, state = pickle.loads(file.read())
+
+    except FileNotFoundError:
+        return None
+
+    except Exception as error:
+        logger.debug(f"Ignoring unreadable cache entry {path}: {error}")
+        return None
+
+    if cached_signature != signature(filename):
+        logger.debug(f"Cache entry of {filename} is out of date")
+        return None
+
+    return state
+
+
+def store(cache: Union[bool, str, pathlib.Path], filename: Union[str, pathlib.Path], state: dict):
+    directory = cache_directory(cache)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    data = pickle.dumps((signature(filename), state), protocol=pickle.HIGHEST_PROTOCOL)
+
+    # Write to a temporary file first so concurrent readers never see a partial entry.
+    descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+
+        os.replace(temporary, entry(directory, filename))
+
+    except OSError as error:
+        logger.warning(f"Failed to write cache entry for {filename}: {error}")
+
+        if os.path.exists(temporary):
+            os.remove(temporary)
@@ -1,13 +1,20 @@
+import struct
 import pathlib
 
 import numpy as np
 import graphviper.utils.logger as logger
 
 from mio.core import binary
+from mio.core import cache
+from mio.core import stats
 from mio.core import table
 from mio.utilities import types
 
 from dataclasses import dataclass
+from typing import Union
+
+# AipsIO magic code starting every top level object.
+MAGIC: bytes = b"\xbe\xbe\xbe\xbe"
 
 
 @dataclass(init=False)
@@ -18,12 +25,58 @@ class TableDescription:
     private: table.TableRecord()
 
 
+@dataclass(init=False)
+class Layout:
+    """
+    Bytes of the last parsed table.dat and where the fields that change when rows are appended are stored.
+    """
+    data: bytes
+    endian: str
+    nrows_positions: tuple
+    column_set_start: int
+
+
+@dataclass(init=False)
+class SyncData:
+    """
+    Sync record of table.lock, written by casacore whenever the table is flushed or its lock released.
+    """
+    nrows: int
+    ncolumns: int
+    modify_counter: int
+    table_change_counter: int
+    manager_counters: list
+
+
 class CasaMeasurementSet:
-    __slots__ = ["filename", "handler", "nrows", "format", "name", "description", "column_set", "table"]
+    __slots__ = [
+        "filename", "memory_map", "cache", "stats", "lazy_keywords", "handler", "nrows", "format", "name", "description", "column_set",
+        "table", "layout", "sync"
+    ]
 
-    def __init__(self, filename):
+    # Parsed state stored in the metadata cache
+    CACHED = ["nrows", "format", "name", "description", "column_set", "table"]
+
+    def __init__(self, filename, memory_map=False, cache=None, stats=None, lazy_keywords=True):
+        """
+        :param filename: str
+            Path of the table.dat file.
+        :param memory_map: bool
+            Memory map table.dat instead of reading it through a file handle.
+        :param cache: bool, str or pathlib.Path
+            Opt-in metadata cache, True for the default cache directory or the directory to use. Repeated opens of
+            an unchanged table load the parsed table.dat from the cache.
+        :param stats: IOStats
+            Opt-in instrumentation, collects the time, bytes, reads and seeks of each section of table.dat.
+        :param lazy_keywords: bool
+            Skip over the keyword records while parsing and decode each one on first access.
+        """
         self.filename = filename
-        self.handler = binary.BinaryFileReader(filename, mode="rb")
+        self.memory_map = memory_map
+        self.cache = cache
+        self.stats = stats
+        self.lazy_keywords = lazy_keywords
+        self.handler = None
 
         self.nrows = None
         self.format = None
@@ -31,47 +84,365 @@ class CasaMeasurementSet:
         self.description = None
         self.column_set = None
         self.table = None
+        self.layout = None
+        self.sync = None
 
     def read(self):
-        # Get type name and version number
-        self.handler.header()
+        with stats.section(self.stats, pathlib.Path(self.filename).parent.name):
+            self.parse()
+
+            # A table written to after table.dat was last written keeps its number of rows in table.lock.
+            sync = read_sync_data(self.filename)
 
-        # Read important meta data
-        self.nrows = self.handler.integer(size=types.FOUR_BYTES, dtype=np.int32)
-        self.format = self.handler.integer(size=types.FOUR_BYTES, dtype=np.int32)
-        self.name = self.handler.string(size=types.FOUR_BYTES)
+            if sync is not None:
+                self.synchronize(sync)
 
-        # Read table description
-        # Get type name and version number (again)
-        self.handler.header()
+    def parse(self):
+        if self.cache:
+            with stats.section(self.stats, "cache"):
+                state = cache.load(self.cache, self.filename)
 
-        # Read unknown strings
-        for _ in range(3):
-            self.handler.string(size=types.FOUR_BYTES)
+            if state is not None:
+                for name in self.CACHED:
+                    setattr(self, name, state[name])
+
+                logger.debug(f"Loaded {self.filename} from the metadata cache")
+                return
+
+        self.handler = binary.open_file(self.filename, memory_map=self.memory_map, stats=self.stats)
+        self.decode(self.handler)
+
+        for index, manager in self.column_set.data_managers.items():
+            logger.debug(f"{type(manager).__name__}: {manager.filename()}")
+
+        if self.cache:
+            cache.store(self.cache, self.filename, {name: getattr(self, name) for name in self.CACHED})
+
+    def decode(self, handler):
+        """
+        Parse table.dat from the reader positioned after the magic code.
+        """
+        with stats.section(self.stats, "header"):
+            # Get type name and version number
+            handler.header()
+
+            # Read important meta data
+            nrows_position = handler.tell()
+            self.nrows = handler.integer(size=types.FOUR_BYTES, dtype=np.int32)
+            self.format = handler.integer(size=types.FOUR_BYTES, dtype=np.int32)
+            self.name = handler.string(size=types.FOUR_BYTES)
+
+            # Read table description
+            # Get type name and version number (again)
+            handler.header()
+
+            # Read unknown strings
+            for _ in range(3):
+                handler.string(size=types.FOUR_BYTES)
 
         # Table description struct
         self.table = TableDescription()
 
         # Read table keywords
-        self.table.keywords = table.read_record(self.handler)
+        with stats.section(self.stats, "keywords"):
+            self.table.keywords = table.read_record(handler, lazy=self.lazy_keywords)
 
         # Read private keywords
-        self.table.private = table.read_record(self.handler)
+        with stats.section(self.stats, "private keywords"):
+            self.table.private = table.read_record(handler, lazy=self.lazy_keywords)
 
         # Get number of columns
-        self.table.ncolumns = self.handler.integer(size=types.FOUR_BYTES, dtype=np.int32)
+        self.table.ncolumns = handler.integer(size=types.FOUR_BYTES, dtype=np.int32)
 
         # Get list of columns
-        self.description = [table.read_column_description(self.handler) for _ in range(self.table.ncolumns)]
+        self.description = []
 
-        self.column_set = table.read_column_set(self.handler, self.description)
+        with stats.section(self.stats, "columns"):
+            for index in range(self.table.ncolumns):
+                with stats.section(self.stats, f"column {index}") as section:
+                    self.description.append(table.read_column_description(handler, lazy=self.lazy_keywords))
 
-        for index, manager in self.column_set.data_managers.items():
-            logger.info(f"{manager}: {pathlib.Path(self.filename).resolve().joinpath(f'table.f{index}')}")
+                    if section is not None:
+                        section.name = self.description[-1].name
+
+        column_set_start = handler.tell()
+
+        with stats.section(self.stats, "data managers"):
+            self.column_set = table.read_column_set(handler, self.description)
+
+        # The memory mapped readers hold the parsed bytes, refresh() compares them with the file to find what changed.
+        if isinstance(handler, binary.BufferReader):
+            self.layout = Layout()
+            self.layout.data = bytes(handler.buffer)
+            self.layout.endian = handler.endian
+            self.layout.nrows_positions = (nrows_position, column_set_start + types.FOUR_BYTES)
+            self.layout.column_set_start = column_set_start
+
+        else:
+            self.layout = None
+
+    def refresh(self) -> bool:
+        """
+        Pick up the rows appended to a table that is still being written. The writer keeps the number of rows and a
+        change counter per data manager in the sync record of table.lock, table.dat is only rewritten when the
+        structure of the table changes. Only the data managers whose counter changed drop their file state, and
+        table.dat is only parsed as far as it changed: a changed column set is parsed again from its start and
+        anything else parses the whole file again.
+
+        :return: bool
+            False when the table didn't change. A file caught while it is being rewritten, or data files that don't
+            hold all rows yet, are left for the next refresh.
+        """
+        with stats.section(self.stats, "refresh"):
+            sync = read_sync_data(self.filename)
+
+            if sync is not None and sync == self.sync:
+                return False
+
+            state = {name: getattr(self, name) for name in self.CACHED + ["layout", "sync"]}
+
+            try:
+                changed = False
+
+                if sync is None or self.sync is None or sync.table_change_counter != self.sync.table_change_counter:
+                    changed = self.reparse()
+
+                if sync is not None:
+                    self.synchronize(sync)
+                    changed = True
+
+                # The data of the new rows may not have reached the data files yet.
+                for manager in self.column_set.data_managers.values():
+                    manager.check_files()
+
+            except Exception as error:
+                for name, value in state.items():
+                    setattr(self, name, value)
+
+                # The data managers are shared with the previous state, they map their files again on the next access.
+                self.column_set.nrows = self.nrows
+
+                for manager in self.column_set.data_managers.values():
+                    manager.refresh(int(self.nrows))
+
+                logger.warning(f"Couldn't refresh {self.filename}, retrying on the next refresh: {error}")
+                return False
+
+            if self.column_set is not state["column_set"]:
+                for manager in state["column_set"].data_managers.values():
+                    manager.close()
+
+            return changed
+
+    def reparse(self) -> bool:
+        """
+        Read table.dat again and parse the parts that changed since the last parse.
+
+        :return: bool
+            False when table.dat didn't change.
+        """
+        data = pathlib.Path(self.filename).read_bytes()
+        layout = self.layout
+
+        if layout is not None and data == layout.data:
+            return False
+
+        if layout is not None and len(data) == len(layout.data) and masked(data, layout) == masked(layout.data, layout):
+            self.append_rows(data)
+
+        elif layout is not None and masked(data[:layout.column_set_start], layout) == masked(
+                layout.data[:layout.column_set_start], layout):
+            self.decode_column_set(data)
+
+        else:
+            self.decode(buffer_reader(data, self.filename))
+
+            # The sync record applies to the previous data managers.
+            self.sync = None
+
+        return True
+
+    def synchronize(self, sync: SyncData):
+        """
+        Apply the sync record of table.lock, the data managers whose change counter moved (all of them when the
+        number of rows changed) drop their file state.
+        """
+        counters = self.sync.manager_counters if self.sync is not None else []
+        resized = sync.nrows != self.nrows
+
+        self.nrows = sync.nrows
+        self.column_set.nrows = sync.nrows
+
+        for position, manager in enumerate(self.column_set.data_managers.values()):
+            if resized or position >= len(counters) or position >= len(sync.manager_counters) or counters[
+                    position] != sync.manager_counters[position]:
+                manager.refresh(sync.nrows)
+
+        self.sync = sync
+
+    def append_rows(self, data: bytes):
+        """
+        Only the row counts of table.dat changed, the data managers keep their table.dat state and drop their file
+        state.
+        """
+        first, second = (
+            int(np.frombuffer(data, dtype=f"{self.layout.endian}i4", count=1, offset=position)[0])
+            for position in self.layout.nrows_positions
+        )
+
+        if first != second:
+            raise ValueError(f"Inconsistent number of rows {first} and {second}")
+
+        logger.debug(f"{self.filename}: {self.nrows} -> {first} rows")
+
+        self.nrows = np.int32(first)
+        self.column_set.nrows = self.nrows
+
+        for manager in self.column_set.data_managers.values():
+            manager.refresh(int(first))
+
+        self.layout.data = data
+
+    def unmap(self):
+        """
+        Drop the file mappings of the data managers, e.g. once a read ran past the end of a file that was still being
+        written. The files are mapped again on the next access.
+        """
+        for manager in self.column_set.data_managers.values():
+            manager.refresh(int(self.nrows))
+
+    def close(self):
+        for manager in self.column_set.data_managers.values():
+            manager.close()
+
+        if self.handler is not None:
+            self.handler.close()
+            self.handler = None
+
+    def data_manager(self, name):
+        """
+        :param name: str
+            Column name.
+        :return: DataManager
+            Data manager storing the column.
+        """
+        for plain_column in self.column_set.columns:
+            if plain_column.name == name:
+                return self.column_set.data_managers[plain_column.data.sequence_number]
+
+        raise KeyError(f"Column {name} not found in {self.filename}")
+
+    def read_column(self, name, rows=None, cell=None):
+        """
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: np.ndarray
+            Column values with the row axis first.
+        """
+        return self.data_manager(name).read_column(name, rows=rows, cell=cell)
+
+    def read_runs(self, name, rows=None, cell=None):
+        """
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: RunLength
+            Run values and the start of each run within the selected rows, cheap for slowly varying columns such as
+            those stored by the IncrementalStMan.
+        """
+        return self.data_manager(name).read_runs(name, rows=rows, cell=cell)
+
+    def read_packed(self, name, rows=None, cell=None):
+        """
+        :param name: str
+            Column name of a boolean column.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: PackedBool
+            Bit packed values, 1/8 of the memory of the boolean array.
+        """
+        return self.data_manager(name).read_packed(name, rows=rows, cell=cell)
+
+
+def buffer_reader(data: bytes, filename: str) -> binary.BufferReader:
+    """
+    :return: BufferReader
+        Reader over the bytes of a table.dat, positioned after the magic code.
+    """
+    # The first byte of the (small) object length following the magic code is zero only for big endian files.
+    handler = binary.BufferReader(data, endian=">" if data[types.FOUR_BYTES] == 0 else "<", filename=filename)
+    handler.seek(types.FOUR_BYTES)
+
+    return handler
+
+
+def read_sync_data(filename: str) -> Union[SyncData, None]:
+    """
+    :param filename: str
+        Path of the table.dat file, the table.lock file next to it is read.
+    :return: SyncData
+        Sync record of the lock file, None when the table has no lock file or it holds no sync record yet.
+    """
+    try:
+        data = pathlib.Path(filename).with_name("table.lock").read_bytes()
+
+    except OSError:
+        return None
+
+    # The record is an AipsIO object following the lock requests.
+    start = data.find(MAGIC)
+
+    if start < 0 or len(data) < start + 2 * types.FOUR_BYTES:
+        return None
+
+    handler = buffer_reader(data[start:], filename)
+
+    try:
+        table_type, version = handler.header()
+
+        if table_type != "sync":
+            return None
+
+        sync = SyncData()
+
+        # Tables with more than 2^31 rows write the number of rows as a 64 bit integer.
+        if version > 1:
+            sync.nrows = int(handler.integer(size=types.EIGHT_BYTES, dtype=np.int64))
+
+        else:
+            sync.nrows = int(handler.integer(size=types.FOUR_BYTES, dtype=np.uint32))
 
+        sync.ncolumns = int(handler.integer(size=types.FOUR_BYTES, dtype=np.int32))
+        sync.modify_counter = int(handler.integer(size=types.FOUR_BYTES, dtype=np.uint32))
+        sync.table_change_counter = int(handler.integer(size=types.FOUR_BYTES, dtype=np.uint32))
+        sync.manager_counters = handler.position(size=types.FOUR_BYTES, dtype=np.int32).tolist()
 
+    except struct.error:
+        # Lock file caught while it is being written.
+        return None
 
+    return sync
 
 
+def masked(data: bytes, layout: Layout) -> bytes:
+    """
+    :return: bytes
+        The bytes with the row counts cleared, so that two versions of table.dat compare equal when only the number
+        of rows differs.
+    """
+    data = bytearray(data)
 
+    for position in layout.nrows_positions:
+        if position < len(data):
+            data[position:position + types.FOUR_BYTES] = bytes(types.FOUR_BYTES)
 
+    return bytes(data)
@@ -0,0 +1,79 @@
+import numpy as np
+
+from mio.core.casams import CasaMeasurementSet
+
+# Rows of the grouping column decoded at a time while looking for the group boundaries.
+KEY_ROWS: int = 2 ** 20
+
+
+def group_ranges(measurement_set: CasaMeasurementSet, name: str, block_rows: int = KEY_ROWS):
+    """
+    Walk a scalar column in blocks of rows and yield the ranges of consecutive rows holding the same value, e.g. the
+    integrations (TIME) or scans (SCAN_NUMBER) of a measurement set. Only one block of the column is decoded at a
+    time, columns stored by the IncrementalStMan are read as runs without expanding them.
+
+    :return: generator
+        (start, stop) of each group of rows.
+    """
+    manager = measurement_set.data_manager(name)
+
+    if manager.columns[name].ndims != 0:
+        raise ValueError(f"Can't group rows by the array column {name}")
+
+    nrows = int(measurement_set.nrows)
+
+    start = 0
+    previous = None
+
+    for block_start in range(0, nrows, block_rows):
+        runs = manager.read_runs(name, rows=slice(block_start, min(block_start + block_rows, nrows)))
+
+        starts = runs.starts + block_start
+
+        # The first run of a block continues the last group of the previous block when their values are equal.
+        if previous is not None and runs.values[0] == previous:
+            starts = starts[1:]
+
+        for change in starts:
+            if change > start:
+                yield start, int(change)
+
+            start = int(change)
+
+        previous = runs.values[-1]
+
+    if nrows > start:
+        yield start, nrows
+
+
+def split_ranges(ranges, max_rows: int):
+    """
+    Split ranges of rows longer than max_rows into consecutive pieces of at most max_rows rows.
+
+    :return: generator
+        (start, stop) of each piece.
+    """
+    for start, stop in ranges:
+        for first in range(start, stop, max_rows):
+            yield first, min(first + max_rows, stop)
+
+
+def chunk_rows(measurement_set: CasaMeasurementSet, columns: list, by: str = None, max_bytes: int = 2 ** 28):
+    """
+    :param columns: list
+        Names of the columns read per chunk, they size the chunks.
+    :param by: str
+        Scalar column whose groups of equal consecutive values form the chunks, e.g. "TIME" or "SCAN_NUMBER". None
+        splits the table into chunks of max_bytes.
+    :param max_bytes: int
+        Upper bound on the decoded size of the columns of a chunk, larger groups are split.
+    :return: generator
+        Slice of rows of each chunk.
+    """
+    row_bytes = sum(measurement_set.data_manager(name).row_bytes(name) for name in columns)
+    max_rows = max(1, int(max_bytes) // max(row_bytes, 1))
+
+    ranges = [(0, int(measurement_set.nrows))] if by is None else group_ranges(measurement_set, by)
+
+    for start, stop in split_ranges(ranges, max_rows):
+        yield slice(start, stop)
@@ -0,0 +1,383 @@
+import ctypes
+
+import numba
+import numpy as np
+
+# Arrays with fewer elements are decoded in Python, calling into a compiled kernel doesn't pay off for them.
+KERNEL_THRESHOLD: int = 64
+
+# Copies of at least this many bytes go through memmove(), the kernel calling it can't be cached and compiling it
+# costs more than a byte by byte copy of a smaller output.
+MEMMOVE_THRESHOLD: int = 32 * 2 ** 20
+
+_memmove = ctypes.memmove
+
+
+@numba.njit(cache=True, nogil=True, inline="always")
+def _int32(buffer, position, big_endian):
+    if big_endian:
+        value = (buffer[position] << 24) | (buffer[position + 1] << 16) | (buffer[position + 2] << 8) | buffer[
+            position + 3]
+
+    else:
+        value = (buffer[position + 3] << 24) | (buffer[position + 2] << 16) | (buffer[position + 1] << 8) | buffer[
+            position]
+
+    value = np.int64(value)
+
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+@numba.njit(cache=True, nogil=True)
+def string_layout(buffer, starts, counts, big_endian):
+    """
+    Walk runs of length prefixed (uint32 + bytes) strings, run i holds counts[i] strings starting at byte starts[i].
+
+    :return: tuple
+        Start and length of each string of all runs and the position following the last string of the last run.
+    """
+    offsets = np.empty(counts.sum(), dtype=np.int64)
+    lengths = np.empty(offsets.size, dtype=np.int64)
+
+    string = 0
+    position = 0
+
+    for run in range(starts.size):
+        position = starts[run]
+
+        for _ in range(counts[run]):
+            if position < 0 or position + 4 > buffer.size:
+                raise ValueError("String length past the end of the buffer")
+
+            length = _int32(buffer, position, big_endian)
+
+            if length < 0 or position + 4 + length > buffer.size:
+                raise ValueError("String past the end of the buffer")
+
+            offsets[string] = position + 4
+            lengths[string] = length
+
+            position += 4 + length
+            string += 1
+
+    return offsets, lengths, position
+
+
+@numba.njit(cache=True, nogil=True)
+def gather_strings(buffer, offsets, lengths, out):
+    """
+    Copy strings into the rows of a zero initialised (count, width) array, longer strings are truncated. Writing
+    bytes into a uint32 array yields UCS4 (numpy unicode) strings directly as long as they are ASCII.
+
+    :return: int
+        Largest byte copied, 128 or more means the strings aren't ASCII.
+    """
+    width = out.shape[1]
+    largest = 0
+
+    for i in range(offsets.size):
+        start = offsets[i]
+
+        if start < 0 or start + min(lengths[i], width) > buffer.size:
+            raise ValueError("String past the end of the buffer")
+
+        for j in range(min(lengths[i], width)):
+            value = buffer[start + j]
+            largest = max(largest, value)
+
+            out[i, j] = value
+
+    return largest
+
+
+@numba.njit(cache=True, nogil=True, inline="always")
+def _unpack_run(packed, bit, out, start, count):
+    # Single bits up to the next byte boundary, then whole bytes, then the remaining bits.
+    end = start + count
+    i = start
+
+    while i < end and (bit & 7) != 0:
+        out[i] = (packed[bit >> 3] >> (bit & 7)) & 1
+        i += 1
+        bit += 1
+
+    byte = bit >> 3
+
+    while i + 8 <= end:
+        value = packed[byte]
+
+        for j in range(8):
+            out[i + j] = (value >> j) & 1
+
+        i += 8
+        byte += 1
+
+    bit = byte << 3
+
+    while i < end:
+        out[i] = (packed[bit >> 3] >> (bit & 7)) & 1
+        i += 1
+        bit += 1
+
+
+@numba.njit(cache=True, nogil=True)
+def unpack_bits(packed, first_bit, out):
+    """
+    Unpack bits stored least significant first into a preallocated uint8 (boolean view) array, starting at bit
+    `first_bit`.
+    """
+    if first_bit < 0 or first_bit + out.size > 8 * packed.size:
+        raise ValueError("Bits past the end of the buffer")
+
+    _unpack_run(packed, first_bit, out, 0, out.size)
+
+
+@numba.njit(cache=True, nogil=True)
+def unpack_bit_rows(packed, first_bits, out):
+    """
+    Unpack nbits bits per row into a flat preallocated uint8 (boolean view) array, row i starting at bit
+    first_bits[i] of the buffer.
+    """
+    nbits = out.size // first_bits.size if first_bits.size > 0 else 0
+
+    for i in range(first_bits.size):
+        if first_bits[i] < 0 or first_bits[i] + nbits > 8 * packed.size:
+            raise ValueError("Bits past the end of the buffer")
+
+        _unpack_run(packed, first_bits[i], out, i * nbits, nbits)
+
+
+@numba.njit(cache=True, nogil=True)
+def take_bits(packed, bits, out):
+    """
+    Gather single bits at arbitrary absolute bit positions into a flat uint8 (boolean view) array.
+    """
+    for i in range(bits.size):
+        bit = bits[i]
+
+        if bit < 0 or bit >= 8 * packed.size:
+            raise ValueError("Bit past the end of the buffer")
+
+        out[i] = (packed[bit >> 3] >> (bit & 7)) & 1
+
+
+@numba.njit(cache=True, nogil=True)
+def copy_bit_rows(packed, first_bits, nbits, out):
+    """
+    Copy nbits bits per row without unpacking them into a zero initialised uint8 array, row i starting at bit
+    first_bits[i] of the buffer and at bit i * nbits of the output. Whole bytes are copied once the output is on a
+    byte boundary, always the case when nbits is a multiple of 8.
+    """
+    for i in range(first_bits.size):
+        source = first_bits[i]
+        target = i * nbits
+        end = target + nbits
+
+        if source < 0 or source + nbits > 8 * packed.size:
+            raise ValueError("Bits past the end of the buffer")
+
+        while target < end and (target & 7) != 0:
+            out[target >> 3] |= ((packed[source >> 3] >> (source & 7)) & 1) << (target & 7)
+            target += 1
+            source += 1
+
+        while target + 8 <= end:
+            byte = source >> 3
+            shift = source & 7
+
+            value = packed[byte] >> shift
+
+            if shift != 0:
+                value |= packed[byte + 1] << (8 - shift)
+
+            out[target >> 3] = value & 0xFF
+            target += 8
+            source += 8
+
+        while target < end:
+            out[target >> 3] |= ((packed[source >> 3] >> (source & 7)) & 1) << (target & 7)
+            target += 1
+            source += 1
+
+
+@numba.njit(cache=True, nogil=True)
+def fill_bits(packed, values, fill):
+    """
+    Set the elements of a flat array whose bit is set in the packed buffer to fill. Bytes without any bit set are
+    skipped, sparse flags cost little more than a pass over the packed bits.
+    """
+    for j in range(packed.size):
+        value = packed[j]
+
+        if value == 0:
+            continue
+
+        for k in range(min(8, values.size - 8 * j)):
+            if (value >> k) & 1:
+                values[8 * j + k] = fill
+
+
+@numba.njit(cache=True, nogil=True)
+def copy_ranges(buffer, starts, nbytes, destinations, out):
+    """
+    Copy byte ranges of the buffer to the given positions of a preallocated uint8 array.
+    """
+    for i in range(starts.size):
+        out[destinations[i]:destinations[i] + nbytes[i]] = buffer[starts[i]:starts[i] + nbytes[i]]
+
+
+@numba.njit(nogil=True)
+def move_ranges(buffer, starts, nbytes, destinations, out):
+    """
+    copy_ranges() through memmove().
+    """
+    source = buffer.ctypes.data
+    target = out.ctypes.data
+
+    for i in range(starts.size):
+        _memmove(target + destinations[i], source + starts[i], nbytes[i])
+
+
+@numba.njit(cache=True, nogil=True)
+def unpack_ranges(packed, first_bits, counts, destinations, out):
+    """
+    Unpack runs of counts[i] bits starting at bit first_bits[i] to the given positions of a preallocated uint8
+    (boolean view) array.
+    """
+    for i in range(first_bits.size):
+        if first_bits[i] < 0 or first_bits[i] + counts[i] > 8 * packed.size:
+            raise ValueError("Bits past the end of the buffer")
+
+        _unpack_run(packed, first_bits[i], out, destinations[i], counts[i])
+
+
+@numba.njit(cache=True, nogil=True)
+def cell_headers(buffer, offsets, max_ndim, big_endian):
+    """
+    Decode the headers of indirect array cells in a StManArrayFile (table.f<N>i). A cell starts with its number of
+    dimensions and shape (int32), the data follows directly.
+
+    :return: tuple
+        Number of dimensions (count,), shapes (count, max_ndim) padded with 1 and the start of the data of each cell.
+    """
+    count = offsets.size
+
+    ndims = np.empty(count, dtype=np.int64)
+    shapes = np.ones((count, max_ndim), dtype=np.int64)
+    data = np.empty(count, dtype=np.int64)
+
+    for i in range(count):
+        position = offsets[i]
+
+        if position < 0 or position + 4 > buffer.size:
+            raise ValueError("Indirect array cell header past the end of the buffer")
+
+        ndim = _int32(buffer, position, big_endian)
+
+        if ndim < 0 or ndim > max_ndim:
+            raise ValueError("Corrupt indirect array cell header")
+
+        if position + 4 + 4 * ndim > buffer.size:
+            raise ValueError("Indirect array cell header past the end of the buffer")
+
+        ndims[i] = ndim
+
+        for axis in range(ndim):
+            shapes[i, axis] = _int32(buffer, position + 4 + 4 * axis, big_endian)
+
+        data[i] = position + 4 + 4 * ndim
+
+    return ndims, shapes, data
+
+
+def as_bytes(buffer) -> np.ndarray:
+    return buffer if isinstance(buffer, np.ndarray) else np.frombuffer(buffer, dtype=np.uint8)
+
+
+def strings(buffer, start: int, count: int, endian: str = "<") -> tuple:
+    """
+    Decode an array of length prefixed strings.
+
+    :param buffer: bytes, mmap or np.ndarray
+        Buffer holding the strings.
+    :param start: int
+        Byte offset of the first length.
+    :param count: int
+        Number of strings.
+    :return: tuple
+        Unicode string array and the byte offset following the last string.
+    """
+    data = as_bytes(buffer)
+
+    offsets, lengths, end = string_layout(
+        data, np.array([start], dtype=np.int64), np.array([count], dtype=np.int64), endian == ">"
+    )
+
+    return gather_str(data, offsets, lengths), int(end)
+
+
+def gather_str(data: np.ndarray, offsets: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    :return: np.ndarray
+        Unicode array of the strings at the given byte offsets of the buffer.
+    """
+    width = max(1, int(lengths.max()) if lengths.size > 0 else 1)
+
+    values = np.zeros((lengths.size, width), dtype=np.uint32)
+
+    if gather_strings(data, offsets, lengths, values) < 128:
+        return values.view(f"U{width}").ravel()
+
+    return to_str(values.astype(np.uint8).view(f"S{width}").ravel())
+
+
+def to_str(values: np.ndarray) -> np.ndarray:
+    """
+    Decode a byte string array. ASCII strings are widened to UCS4 in one vectorised cast, anything else is decoded
+    as UTF-8.
+    """
+    width = values.dtype.itemsize
+    raw = np.ascontiguousarray(values).view(np.uint8).reshape(values.size, width)
+
+    if width > 0 and (raw.size == 0 or raw.max() < 128):
+        return raw.astype(np.uint32).view(f"U{width}").reshape(values.shape)
+
+    return np.char.decode(values, "utf-8", errors="replace")
+
+
+def copy(buffer, starts: np.ndarray, nbytes: np.ndarray, destinations: np.ndarray, out: np.ndarray):
+    """
+    Copy byte ranges of the buffer to the given positions of a preallocated uint8 array.
+
+    :raises ValueError: when a range lies outside the buffer or the output, e.g. for a truncated file.
+    """
+    # Neither kernel checks the ranges, memmove() in particular would read or write past the arrays.
+    if starts.size > 0 and (
+            np.min(starts) < 0 or np.min(destinations) < 0 or np.min(nbytes) < 0
+            or np.max(starts + nbytes) > buffer.size or np.max(destinations + nbytes) > out.size
+    ):
+        raise ValueError("Byte range out of bounds")
+
+    if out.size >= MEMMOVE_THRESHOLD:
+        move_ranges(buffer, starts, nbytes, destinations, out)
+
+    else:
+        copy_ranges(buffer, starts, nbytes, destinations, out)
+
+
+def bits(buffer, count: int, first_bit: int = 0, out: np.ndarray = None) -> np.ndarray:
+    """
+    :param buffer: bytes, mmap or np.ndarray
+        Bit packed booleans, least significant bit first.
+    :param count: int
+        Number of booleans.
+    :param out: np.ndarray
+        Preallocated boolean output of `count` elements, a new array by default.
+    :return: np.ndarray
+    """
+    if out is None:
+        out = np.empty(count, dtype=bool)
+
+    unpack_bits(as_bytes(buffer), first_bit, out.view(np.uint8))
+
+    return out
@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import dask
+import dask.array as da
+
+from dask.base import tokenize
+from dask.highlevelgraph import HighLevelGraph
+from dask.utils import parse_bytes
+
+from mio.core.casams import CasaMeasurementSet
+from mio.utilities import tools
+
+
+def read_chunk(filename: str, name: str, start: int, stop: int, cell=None) -> np.ndarray:
+    """
+    Decode a single chunk of a column. The task parses table.dat and maps the data files itself, so chunks can be
+    decoded on any worker that sees the file system, without sharing file handles.
+    """
+    measurement_set = CasaMeasurementSet(filename, memory_map=True)
+
+    try:
+        measurement_set.read()
+
+        values = measurement_set.read_column(name, rows=slice(start, stop), cell=cell)
+
+    finally:
+        measurement_set.close()
+
+    # The width of unicode strings differs between chunks, hand them to dask as objects.
+    return values.astype(object) if values.dtype.kind == "U" else values
+
+
+def cell_output_shape(cell_shape: tuple, cell) -> tuple:
+    if cell is None:
+        return cell_shape
+
+    return np.empty(cell_shape, dtype=bool)[cell if isinstance(cell, tuple) else (cell,)].shape
+
+
+def row_chunks(measurement_set: CasaMeasurementSet, name: str, chunks, row_bytes: int) -> tuple:
+    """
+    :return: tuple
+        Number of rows of each chunk.
+    """
+    nrows = measurement_set.nrows
+
+    if isinstance(chunks, (tuple, list)):
+        if sum(chunks) != nrows:
+            raise ValueError(f"Chunks {chunks} don't add up to the {nrows} rows of the table")
+
+        return tuple(int(size) for size in chunks)
+
+    if chunks == "auto":
+        target = parse_bytes(dask.config.get("array.chunk-size")) // max(row_bytes, 1)
+
+    elif isinstance(chunks, (int, np.integer)):
+        target = int(chunks)
+
+    else:
+        raise ValueError(f"Unsupported chunks: {chunks}")
+
+    boundaries = measurement_set.data_manager(name).row_boundaries(name)
+
+    return tuple(int(size) for size in np.diff(tools.snap_boundaries(boundaries, nrows, target))) or (0,)
+
+
+def to_dask(measurement_set: CasaMeasurementSet, name: str, chunks="auto", cell=None) -> da.Array:
+    """
+    :param measurement_set: CasaMeasurementSet
+        Parsed table, only used to build the graph.
+    :param name: str
+        Column name.
+    :param chunks: str, int or tuple
+        Row chunking, see Table.to_dask.
+    :param cell: tuple
+        Optional numpy style index applied to the cell axes of array columns.
+    :return: dask.array.Array
+    """
+    description = next(entry for entry in measurement_set.description if entry.name == name)
+    manager = measurement_set.data_manager(name)
+
+    cell_shape = manager.shapes[name] if description.ndims != 0 else tuple()
+
+    if cell_shape is None:
+        raise ValueError(f"Column {name} has no fixed cell shape and can't be exported as a dask array")
+
+    shape = cell_output_shape(cell_shape, cell)
+    dtype = tools.column_dtype(description.value_type)
+    dtype = np.dtype(object) if dtype.kind == "U" else dtype
+
+    row_bytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    sizes = row_chunks(measurement_set, name, chunks, row_bytes)
+
+    filename = os.path.abspath(measurement_set.filename)
+    stat = os.stat(filename)
+    key = f"{name.lower()}-{tokenize(filename, stat.st_mtime_ns, stat.st_size, name, sizes, cell)}"
+
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+    blocks = (0,) * len(shape)
+
+    layer = {
+        (key, number) + blocks: (read_chunk, filename, name, int(start), int(stop), cell)
+        for number, (start, stop) in enumerate(zip(starts[:-1], starts[1:]))
+    }
+
+    return da.Array(
+        HighLevelGraph.from_collections(key, layer, dependencies=[]),
+        key,
+        chunks=(sizes,) + tuple((length,) for length in shape),
+        dtype=dtype
+    )
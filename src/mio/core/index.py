@@ -0,0 +1,275 @@
+import os
+import hashlib
+import pathlib
+import tempfile
+
+import numpy as np
+
+from toolviper.utils import logger
+
+from mio.core import cache
+from mio.utilities import tools
+
+from dataclasses import dataclass
+from typing import Union
+
+# Index files are written for this layout only, a new version invalidates all of them.
+INDEX_VERSION: int = 1
+
+# Indexed keys and the columns they are built from.
+KEY_COLUMNS = {
+    "TIME": ["TIME"],
+    "SCAN_NUMBER": ["SCAN_NUMBER"],
+    "BASELINE": ["ANTENNA1", "ANTENNA2"],
+}
+
+
+@dataclass(init=False)
+class KeyIndex:
+    """
+    Rows grouped by key value: the rows holding keys[i] are rows[offsets[i]:offsets[i + 1]], in ascending order.
+    """
+    keys: np.ndarray
+    offsets: np.ndarray
+    rows: np.ndarray
+
+    def lookup(self, predicate) -> np.ndarray:
+        """
+        :param predicate:
+            A single key, a list (or set, array) of keys or a (low, high) tuple selecting low <= key <= high, None
+            leaves a side open.
+        :return: np.ndarray
+            Sorted rows holding the selected keys.
+        """
+        if isinstance(predicate, tuple):
+            low, high = predicate
+
+            first = 0 if low is None else int(np.searchsorted(self.keys, low, side="left"))
+            last = self.keys.size if high is None else int(np.searchsorted(self.keys, high, side="right"))
+
+            return np.sort(self.rows[self.offsets[first]:self.offsets[max(first, last)]])
+
+        if isinstance(predicate, (set, frozenset)):
+            predicate = list(predicate)
+
+        values = np.unique(np.asarray(predicate, dtype=self.keys.dtype))
+
+        slots = np.searchsorted(self.keys, values)
+        found = slots < self.keys.size
+        slots = slots[found][self.keys[slots[found]] == values[found]]
+
+        if slots.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        if slots.size == 1:
+            return self.rows[self.offsets[slots[0]]:self.offsets[slots[0] + 1]]
+
+        return np.sort(np.concatenate([self.rows[self.offsets[slot]:self.offsets[slot + 1]] for slot in slots]))
+
+
+def build_key_index(values: np.ndarray) -> KeyIndex:
+    index = KeyIndex()
+
+    # A stable sort keeps the rows of each key in ascending order.
+    index.rows = np.argsort(values, kind="stable").astype(np.int64)
+    ordered = values[index.rows]
+
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1]))) if ordered.size > 0 else []
+
+    index.keys = ordered[starts]
+    index.offsets = np.append(starts, ordered.size).astype(np.int64)
+
+    return index
+
+
+def baseline_key(antenna1, antenna2) -> np.ndarray:
+    """
+    Single integer key per (ANTENNA1, ANTENNA2) pair.
+    """
+    return (np.asarray(antenna1, dtype=np.int64) << 32) | np.asarray(antenna2, dtype=np.int64)
+
+
+class TableIndex:
+    """
+    Secondary indexes of a table: sorted TIME, SCAN_NUMBER and baseline keys mapped to their rows. Lookups are a
+    binary search on the keys and never touch the column data.
+    """
+    __slots__ = ["signature", "keys"]
+
+    def __init__(self, signature: tuple, keys: dict):
+        """
+        :param signature: tuple
+            Signature of the table files the indexes were built from.
+        :param keys: dict
+            KeyIndex per indexed key.
+        """
+        self.signature = signature
+        self.keys = keys
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def __repr__(self) -> str:
+        return f"TableIndex({ {key: index.keys.size for key, index in self.keys.items()} })"
+
+    def lookup(self, key: str, predicate) -> tuple:
+        """
+        :param key: str
+            TIME, SCAN_NUMBER or BASELINE, baselines are given as (ANTENNA1, ANTENNA2) pairs or a list of pairs.
+        :param predicate:
+            See KeyIndex.lookup().
+        :return: tuple
+            First row and end (exclusive) of each range of matching rows.
+        """
+        if key == "BASELINE":
+            pairs = np.asarray(predicate, dtype=np.int64).reshape(-1, 2)
+            predicate = baseline_key(pairs[:, 0], pairs[:, 1])
+
+        return tools.rows_to_ranges(self.keys[key].lookup(predicate))
+
+    def time(self, start: float = None, end: float = None) -> tuple:
+        """
+        :return: tuple
+            Row ranges with start <= TIME <= end.
+        """
+        return self.lookup("TIME", (start, end))
+
+    def scan(self, scan_number) -> tuple:
+        """
+        :param scan_number: int or list
+            Scan number or list of scan numbers.
+        :return: tuple
+            Row ranges of the scans.
+        """
+        return self.lookup("SCAN_NUMBER", scan_number if np.ndim(scan_number) > 0 else [scan_number])
+
+    def baseline(self, antenna1: int, antenna2: int) -> tuple:
+        """
+        :return: tuple
+            Row ranges of the baseline.
+        """
+        return self.lookup("BASELINE", (antenna1, antenna2))
+
+
+def table_signature(measurement_set) -> tuple:
+    """
+    Version, number of rows and the latest modification time and total size of the table files. Any write to the
+    table or its data files changes it.
+    """
+    directory = pathlib.Path(measurement_set.filename).resolve().parent
+
+    status = [entry.stat() for entry in os.scandir(directory) if entry.is_file() and entry.name.startswith("table.")]
+
+    return (
+        INDEX_VERSION,
+        int(measurement_set.nrows),
+        max(entry.st_mtime_ns for entry in status),
+        sum(entry.st_size for entry in status)
+    )
+
+
+def index_path(location: Union[None, str, pathlib.Path], measurement_set) -> pathlib.Path:
+    directory = cache.DEFAULT_DIRECTORY if location is None else pathlib.Path(location)
+    table = str(pathlib.Path(measurement_set.filename).resolve().parent)
+
+    return directory.joinpath(f"{hashlib.sha1(table.encode('utf-8')).hexdigest()}.index.npz")
+
+
+def build(measurement_set) -> TableIndex:
+    """
+    Build the indexes of the keys whose columns exist in the table.
+    """
+    columns = {description.name for description in measurement_set.description}
+    keys = {}
+
+    for key, names in KEY_COLUMNS.items():
+        if not all(name in columns for name in names):
+            continue
+
+        values = [measurement_set.read_column(name) for name in names]
+        keys[key] = build_key_index(baseline_key(*values) if key == "BASELINE" else values[0])
+
+    return TableIndex(table_signature(measurement_set), keys)
+
+
+def load(path: pathlib.Path, signature: tuple) -> Union[TableIndex, None]:
+    """
+    :return: TableIndex
+        Stored indexes, None when the file is missing, unreadable or built from a different version of the table.
+    """
+    try:
+        with np.load(path) as archive:
+            if tuple(archive["signature"].tolist()) != signature:
+                logger.debug(f"Index {path} is out of date")
+                return None
+
+            keys = {}
+
+            for key in archive["keys"].tolist():
+                index = KeyIndex()
+                index.keys = archive[f"{key}.keys"]
+                index.offsets = archive[f"{key}.offsets"]
+                index.rows = archive[f"{key}.rows"]
+
+                keys[key] = index
+
+    except FileNotFoundError:
+        return None
+
+    except Exception as error:
+        logger.debug(f"Ignoring unreadable index {path}: {error}")
+        return None
+
+    return TableIndex(signature, keys)
+
+
+def store(path: pathlib.Path, table_index: TableIndex):
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    arrays = {"signature": np.array(table_index.signature, dtype=np.int64), "keys": np.array(list(table_index.keys))}
+
+    for key, index in table_index.keys.items():
+        arrays[f"{key}.keys"] = index.keys
+        arrays[f"{key}.offsets"] = index.offsets
+        arrays[f"{key}.rows"] = index.rows
+
+    # Write to a temporary file first so concurrent readers never see a partial index.
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            np.savez(file, **arrays)
+
+        os.replace(temporary, path)
+
+    except OSError as error:
+        logger.warning(f"Failed to write index {path}: {error}")
+
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def open_index(measurement_set, location: Union[None, str, pathlib.Path] = None, rebuild: bool = False) -> TableIndex:
+    """
+    :param measurement_set: CasaMeasurementSet
+        Parsed table.
+    :param location: str or pathlib.Path
+        Directory of the index files, the metadata cache directory ($MIO_CACHE_DIR or ~/.cache/mio) by default. Pass
+        the table directory to keep the index next to the table.
+    :param rebuild: bool
+        Build the indexes even if an up to date file exists.
+    :return: TableIndex
+        Stored indexes, built and stored when missing or older than the table.
+    """
+    path = index_path(location, measurement_set)
+    signature = table_signature(measurement_set)
+
+    table_index = None if rebuild else load(path, signature)
+
+    if table_index is None:
+        logger.info(f"Building the indexes of {pathlib.Path(measurement_set.filename).parent.name}")
+
+        table_index = build(measurement_set)
+        store(path, table_index)
+
+    return table_index
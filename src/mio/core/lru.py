@@ -0,0 +1,172 @@
+import os
+import threading
+
+import numpy as np
+
+from collections import OrderedDict
+
+from dask.utils import parse_bytes
+
+from typing import Union
+
+# Budget of the process wide cache, $MIO_BUCKET_CACHE (e.g. "1GiB", 0 disables it) or 256 MiB.
+DEFAULT_BUDGET = parse_bytes(os.environ.get("MIO_BUCKET_CACHE", "256MiB"))
+
+# A single read may fill at most this fraction of the budget, larger reads bypass the cache instead of flushing it.
+READ_FRACTION: int = 8
+
+# Reads spread over more buckets or rows of tiles bypass the cache, a lookup per unit costs more than decoding the
+# rows directly.
+MAX_UNITS: int = 16
+
+
+class LRUCache:
+    """
+    Thread safe cache of decoded buckets and tiles bounded by a byte budget, the least recently used entries are
+    evicted first.
+    """
+    __slots__ = ["budget", "entries", "nbytes", "hits", "misses", "evictions", "lock"]
+
+    def __init__(self, budget: int):
+        """
+        :param budget: int
+            Maximum number of bytes held by the cache, 0 disables it.
+        """
+        self.budget = int(budget)
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget > 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+
+    def __repr__(self) -> str:
+        return f"LRUCache({self.statistics()})"
+
+    def get(self, key) -> Union[np.ndarray, None]:
+        with self.lock:
+            value = self.entries.get(key)
+
+            if value is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def put(self, key, value: np.ndarray):
+        nbytes = value.nbytes
+
+        if nbytes > self.budget:
+            return
+
+        # Entries are shared between readers, nobody may modify them in place.
+        value.setflags(write=False)
+
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key).nbytes
+
+            self.entries[key] = value
+            self.nbytes += nbytes
+
+            self.evict()
+
+    def evict(self):
+        while self.nbytes > self.budget and self.entries:
+            _, value = self.entries.popitem(last=False)
+
+            self.nbytes -= value.nbytes
+            self.evictions += 1
+
+    def get_or_load(self, key, loader) -> np.ndarray:
+        """
+        :param key:
+            Hashable key, e.g. (file, manager sequence number, column, first row, end row).
+        :param loader: callable
+            Decodes the value on a miss, it runs outside the lock so concurrent misses decode in parallel.
+        :return: np.ndarray
+            Read-only cached value.
+        """
+        value = self.get(key)
+
+        if value is None:
+            value = loader()
+            self.put(key, value)
+
+        return value
+
+    def discard(self, filename: str):
+        """
+        Drop the entries of a file, e.g. once rows were appended to it. Entries are keyed by the file signature and
+        are never hit again after the file changed, they would only hold on to their share of the budget.
+
+        :param filename: str
+            File name, the first element of the keys.
+        """
+        with self.lock:
+            for key in [key for key in self.entries if isinstance(key, tuple) and key and key[0] == filename]:
+                self.nbytes -= self.entries.pop(key).nbytes
+
+    def resize(self, budget: Union[int, str]):
+        with self.lock:
+            self.budget = parse_bytes(budget) if isinstance(budget, str) else int(budget)
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def reset_statistics(self):
+        with self.lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def statistics(self) -> dict:
+        """
+        :return: dict
+            Hits, misses, evictions, number of entries, bytes held and budget.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "nbytes": self.nbytes,
+                "budget": self.budget
+            }
+
+
+_SHARED = LRUCache(DEFAULT_BUDGET)
+
+
+def shared() -> LRUCache:
+    """
+    :return: LRUCache
+        Process wide cache used by the storage managers.
+    """
+    return _SHARED
+
+
+def configure(budget: Union[int, str]) -> LRUCache:
+    """
+    :param budget: int or str
+        New byte budget of the process wide cache, e.g. "1GiB", 0 disables it.
+    :return: LRUCache
+    """
+    _SHARED.resize(budget)
+
+    return _SHARED
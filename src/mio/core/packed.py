@@ -0,0 +1,238 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.core import decode
+from mio.utilities import tools
+
+# Number of bits set in each byte value.
+POPCOUNT: np.ndarray = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+# Operations that have to unpack do so for blocks of rows of about this many booleans.
+UNPACK_ELEMENTS: int = 2 ** 24
+
+
+@dataclass(init=False)
+class PackedBool:
+    """
+    Boolean column values kept bit packed, 1/8 of the memory of a boolean array, e.g. FLAG of wide band data. The
+    values are packed in numpy (C) order, least significant bit first, like np.packbits(values, bitorder="little").
+    The reductions and masking work on the packed bits, indexing unpacks only the selected rows.
+    """
+    bits: np.ndarray
+    shape: tuple
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(bool)
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    @property
+    def cell_size(self) -> int:
+        """
+        Number of booleans per row.
+        """
+        return int(np.prod(self.shape[1:], dtype=np.int64))
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return f"PackedBool(shape={self.shape}, nbytes={self.nbytes})"
+
+    def __getitem__(self, key) -> np.ndarray:
+        rows, cell = tools.split_key(key, self.ndim - 1)
+        cell = cell or tuple()
+
+        values = self.take(rows).unpack()
+
+        # An integer row index drops the row axis like numpy does.
+        if np.ndim(rows) == 0 and not isinstance(rows, slice):
+            values = values[0]
+
+            return values[cell] if cell else values
+
+        return values[(slice(None),) + cell] if cell else values
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.unpack()
+
+        return values if dtype is None else values.astype(dtype)
+
+    def __or__(self, other) -> "PackedBool":
+        return packed_bool(self.bits | self.check(other).bits, self.shape)
+
+    def __and__(self, other) -> "PackedBool":
+        return packed_bool(self.bits & self.check(other).bits, self.shape)
+
+    def __xor__(self, other) -> "PackedBool":
+        return packed_bool(self.bits ^ self.check(other).bits, self.shape)
+
+    def __invert__(self) -> "PackedBool":
+        bits = ~self.bits
+
+        # The padding bits of the last byte stay cleared so that counts aren't affected.
+        if self.size % 8:
+            bits[-1] &= (1 << (self.size % 8)) - 1
+
+        return packed_bool(bits, self.shape)
+
+    def check(self, other) -> "PackedBool":
+        if not isinstance(other, PackedBool):
+            other = pack(np.broadcast_to(np.asarray(other, dtype=bool), self.shape))
+
+        if other.shape != self.shape:
+            raise ValueError(f"Shapes {self.shape} and {other.shape} don't match")
+
+        return other
+
+    def take(self, rows) -> "PackedBool":
+        """
+        :param rows: int, slice, list or np.ndarray
+            Rows to keep.
+        :return: PackedBool
+            The selected rows, still packed.
+        """
+        cell_size = self.cell_size
+
+        # Rows of whole bytes are sliced directly.
+        if isinstance(rows, slice) and rows.step in (None, 1) and cell_size % 8 == 0:
+            start, stop, _ = rows.indices(self.shape[0])
+            stop = max(start, stop)
+
+            return packed_bool(
+                self.bits[start * cell_size // 8:stop * cell_size // 8], (stop - start,) + self.shape[1:]
+            )
+
+        rows = np.atleast_1d(np.arange(self.shape[0], dtype=np.int64)[rows])
+
+        bits = np.zeros(-(-rows.size * cell_size // 8), dtype=np.uint8)
+        decode.copy_bit_rows(self.bits, rows * cell_size, cell_size, bits)
+
+        return packed_bool(bits, (rows.size,) + self.shape[1:])
+
+    def unpack(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Boolean array of all rows.
+        """
+        return decode.bits(self.bits, self.size).reshape(self.shape)
+
+    def blocks(self):
+        """
+        :return: generator
+            First row and unpacked values of blocks of rows of about UNPACK_ELEMENTS booleans.
+        """
+        block_rows = max(1, UNPACK_ELEMENTS // max(self.cell_size, 1))
+
+        for start in range(0, self.shape[0], block_rows):
+            yield start, self.take(slice(start, start + block_rows)).unpack()
+
+    def count(self) -> int:
+        """
+        :return: int
+            Number of true values.
+        """
+        return int(POPCOUNT[self.bits].sum(dtype=np.int64))
+
+    def count_rows(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Number of true values of each row.
+        """
+        if self.cell_size % 8 == 0:
+            return POPCOUNT[self.bits].reshape(self.shape[0], -1).sum(axis=1, dtype=np.int64)
+
+        counts = np.empty(self.shape[0], dtype=np.int64)
+
+        for start, values in self.blocks():
+            counts[start:start + values.shape[0]] = values.reshape(values.shape[0], -1).sum(axis=1)
+
+        return counts
+
+    def count_cells(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Number of true values over the rows for every cell element, e.g. the flagged fraction per channel and
+            correlation once divided by the number of rows.
+        """
+        counts = np.zeros(self.shape[1:], dtype=np.int64)
+
+        for _, values in self.blocks():
+            counts += values.sum(axis=0, dtype=np.int64)
+
+        return counts
+
+    def any_rows(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Whether any value of each row is true, e.g. FLAG_ROW from FLAG.
+        """
+        if self.cell_size % 8 == 0:
+            return np.any(self.bits.reshape(self.shape[0], -1) != 0, axis=1)
+
+        return self.count_rows() > 0
+
+    def all_rows(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Whether all values of each row are true.
+        """
+        return self.count_rows() == self.cell_size
+
+    def fill(self, values: np.ndarray, fill=0) -> np.ndarray:
+        """
+        Set the values whose bit is true to fill in place, e.g. zero the flagged visibilities of DATA, without
+        unpacking the bits.
+
+        :param values: np.ndarray
+            Writeable C contiguous array of the same shape.
+        :return: np.ndarray
+            The values.
+        """
+        if values.shape != self.shape:
+            raise ValueError(f"Shapes {self.shape} and {values.shape} don't match")
+
+        if not values.flags.c_contiguous or not values.flags.writeable:
+            raise ValueError("Values must be a writeable C contiguous array")
+
+        decode.fill_bits(self.bits, values.reshape(-1), values.dtype.type(fill))
+
+        return values
+
+    def masked(self, values: np.ndarray) -> np.ma.MaskedArray:
+        """
+        :return: np.ma.MaskedArray
+            Values masked where the bits are true, the mask is unpacked.
+        """
+        return np.ma.MaskedArray(values, mask=self.unpack())
+
+
+def pack(values: np.ndarray) -> PackedBool:
+    """
+    :param values: np.ndarray
+        Boolean array with the row axis first.
+    :return: PackedBool
+    """
+    values = np.asarray(values, dtype=bool)
+
+    return packed_bool(np.packbits(values.reshape(-1), bitorder="little"), values.shape)
+
+
+def packed_bool(bits: np.ndarray, shape: tuple) -> PackedBool:
+    packed = PackedBool()
+    packed.bits = bits
+    packed.shape = tuple(int(axis) for axis in shape)
+
+    return packed
@@ -0,0 +1,159 @@
+import numpy as np
+
+from mio.core.index import KEY_COLUMNS
+from mio.managers.managers import IncrementalStorageManager
+from mio.utilities import tools
+
+
+def predicate_mask(values: np.ndarray, predicate) -> np.ndarray:
+    """
+    :param values: np.ndarray
+        Column values.
+    :param predicate:
+        A callable returning a boolean mask for the values, a (low, high) tuple selecting low <= value <= high where
+        None leaves a side open, a list, set or array of accepted values, or a single value to compare with.
+    :return: np.ndarray
+        Boolean mask of the values passing the predicate.
+    """
+    if callable(predicate):
+        mask = np.asarray(predicate(values), dtype=bool)
+
+        if mask.shape != values.shape[:1]:
+            raise ValueError(f"Predicate returned a mask of shape {mask.shape} for {values.shape[0]} values")
+
+        return mask
+
+    if isinstance(predicate, tuple):
+        if len(predicate) != 2:
+            raise ValueError(f"Range predicates take a (low, high) pair, got {predicate}")
+
+        low, high = predicate
+        mask = np.ones(values.shape[0], dtype=bool)
+
+        if low is not None:
+            mask &= values >= low
+
+        if high is not None:
+            mask &= values <= high
+
+        return mask
+
+    if isinstance(predicate, (list, set, frozenset, np.ndarray)):
+        return np.isin(values, np.asarray(list(predicate) if isinstance(predicate, (set, frozenset)) else predicate))
+
+    return values == predicate
+
+
+def predicate_order(measurement_set, predicates: dict) -> list:
+    """
+    Columns stored as runs (IncrementalStMan) are evaluated first, their predicates only touch the run values and
+    usually leave far fewer rows for the other columns.
+    """
+    descriptions = {description.name: description for description in measurement_set.description}
+
+    for name in predicates:
+        if name not in descriptions:
+            raise KeyError(f"Column {name} not found in {measurement_set.filename}")
+
+        if descriptions[name].ndims != 0:
+            raise NotImplementedError(f"Selections on array column {name} are not supported, only scalar columns")
+
+    return sorted(
+        predicates, key=lambda name: not isinstance(measurement_set.data_manager(name), IncrementalStorageManager)
+    )
+
+
+def index_predicates(predicates: dict, table_index) -> dict:
+    """
+    :return: dict
+        Predicates resolvable by the secondary indexes, by index key. ANTENNA1 and ANTENNA2 are resolved together
+        through the baseline index when both select single antennas or lists of antennas.
+    """
+    resolved = {}
+
+    for name in ("TIME", "SCAN_NUMBER"):
+        if name in predicates and name in table_index and not callable(predicates[name]):
+            resolved[name] = predicates[name]
+
+    antennas = [predicates.get(name) for name in ("ANTENNA1", "ANTENNA2")]
+
+    if "BASELINE" in table_index and all(
+            antenna is not None and not callable(antenna) and not isinstance(antenna, tuple) for antenna in antennas
+    ):
+        antenna1, antenna2 = (
+            np.atleast_1d(np.asarray(list(antenna) if isinstance(antenna, (set, frozenset)) else antenna))
+            for antenna in antennas
+        )
+
+        resolved["BASELINE"] = np.stack(np.meshgrid(antenna1, antenna2, indexing="ij"), axis=-1).reshape(-1, 2)
+
+    return resolved
+
+
+def evaluate(
+        measurement_set,
+        predicates: dict,
+        starts: np.ndarray = None,
+        stops: np.ndarray = None,
+        table_index=None
+) -> tuple:
+    """
+    Evaluate column predicates one column at a time, each column is only read for the rows that passed the
+    previous ones. Predicates covered by the secondary indexes are resolved first without reading column data.
+
+    :param measurement_set: CasaMeasurementSet
+        Parsed table.
+    :param predicates: dict
+        Predicate per column name, see predicate_mask().
+    :param starts: np.ndarray
+        First row of each range to select from, the whole table by default.
+    :param stops: np.ndarray
+        End (exclusive) of each range to select from.
+    :param table_index: TableIndex
+        Secondary indexes of the table, optional.
+    :return: tuple
+        First row and end (exclusive) of each range of matching rows, sorted.
+    """
+    nrows = int(measurement_set.nrows)
+
+    if starts is None:
+        starts = np.array([0] if nrows > 0 else [], dtype=np.int64)
+        stops = np.array([nrows] if nrows > 0 else [], dtype=np.int64)
+
+    predicates = dict(predicates)
+
+    if table_index is not None:
+        for key, predicate in index_predicates(predicates, table_index).items():
+            matching = table_index.lookup(key, predicate)
+
+            if starts.size == 1 and starts[0] == 0 and stops[0] == nrows:
+                starts, stops = matching
+
+            else:
+                starts, stops = tools.rows_to_ranges(
+                    np.intersect1d(
+                        tools.ranges_to_rows(starts, stops), tools.ranges_to_rows(*matching), assume_unique=True
+                    )
+                )
+
+            for name in KEY_COLUMNS[key]:
+                del predicates[name]
+
+    for name in predicate_order(measurement_set, predicates):
+        if starts.size == 0:
+            break
+
+        manager = measurement_set.data_manager(name)
+
+        if isinstance(manager, IncrementalStorageManager):
+            rows = slice(starts[0], stops[0]) if starts.size == 1 else tools.ranges_to_rows(starts, stops)
+            runs = manager.read_runs(name, rows=rows)
+
+            mask = np.repeat(predicate_mask(runs.values, predicates[name]), runs.lengths())
+
+        else:
+            mask = predicate_mask(manager.read_ranges(name, starts, stops), predicates[name])
+
+        starts, stops = tools.rows_to_ranges(tools.ranges_to_rows(starts, stops)[mask])
+
+    return starts, stops
@@ -0,0 +1,258 @@
+import atexit
+import threading
+
+import numpy as np
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+from toolviper.utils import logger
+
+# Arrays inside a block start on this alignment.
+ALIGNMENT: int = 64
+
+# Columns are decoded into shared memory in blocks of rows of about this many bytes, the decoded column never exists
+# outside of the block.
+DECODE_BYTES: int = 2 ** 24
+
+# Blocks mapped by this process by name, attach() maps a block once however many arrays it holds.
+_ATTACHED = {}
+_ATTACHED_LOCK = threading.Lock()
+
+
+@dataclass(init=False)
+class SharedArray:
+    """
+    Descriptor of an array in a shared memory block. It pickles to a few bytes, workers attach() to the block and
+    read the array without copying it.
+    """
+    name: str
+    dtype: str
+    shape: tuple
+    offset: int
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+    def attach(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            The array, a view into the shared memory block. The block stays mapped in this process until detach().
+        """
+        with _ATTACHED_LOCK:
+            block = _ATTACHED.get(self.name)
+
+            if block is None:
+                block = _ATTACHED[self.name] = shared_memory.SharedMemory(name=self.name)
+
+        return np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=block.buf, offset=self.offset)
+
+
+def block_names(descriptors) -> set:
+    """
+    :param descriptors: SharedArray, str, dict or list
+        Descriptors or block names, e.g. the result of read_shared().
+    :return: set
+        Names of the blocks holding them.
+    """
+    if isinstance(descriptors, SharedArray):
+        return {descriptors.name}
+
+    if isinstance(descriptors, str):
+        return {descriptors}
+
+    if isinstance(descriptors, dict):
+        descriptors = descriptors.values()
+
+    return set().union(*[block_names(descriptor) for descriptor in descriptors])
+
+
+def close_block(block: shared_memory.SharedMemory):
+    try:
+        block.close()
+
+    except BufferError:
+        # Arrays attached to the block are still referenced, it is unmapped when they are collected.
+        pass
+
+
+def detach(descriptors=None):
+    """
+    Unmap shared memory blocks from this process, e.g. in a worker once it is done with a chunk. Arrays attached to
+    them must not be used afterwards.
+
+    :param descriptors: SharedArray, str, dict or list
+        Descriptors or block names, None detaches every block.
+    """
+    with _ATTACHED_LOCK:
+        names = list(_ATTACHED) if descriptors is None else block_names(descriptors)
+
+        for name in names:
+            block = _ATTACHED.pop(name, None)
+
+            if block is not None:
+                close_block(block)
+
+
+class SharedBlocks:
+    """
+    Owner of the shared memory blocks columns are decoded into. Every block is reference counted: it is created with
+    the reference of its owner, retain() adds one per consumer (e.g. per task handed the descriptors) and release()
+    drops one. The block is unlinked once the count drops to zero, so a block handed to a pool of workers exists once
+    and outlives none of them.
+    """
+    __slots__ = ["blocks", "references", "lock"]
+
+    def __init__(self):
+        self.blocks = {}
+        self.references = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SharedBlocks(blocks={len(self)}, nbytes={self.nbytes})"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.size for block in self.blocks.values())
+
+    def allocate(self, specs: dict) -> tuple:
+        """
+        Create a single block holding an array per entry.
+
+        :param specs: dict
+            (dtype, shape) per array name.
+        :return: tuple
+            SharedArray descriptors and arrays (views into the block) per name.
+        """
+        offsets = {}
+        nbytes = 0
+
+        for key, (dtype, shape) in specs.items():
+            nbytes = -(-nbytes // ALIGNMENT) * ALIGNMENT
+            offsets[key] = nbytes
+            nbytes += int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+
+        block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+
+        with self.lock:
+            self.blocks[block.name] = block
+            self.references[block.name] = 1
+
+        # The owner attaches through the same mapping.
+        with _ATTACHED_LOCK:
+            _ATTACHED[block.name] = block
+
+        descriptors = {}
+
+        for key, (dtype, shape) in specs.items():
+            descriptor = SharedArray()
+            descriptor.name = block.name
+            descriptor.dtype = np.dtype(dtype).str
+            descriptor.shape = tuple(int(axis) for axis in shape)
+            descriptor.offset = offsets[key]
+
+            descriptors[key] = descriptor
+
+        return descriptors, {key: descriptor.attach() for key, descriptor in descriptors.items()}
+
+    def retain(self, descriptors, count: int = 1):
+        """
+        Add references to the blocks holding the descriptors.
+        """
+        with self.lock:
+            for name in block_names(descriptors):
+                if name not in self.references:
+                    raise KeyError(f"Shared memory block {name} was released")
+
+                self.references[name] += count
+
+    def release(self, descriptors):
+        """
+        Drop a reference to the blocks holding the descriptors, blocks without references are unlinked.
+        """
+        released = []
+
+        with self.lock:
+            for name in block_names(descriptors):
+                if name not in self.references:
+                    continue
+
+                self.references[name] -= 1
+
+                if self.references[name] <= 0:
+                    del self.references[name]
+                    released.append(self.blocks.pop(name))
+
+        for block in released:
+            self.unlink(block)
+
+    def track(self, future, descriptors):
+        """
+        Hold a reference to the blocks of the descriptors until the future (e.g. a task submitted to a process pool
+        with them) is done.
+        """
+        self.retain(descriptors)
+        future.add_done_callback(lambda _: self.release(descriptors))
+
+        return future
+
+    def unlink(self, block: shared_memory.SharedMemory):
+        with _ATTACHED_LOCK:
+            _ATTACHED.pop(block.name, None)
+
+        close_block(block)
+
+        try:
+            block.unlink()
+
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """
+        Unlink every block whatever its references.
+        """
+        with self.lock:
+            blocks = list(self.blocks.values())
+
+            self.blocks.clear()
+            self.references.clear()
+
+        if blocks:
+            logger.debug(f"Unlinking {len(blocks)} shared memory blocks")
+
+        for block in blocks:
+            self.unlink(block)
+
+
+def decode_into(manager, name: str, rows: np.ndarray, out: np.ndarray, block_bytes: int = DECODE_BYTES):
+    """
+    Decode the rows of a column into a preallocated (e.g. shared) array, block of rows by block of rows.
+    """
+    block_rows = max(1, block_bytes // max(manager.row_bytes(name), 1))
+
+    for start in range(0, rows.size, block_rows):
+        out[start:start + block_rows] = manager.read_column(name, rows=rows[start:start + block_rows])
+
+
+_OWNER = SharedBlocks()
+
+atexit.register(_OWNER.close)
+
+
+def owner() -> SharedBlocks:
+    """
+    :return: SharedBlocks
+        Process wide owner of the blocks created without an explicit owner, its blocks are unlinked at exit.
+    """
+    return _OWNER
@@ -0,0 +1,200 @@
+import time
+import threading
+import contextlib
+
+# Returned by section() when instrumentation is disabled, nullcontext can be entered any number of times.
+DISABLED = contextlib.nullcontext()
+
+COUNTERS = ["bytes", "reads", "seeks"]
+
+
+class Section:
+    """
+    Node of the timing tree. Counters hold what was read while the section was the innermost active one, wall time
+    includes the child sections.
+    """
+    __slots__ = ["name", "bytes", "reads", "seeks", "seconds", "calls", "children"]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.bytes = 0
+        self.reads = 0
+        self.seeks = 0
+        self.seconds = 0.0
+        self.calls = 0
+        self.children = {}
+
+    def child(self, name: str):
+        # Sections entered repeatedly under the same parent (e.g. once per open) accumulate in a single node.
+        node = self.children.get(name)
+
+        if node is None:
+            node = self.children[name] = Section(name)
+
+        return node
+
+    def merge(self, other: "Section"):
+        """
+        Add the counters, time and child sections of another node with the same name to this one.
+        """
+        for counter in COUNTERS + ["seconds", "calls"]:
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+
+        for name, child in other.children.items():
+            if name in self.children:
+                self.children[name].merge(child)
+
+            else:
+                self.children[name] = child
+
+    def total(self, counter: str) -> int:
+        """
+        :param counter: str
+            One of bytes, reads or seeks.
+        :return: int
+            Counter of the section including its child sections.
+        """
+        return getattr(self, counter) + sum(child.total(counter) for child in self.children.values())
+
+    def tree(self) -> dict:
+        """
+        :return: dict
+            Nested timing tree with the totals of each section.
+        """
+        return {
+            "name": self.name,
+            "seconds": self.seconds,
+            "calls": self.calls,
+            **{counter: self.total(counter) for counter in COUNTERS},
+            "children": [child.tree() for child in self.children.values()]
+        }
+
+    def lines(self, depth: int = 0) -> list:
+        lines = [
+            f"{'  ' * depth}{self.name}: {self.seconds * 1e3:.3f} ms, {self.total('bytes')} bytes, "
+            f"{self.total('reads')} reads, {self.total('seeks')} seeks"
+        ]
+
+        for child in self.children.values():
+            lines.extend(child.lines(depth + 1))
+
+        return lines
+
+
+class IOStats:
+    """
+    Opt-in instrumentation of table reads, pass an instance as the stats argument of reader.open() or
+    CasaMeasurementSet. Bytes, read calls and seeks are attributed to the innermost active section, e.g.
+
+        stats = IOStats()
+        table = reader.open("my.ms", stats=stats)
+        print(stats.report())
+
+    Each thread keeps its own stack of active sections, so tables opened concurrently can share an instance.
+    """
+    __slots__ = ["root", "local"]
+
+    def __init__(self, name: str = "total"):
+        self.root = Section(name)
+        self.local = threading.local()
+
+    @property
+    def current(self) -> Section:
+        stack = getattr(self.local, "stack", None)
+
+        if stack is None:
+            stack = self.local.stack = [self.root]
+
+        return stack[-1]
+
+    def record(self, nbytes: int):
+        section = self.current
+        section.bytes += nbytes
+        section.reads += 1
+
+    def record_seek(self):
+        self.current.seeks += 1
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        """
+        Time the enclosed block as a child of the current section. The yielded node may be renamed inside the block,
+        e.g. once the column it times has been decoded.
+
+        :param name: str
+            Section name, e.g. "keywords" or a column name.
+        """
+        parent = self.current
+        node = parent.child(name)
+        self.local.stack.append(node)
+
+        start = time.perf_counter()
+
+        try:
+            yield node
+
+        finally:
+            node.seconds += time.perf_counter() - start
+            node.calls += 1
+            self.local.stack.pop()
+
+            if node.name != name:
+                parent.children.pop(name)
+
+                # A renamed node entered before (e.g. the same column of a table opened again) accumulates too.
+                if node.name in parent.children:
+                    parent.children[node.name].merge(node)
+
+                else:
+                    parent.children[node.name] = node
+
+    @property
+    def bytes(self) -> int:
+        return self.root.total("bytes")
+
+    @property
+    def reads(self) -> int:
+        return self.root.total("reads")
+
+    @property
+    def seeks(self) -> int:
+        return self.root.total("seeks")
+
+    @property
+    def seconds(self) -> float:
+        return self.root.seconds + sum(child.seconds for child in self.root.children.values())
+
+    def tree(self) -> dict:
+        tree = self.root.tree()
+        tree["seconds"] = self.seconds
+
+        return tree
+
+    def report(self) -> str:
+        """
+        :return: str
+            Indented timing tree, one line per section.
+        """
+        return "\n".join(
+            [f"{self.root.name}: {self.seconds * 1e3:.3f} ms, {self.bytes} bytes, {self.reads} reads, {self.seeks} seeks"]
+            + [line for child in self.root.children.values() for line in child.lines(1)]
+        )
+
+    def reset(self):
+        self.root = Section(self.root.name)
+        self.local = threading.local()
+
+
+def section(stats, name: str):
+    """
+    :param stats: IOStats or None
+        Instrumentation of the current read, None when it is disabled.
+    :param name: str
+        Section name.
+    :return: context manager
+        Timed section, or a shared no-op context when instrumentation is disabled.
+    """
+    if stats is None:
+        return DISABLED
+
+    return stats.section(name)
@@ -3,11 +3,12 @@ import pathlib
 import numpy as np
 import graphviper.utils.logger as logger
 
+from mio.core import stats
 from mio.utilities import types
 from mio.managers import store
 
 from collections import OrderedDict
-from mio.core.binary import BinaryFileReader
+from mio.core.binary import BinaryFileReader, BufferReader
 
 from dataclasses import dataclass
 
@@ -19,10 +20,63 @@ class RecordDescription:
     nrecords: int
 
 
-@dataclass(init=False)
 class TableRecord:
-    description: RecordDescription
-    records: dict
+    """
+    Keyword record. Records read lazily keep their raw bytes and are decoded on first access of their description
+    or records, so opening a table doesn't pay for keywords nobody looks at (e.g. MEASINFO of every column).
+    """
+    __slots__ = ["_description", "_records", "source"]
+
+    def __init__(self, description: RecordDescription = None, records: dict = None, source: tuple = None):
+        """
+        :param source: tuple
+            Raw bytes, endianess and file name of a record that still has to be decoded.
+        """
+        self._description = description
+        self._records = records
+        self.source = source
+
+    def __repr__(self) -> str:
+        if self.source is not None:
+            return f"TableRecord(<{len(self.source[0])} bytes, not decoded>)"
+
+        return f"TableRecord(description={self._description!r}, records={self._records!r})"
+
+    @property
+    def decoded(self) -> bool:
+        return self.source is None
+
+    def decode(self):
+        if self.source is None:
+            return
+
+        buffer, endian, filename = self.source
+
+        record = read_record(BufferReader(buffer, endian=endian, filename=filename))
+
+        self._description = record.description
+        self._records = record.records
+        self.source = None
+
+    @property
+    def description(self) -> RecordDescription:
+        self.decode()
+
+        return self._description
+
+    @description.setter
+    def description(self, description: RecordDescription):
+        self._description = description
+
+    @property
+    def records(self) -> dict:
+        self.decode()
+
+        return self._records
+
+    @records.setter
+    def records(self, records: dict):
+        self._records = records
 
 
 @dataclass(init=False)
@@ -141,22 +195,41 @@ def read_column_set(file_handle: BinaryFileReader, description: list[ColumnDescr
     # to read the data managers here instead of switching to plain column reads.
     column_set.columns = [build_plain_column(file_handle, entry.ndims) for entry in description]
 
-    # Read magic code (again) and a length
-    file_handle.read(types.EIGHT_BYTES)
-
     column_set.data_managers = OrderedDict()
 
     for sequence_number in data_manager_class:
-        #logger.debug(f"Manager: {data_manager_class[sequence_number]}")
-        column_set.data_managers[sequence_number] = data_manager_class[sequence_number].read(file_handle)
-
-        # What is this ...
-        file_handle.read(types.EIGHT_BYTES)
+        # Each data manager writes its own section prefixed by its length. Tiled managers keep everything in their
+        # own header file and leave the section empty.
+        with stats.section(file_handle.stats, f"{data_manager_class[sequence_number].__name__} {sequence_number}"):
+            length = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+            start = file_handle.tell()
+
+            if length > 0:
+                # Read magic code (again)
+                file_handle.read(types.FOUR_BYTES)
+                manager = data_manager_class[sequence_number].read(file_handle)
+
+            else:
+                manager = data_manager_class[sequence_number]()
+
+            file_handle.seek(start + length)
+
+            manager.bind(
+                path=pathlib.Path(file_handle.filename).resolve().parent,
+                sequence_number=sequence_number,
+                nrows=column_set.nrows,
+                columns=[
+                    (entry, plain_column) for entry, plain_column in zip(description, column_set.columns)
+                    if plain_column.data.sequence_number == sequence_number
+                ]
+            )
+
+        column_set.data_managers[sequence_number] = manager
 
     return column_set
 
 
-def read_column_description(file_handle) -> ColumnDescription:
+def read_column_description(file_handle, lazy: bool = False) -> ColumnDescription:
     # Instantiate column description structure
     column_description = ColumnDescription()
 
@@ -182,12 +255,13 @@ def read_column_description(file_handle) -> ColumnDescription:
     column_description.option = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
 
     # Here we want to determine which bit is set
-    #   option = 0x1010 for instance
-    #   direct >> 3 ==> 0x1 so direct is then
-    #   direct = 0x1 == 0x1 ==> True
-    column_description.direct = (column_description.option >> 3) == types.ONE_BYTE
-    column_description.undefined = (column_description.option >> 2) == types.ONE_BYTE
-    column_description.fixed_shape = (column_description.option >> 1) == types.ONE_BYTE
+    #   option = 0b101 for instance
+    #   direct = 0b101 & 0b001 ==> True
+    #   fixed_shape = 0b101 & 0b100 ==> True
+    # A direct column always has a fixed shape.
+    column_description.direct = bool(column_description.option & types.DIRECT)
+    column_description.undefined = bool(column_description.option & types.UNDEFINED)
+    column_description.fixed_shape = bool(column_description.option & (types.FIXED_SHAPE | types.DIRECT))
 
     # Set default value for shape
     column_description.shape = None
@@ -196,12 +270,12 @@ def read_column_description(file_handle) -> ColumnDescription:
     column_description.ndims = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
 
     if column_description.ndims != 0:
-        column_description.shape = file_handle.position(size=types.FOUR_BYTES, dtype=np.int8)
+        column_description.shape = file_handle.position(size=types.FOUR_BYTES, dtype=np.int32).tolist()
 
     column_description.max_length = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
 
     # Need to read the table record for the column
-    column_description.keywords = read_record(file_handle)
+    column_description.keywords = read_record(file_handle, lazy=lazy)
 
     # Random read?
     file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
@@ -242,27 +316,54 @@ def read_record_description(file_handle) -> RecordDescription:
         raw_type = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
         description.types.append(types.TYPE_LIST[raw_type])
 
-        if types.TYPE_LIST[raw_type] in ('bool', 'int', 'uint', 'float', 'double', 'complex', 'dcomplex', 'string'):
+        if types.TYPE_LIST[raw_type] == "table":
+            # Name of the table description
             file_handle.string(size=types.FOUR_BYTES)
 
-        elif types.TYPE_LIST[raw_type] == "table":
-            file_handle.read(types.EIGHT_BYTES)
-
         elif types.TYPE_LIST[raw_type].startswith("array"):
+            # Shape of fixed shape array fields
             file_handle.position(size=types.FOUR_BYTES, dtype=np.int32)
-            file_handle.read(types.FOUR_BYTES)
 
         elif types.TYPE_LIST[raw_type] == "record":
             read_record_description(file_handle)
-            file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
 
-        else:
+        elif types.TYPE_LIST[raw_type] not in types.TYPE_TO_BYTES and types.TYPE_LIST[raw_type] != "string":
             logger.debug(f"Not implemented: {types.TYPE_LIST[raw_type]}")
 
+        # Field comment
+        file_handle.string(size=types.FOUR_BYTES)
+
     return description
 
 
-def read_record(file_handle):
+def read_array_value(file_handle, record_type: str) -> np.ndarray:
+    element_type = "string" if record_type == "arraystr" else record_type[len("array"):]
+
+    values = file_handle.array(element_type)
+
+    if element_type in ("string", "bool"):
+        return values
+
+    return values.astype(np.dtype(types.DATA_TYPE[element_type]).newbyteorder("<"))
+
+
+def read_record(file_handle, lazy: bool = False):
+    """
+    :param file_handle: BinaryFileReader
+        Reader positioned at the start of a TableRecord.
+    :param lazy: bool
+        Skip over the record and keep its raw bytes, it is decoded on first access of its description or records.
+    :return: TableRecord
+    """
+    if lazy:
+        start = file_handle.tell()
+
+        # The object length counts from the length field itself to the end of the record.
+        length = file_handle.integer(size=types.FOUR_BYTES, dtype=np.uint32)
+        file_handle.seek(start)
+
+        return TableRecord(source=(file_handle.read(int(length)), file_handle.endian, file_handle.filename))
+
     file_handle.header()
 
     record_object = TableRecord()
@@ -275,13 +376,24 @@ def read_record(file_handle):
 
     for name, record_type in zip(description.names, description.types):
         if record_type == "bool":
-            record_object.records[name] = file_handle.bool()
+            record_object.records[name] = file_handle.boolean()
 
-        elif record_type == "int":
-            record_object.records[name] = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+        elif record_type in ("char", "short", "int"):
+            record_object.records[name] = file_handle.integer(
+                size=types.TYPE_TO_BYTES[record_type], dtype=np.dtype(types.DATA_TYPE[record_type]).type
+            )
+
+        elif record_type in ("uchar", "ushort"):
+            record_object.records[name] = np.frombuffer(
+                file_handle.read(types.TYPE_TO_BYTES[record_type]),
+                dtype=np.dtype(types.DATA_TYPE[record_type]).newbyteorder(file_handle.endian)
+            )[0]
 
         elif record_type == "uint":
-            record_object.records[name] = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+            record_object.records[name] = file_handle.integer(size=types.FOUR_BYTES, dtype=np.uint32)
+
+        elif record_type == "int64":
+            record_object.records[name] = file_handle.integer(size=types.EIGHT_BYTES, dtype=np.int64)
 
         elif record_type == "float":
             record_object.records[name] = file_handle.float(size=types.FOUR_BYTES, dtype=np.float32)
@@ -290,38 +402,21 @@ def read_record(file_handle):
             record_object.records[name] = file_handle.float(size=types.EIGHT_BYTES, dtype=np.float64)
 
         elif record_type == "complex":
-            record_object.records[name] = file_handle.float(size=types.EIGHT_BYTES, dtype=np.float64)
+            record_object.records[name] = file_handle.complex(size=types.EIGHT_BYTES, dtype=np.complex64)
 
         elif record_type == "dcomplex":
-            record_object.records[name] = file_handle.float(size=types.SIXTEEN_BYTES, dtype=np.float128)
+            record_object.records[name] = file_handle.complex(size=types.SIXTEEN_BYTES, dtype=np.complex128)
 
         elif record_type == "string":
             record_object.records[name] = file_handle.string(size=types.FOUR_BYTES)
 
         elif record_type == "table":
+            # Subtables are stored relative to the directory of the table holding the keyword.
             record_object.records[name] = str(
-                pathlib.Path(file_handle.filename).resolve().joinpath(file_handle.string(size=types.FOUR_BYTES)))
-
-        elif record_type == 'arrayint':
-            record_object.records[name] = file_handle.array('int').astype('<i4')
-
-        elif record_type == 'arrayuint':
-            record_object.records[name] = file_handle.array('uint').astype('<u4')
-
-        elif record_type == 'arrayfloat':
-            record_object.records[name] = file_handle.array('float').astype('<f4')
-
-        elif record_type == 'arraydouble':
-            record_object.records[name] = file_handle.array('double').astype('<f8')
-
-        elif record_type == 'arraycomplex':
-            record_object.records[name] = file_handle.array('complex').astype('<c8')
-
-        elif record_type == 'arraydcomplex':
-            record_object.records[name] = file_handle.array('dcomplex').astype('<c16')
+                pathlib.Path(file_handle.filename).resolve().parent.joinpath(file_handle.string(size=types.FOUR_BYTES)))
 
-        elif record_type == 'arraystr':
-            record_object.records[name] = file_handle.array('string')
+        elif record_type.startswith("array") and record_type not in ("arrayquantity",):
+            record_object.records[name] = read_array_value(file_handle, record_type)
 
         elif record_type == 'record':
             record_object.records[name] = read_record(file_handle)
@@ -0,0 +1,352 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.core.binary import BinaryFileReader, BufferReader
+from mio.core import decode
+from mio.core.block import read_array_block
+from mio.managers import indirect
+from mio.utilities import tools
+from mio.utilities import types
+
+# Buckets of the StandardStMan file start after a fixed size header.
+BUCKET_OFFSET: int = 512
+
+# String buckets start with four (canonical, big endian) integers: bucket bookkeeping and the next bucket number of
+# a chained string.
+STRING_BUCKET_HEADER: int = 16
+
+# Index buckets start with two (canonical, big endian) integers, the first one is the next index bucket.
+INDEX_BUCKET_HEADER: int = 8
+
+# Variable length strings are stored as 8 bytes of data, or a (bucket, offset) pair, followed by the length.
+STRING_ENTRY: int = 12
+
+MAGIC: bytes = b"\xbe\xbe\xbe\xbe"
+
+
+@dataclass(init=False)
+class StandardHeader:
+    version: int
+    big_endian: bool
+    bucket_size: int
+    nbuckets: int
+    cache_size: int
+    nfree_buckets: int
+    first_free_bucket: int
+    nindex_buckets: int
+    first_index_bucket: int
+    index_offset: int
+    last_string_bucket: int
+    index_length: int
+    nindexes: int
+
+
+@dataclass(init=False)
+class StandardIndex:
+    version: int
+    nused: int
+    rows_per_bucket: int
+    ncolumns: int
+    last_row: np.ndarray
+    first_row: np.ndarray
+    bucket_number: np.ndarray
+
+
+def read_standard_header(file_handle: BinaryFileReader) -> StandardHeader:
+    header = StandardHeader()
+
+    # The magic code and endianess are checked when the file is opened.
+    file_handle.seek(types.FOUR_BYTES)
+    _, header.version = file_handle.header()
+
+    # Files written before version 3 are always big endian.
+    header.big_endian = file_handle.boolean() if header.version >= 3 else True
+
+    header.bucket_size = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nbuckets = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.cache_size = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nfree_buckets = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.first_free_bucket = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nindex_buckets = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.first_index_bucket = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    header.index_offset = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32) if header.version >= 2 else 0
+
+    header.last_string_bucket = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.index_length = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nindexes = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    return header
+
+
+def bucket_start(header: StandardHeader, bucket) -> int:
+    return BUCKET_OFFSET + bucket * header.bucket_size
+
+
+def read_index_buffer(file_handle: BinaryFileReader, header: StandardHeader) -> bytes:
+    # A small index sits in the free space at the end of a bucket.
+    if header.index_offset > 0:
+        file_handle.seek(bucket_start(header, header.first_index_bucket) + header.index_offset)
+
+        return file_handle.read(header.index_length)
+
+    # Otherwise it fills a chain of dedicated index buckets, a single one included.
+    chunks = []
+    bucket = header.first_index_bucket
+    remaining = header.index_length
+
+    while remaining > 0 and bucket >= 0:
+        start = bucket_start(header, bucket)
+
+        file_handle.seek(start)
+        bucket = int.from_bytes(file_handle.read(types.FOUR_BYTES), "big", signed=True)
+
+        file_handle.seek(start + INDEX_BUCKET_HEADER)
+        chunk = file_handle.read(min(remaining, header.bucket_size - INDEX_BUCKET_HEADER))
+
+        chunks.append(chunk)
+        remaining -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def read_standard_indexes(file_handle: BinaryFileReader, header: StandardHeader) -> list:
+    reader = BufferReader(read_index_buffer(file_handle, header), endian=file_handle.endian)
+
+    indexes = []
+
+    for _ in range(header.nindexes):
+        if reader.read(types.FOUR_BYTES) != MAGIC:
+            reader.seek(-types.FOUR_BYTES, whence=1)
+
+        index = StandardIndex()
+
+        _, index.version = reader.header()
+
+        index.nused = reader.integer(size=types.FOUR_BYTES, dtype=np.int32)
+        index.rows_per_bucket = reader.integer(size=types.FOUR_BYTES, dtype=np.int32)
+        index.ncolumns = reader.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+        # Map of free space per bucket, only needed when writing so skip over it.
+        start = reader.tell()
+        reader.seek(start + reader.integer(size=types.FOUR_BYTES, dtype=np.int32))
+
+        index.last_row = read_array_block(reader).elements[:index.nused]
+        index.bucket_number = read_array_block(reader).elements[:index.nused]
+        index.first_row = np.concatenate(([0], index.last_row[:-1] + 1)).astype(np.int64)
+
+        indexes.append(index)
+
+    return indexes
+
+
+def locate(index: StandardIndex, rows: np.ndarray) -> tuple:
+    """
+    :param index: StandardIndex
+        Row index of the column.
+    :param rows: np.ndarray
+        Row numbers.
+    :return: tuple
+        Bucket number and row number within the bucket of each row.
+    """
+    slot = np.searchsorted(index.last_row, rows, side="left")
+
+    return index.bucket_number[slot], rows - index.first_row[slot]
+
+
+def file_bytes(file_handle: BinaryFileReader) -> np.ndarray:
+    return np.frombuffer(file_handle.view, dtype=np.uint8)
+
+
+def is_contiguous(rows: np.ndarray) -> bool:
+    return rows.size > 0 and rows[-1] - rows[0] == rows.size - 1 and bool(np.all(np.diff(rows) == 1))
+
+
+def gather_fixed(
+        data: np.ndarray,
+        header: StandardHeader,
+        index: StandardIndex,
+        offset: int,
+        nbytes: int,
+        rows: np.ndarray
+) -> np.ndarray:
+    """
+    Gather fixed size cells from a strided (bucket, row, byte) view of the file. Contiguous row ranges are copied
+    bucket by bucket in one fancy-indexing pass over the buckets, arbitrary selections in one pass over the rows.
+
+    :return: np.ndarray
+        Array of shape (nrows, nbytes) holding the raw cell bytes.
+    """
+    region = np.lib.stride_tricks.as_strided(
+        data[BUCKET_OFFSET + offset:],
+        shape=(header.nbuckets, index.rows_per_bucket, nbytes),
+        strides=(header.bucket_size, nbytes, 1),
+        writeable=False
+    )
+
+    if not is_contiguous(rows):
+        bucket, row = locate(index, rows)
+
+        return region[bucket, row]
+
+    first = np.searchsorted(index.last_row, rows[0])
+    last = np.searchsorted(index.last_row, rows[-1]) + 1
+
+    values = region[index.bucket_number[first:last]]
+    counts = index.last_row[first:last] - index.first_row[first:last] + 1
+
+    # Buckets are normally filled up completely, only drop the unused rows when they are not.
+    if np.all(counts[:-1] == index.rows_per_bucket):
+        values = values.reshape(-1, nbytes)
+
+    else:
+        values = values[np.arange(index.rows_per_bucket) < counts[:, None]]
+
+    skip = rows[0] - index.first_row[first]
+
+    return values[skip:skip + rows.size]
+
+
+def gather_bits(
+        data: np.ndarray,
+        header: StandardHeader,
+        index: StandardIndex,
+        offset: int,
+        nbits: int,
+        rows: np.ndarray
+) -> np.ndarray:
+    """
+    Gather bit packed boolean cells, bits are stored least significant first and packed over the rows of a bucket.
+
+    :return: np.ndarray
+        Boolean array of shape (nrows, nbits).
+    """
+    bucket, row = locate(index, rows)
+    first_bits = (BUCKET_OFFSET + bucket * header.bucket_size + offset) * 8 + row * nbits
+
+    values = np.empty((rows.size, nbits), dtype=bool)
+    decode.unpack_bit_rows(data, first_bits.astype(np.int64), values.view(np.uint8).reshape(-1))
+
+    return values
+
+
+def gather_packed_bits(
+        data: np.ndarray,
+        header: StandardHeader,
+        index: StandardIndex,
+        offset: int,
+        nbits: int,
+        rows: np.ndarray
+) -> np.ndarray:
+    """
+    gather_bits() without unpacking, the cells of the rows are packed one after the other.
+
+    :return: np.ndarray
+        uint8 array of ceil(nrows * nbits / 8) bytes.
+    """
+    bucket, row = locate(index, rows)
+    first_bits = (BUCKET_OFFSET + bucket * header.bucket_size + offset) * 8 + row * nbits
+
+    values = np.zeros(-(-rows.size * nbits // 8), dtype=np.uint8)
+    decode.copy_bit_rows(data, first_bits.astype(np.int64), nbits, values)
+
+    return values
+
+
+def read_long_string(data: np.ndarray, header: StandardHeader, bucket: int, offset: int, length: int) -> bytes:
+    chunks = []
+
+    while length > 0 and bucket >= 0:
+        start = bucket_start(header, bucket)
+        available = header.bucket_size - STRING_BUCKET_HEADER - offset
+        chunk = data[start + STRING_BUCKET_HEADER + offset:start + STRING_BUCKET_HEADER + offset + min(length, available)]
+
+        chunks.append(chunk.tobytes())
+        length -= chunk.size
+
+        # Continue in the next bucket of the chain.
+        bucket = int(data[start + 12:start + 16].view(">i4")[0])
+        offset = 0
+
+    return b"".join(chunks)
+
+
+def decode_strings(data: np.ndarray, header: StandardHeader, entries: np.ndarray, endian: str) -> np.ndarray:
+    """
+    :param entries: np.ndarray
+        Raw (nrows, 12) string entries gathered from the buckets.
+    :return: np.ndarray
+        Unicode string array.
+    """
+    numbers = np.ascontiguousarray(entries).view(f"{endian}i4")
+    length = numbers[:, 2]
+
+    # Strings up to 8 characters are stored in place, the bytes past their length are garbage.
+    short = np.where(np.arange(types.EIGHT_BYTES) < length[:, None], entries[:, :types.EIGHT_BYTES], 0)
+    strings = np.ascontiguousarray(short, dtype=np.uint8).view("S8").ravel()
+
+    # Anything longer lives in the string buckets.
+    long = np.flatnonzero(length > types.EIGHT_BYTES)
+
+    if long.size > 0:
+        strings = strings.astype(f"S{int(length[long].max())}")
+
+        for i in long:
+            strings[i] = read_long_string(data, header, int(numbers[i, 0]), int(numbers[i, 1]), int(length[i]))
+
+    return decode.to_str(strings)
+
+
+def decode_string_arrays(data: np.ndarray, header: StandardHeader, entries: np.ndarray, endian: str,
+                         ndim: int) -> indirect.RaggedArray:
+    """
+    Indirect string arrays live in the string buckets: the (canonical, big endian) number of dimensions and shape, a
+    single integer, then the length prefixed strings. The cells are copied out of the buckets in file order and
+    decoded together.
+
+    :param entries: np.ndarray
+        Raw (nrows, 12) string entries gathered from the buckets.
+    :return: RaggedArray
+    """
+    numbers = np.ascontiguousarray(entries).view(f"{endian}i4").astype(np.int64)
+    bucket, offset, length = numbers[:, 0], numbers[:, 1], numbers[:, 2]
+
+    rows = np.flatnonzero(length > 0)
+    rows = rows[np.lexsort((offset[rows], bucket[rows]))]
+
+    destinations = np.concatenate(([0], np.cumsum(length[rows])))
+    cells = np.empty(int(destinations[-1]), dtype=np.uint8)
+
+    # Cells that don't fit in the rest of their bucket continue in a chain of buckets.
+    chained = offset[rows] + length[rows] > header.bucket_size - STRING_BUCKET_HEADER
+
+    inside = rows[~chained]
+    decode.copy(
+        data,
+        BUCKET_OFFSET + bucket[inside] * header.bucket_size + STRING_BUCKET_HEADER + offset[inside],
+        length[inside],
+        destinations[:-1][~chained],
+        cells
+    )
+
+    for row, destination in zip(rows[chained], destinations[:-1][chained]):
+        cells[destination:destination + length[row]] = np.frombuffer(
+            read_long_string(data, header, int(bucket[row]), int(offset[row]), int(length[row])), dtype=np.uint8
+        )
+
+    ndims, shapes, starts = decode.cell_headers(
+        cells, destinations[:-1], ndim if ndim > 0 else indirect.MAX_NDIM, True
+    )
+
+    shapes, element_offsets = indirect.cell_layout(entries.shape[0], rows, ndims, shapes, max(ndim, 0))
+
+    offsets, lengths, _ = decode.string_layout(
+        cells, starts + types.FOUR_BYTES, element_offsets[rows + 1] - element_offsets[rows], True
+    )
+
+    # The strings of the cells are in file order, put them in row order.
+    source = np.empty(offsets.size, dtype=np.int64)
+    source[tools.ranges_to_rows(element_offsets[rows], element_offsets[rows + 1])] = np.arange(offsets.size)
+
+    return indirect.ragged_array(decode.gather_str(cells, offsets[source], lengths[source]), element_offsets, shapes)
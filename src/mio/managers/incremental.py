@@ -0,0 +1,155 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.core.binary import BinaryFileReader
+from mio.core.block import read_array_block
+from mio.utilities import types
+
+# Buckets of the IncrementalStMan file start after a fixed size header, the row index follows the last bucket.
+BUCKET_OFFSET: int = 512
+
+MAGIC: bytes = b"\xbe\xbe\xbe\xbe"
+
+
+@dataclass(init=False)
+class IncrementalHeader:
+    version: int
+    big_endian: bool
+    bucket_size: int
+    nbuckets: int
+    cache_size: int
+    unique_number: int
+    nfree_buckets: int
+    first_free_bucket: int
+
+
+@dataclass(init=False)
+class IncrementalIndex:
+    version: int
+    nused: int
+    rows: np.ndarray
+    bucket_number: np.ndarray
+
+
+def read_incremental_header(file_handle: BinaryFileReader) -> IncrementalHeader:
+    header = IncrementalHeader()
+
+    # The magic code and endianess are checked when the file is opened.
+    file_handle.seek(types.FOUR_BYTES)
+    _, header.version = file_handle.header()
+
+    # Files written before version 5 are always big endian.
+    header.big_endian = file_handle.boolean() if header.version >= 5 else True
+
+    header.bucket_size = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nbuckets = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.cache_size = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.unique_number = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nfree_buckets = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.first_free_bucket = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    return header
+
+
+def read_incremental_index(file_handle: BinaryFileReader, header: IncrementalHeader) -> IncrementalIndex:
+    index = IncrementalIndex()
+
+    file_handle.seek(BUCKET_OFFSET + header.nbuckets * header.bucket_size)
+
+    if file_handle.read(types.FOUR_BYTES) != MAGIC:
+        file_handle.seek(-types.FOUR_BYTES, whence=1)
+
+    _, index.version = file_handle.header()
+
+    index.nused = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    # First row of each bucket, with the total number of rows as closing entry.
+    index.rows = read_array_block(file_handle).elements[:index.nused + 1]
+    index.bucket_number = read_array_block(file_handle).elements[:index.nused]
+
+    return index
+
+
+def read_bucket_index(data: np.ndarray, header: IncrementalHeader, bucket: int, ncolumns: int) -> list:
+    """
+    Each bucket starts with the offset of its index. The index holds, per column, the number of entries followed by
+    the (bucket relative) start row and the data offset of every value stored in the bucket.
+
+    :return: list
+        (rows, offsets) arrays per column.
+    """
+    dtype = np.dtype(">u4" if header.big_endian else "<u4")
+    start = BUCKET_OFFSET + bucket * header.bucket_size
+
+    position = start + int(data[start:start + types.FOUR_BYTES].view(dtype)[0])
+
+    entries = []
+
+    for _ in range(ncolumns):
+        nentries = int(data[position:position + types.FOUR_BYTES].view(dtype)[0])
+        position += types.FOUR_BYTES
+
+        values = data[position:position + 2 * nentries * types.FOUR_BYTES].view(dtype).astype(np.int64)
+        position += 2 * nentries * types.FOUR_BYTES
+
+        entries.append((values[:nentries], values[nentries:]))
+
+    return entries
+
+
+def decode_values(data: np.ndarray, header: IncrementalHeader, bucket: int, offsets: np.ndarray, value_type: str,
+                  shape: tuple) -> np.ndarray:
+    """
+    Decode the values stored at the given offsets of the data part of a bucket, the data part follows the 4 byte
+    index offset at the start of the bucket.
+    """
+    endian = ">" if header.big_endian else "<"
+    start = BUCKET_OFFSET + bucket * header.bucket_size + types.FOUR_BYTES
+
+    if value_type == "string":
+        length = np.dtype(endian + "u4")
+        strings = []
+
+        # Strings are stored with their total length, the length field included.
+        for offset in offsets:
+            position = start + int(offset)
+            nbytes = int(data[position:position + types.FOUR_BYTES].view(length)[0])
+
+            strings.append(
+                data[position + types.FOUR_BYTES:position + nbytes].tobytes().decode("utf-8", errors="replace")
+            )
+
+        return np.array(strings, dtype=str)
+
+    if value_type == "bool":
+        dtype = np.dtype(np.uint8)
+
+    else:
+        dtype = np.dtype(endian + types.DATA_TYPE[value_type])
+
+    nbytes = dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+    raw = data[start + offsets[:, None] + np.arange(nbytes, dtype=np.int64)]
+    values = np.ascontiguousarray(raw).view(dtype).reshape((offsets.size,) + shape)
+
+    if value_type == "bool":
+        return values != 0
+
+    return values.astype(dtype.newbyteorder("="), copy=False)
+
+
+def merge_runs(starts: np.ndarray, values: np.ndarray) -> tuple:
+    """
+    Drop runs that repeat the value of the previous run, e.g. the value every bucket repeats for its first row.
+    """
+    if values.shape[0] < 2:
+        return starts, values
+
+    different = values[1:] != values[:-1]
+
+    if different.ndim > 1:
+        different = different.reshape(different.shape[0], -1).any(axis=1)
+
+    keep = np.concatenate(([True], different))
+
+    return starts[keep], values[keep]
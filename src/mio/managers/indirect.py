@@ -0,0 +1,204 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.core import decode
+from mio.utilities import tools
+from mio.utilities import types
+
+# The array file starts with its version (uint32) and length (int64).
+FILE_HEADER: int = 12
+
+# Upper bound on the dimensions of a cell for columns that don't fix them.
+MAX_NDIM: int = 32
+
+# Shape groups are copied run by run when their runs of consecutive rows are at least this long on average.
+RUN_ROWS: int = 16
+
+
+@dataclass(init=False)
+class ArrayFileHeader:
+    version: int
+    length: int
+    big_endian: bool
+
+
+@dataclass(init=False)
+class RaggedArray:
+    """
+    Cells of an indirect (variable shape) array column. Cell i holds values[offsets[i]:offsets[i + 1]] with shape
+    shapes[i] in numpy (C) order, cells without a value have a shape of zeros.
+    """
+    values: np.ndarray
+    offsets: np.ndarray
+    shapes: np.ndarray
+
+    def __len__(self) -> int:
+        return self.shapes.shape[0]
+
+    def __getitem__(self, row: int) -> np.ndarray:
+        return self.values[self.offsets[row]:self.offsets[row + 1]].reshape(tuple(self.shapes[row]))
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def __repr__(self) -> str:
+        return f"RaggedArray(nrows={len(self)}, shapes={len(self.unique_shapes())}, dtype={self.values.dtype})"
+
+    def unique_shapes(self) -> list:
+        return [tuple(shape) for shape in np.unique(self.shapes, axis=0)] if len(self) > 0 else []
+
+    def take(self, rows: np.ndarray) -> "RaggedArray":
+        """
+        :return: RaggedArray
+            Cells of the given rows, in the given order. Rows may repeat.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        counts = self.offsets[rows + 1] - self.offsets[rows]
+
+        return ragged_array(
+            self.values[tools.ranges_to_rows(self.offsets[rows], self.offsets[rows + 1])],
+            np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            self.shapes[rows]
+        )
+
+    def groups(self) -> dict:
+        """
+        :return: dict
+            (rows, values) per cell shape, the values of the rows stacked into an array of shape (len(rows),) + shape.
+        """
+        if len(self) == 0:
+            return {}
+
+        shapes, inverse = np.unique(self.shapes, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        groups = {}
+
+        for number, shape in enumerate(shapes):
+            rows = np.flatnonzero(inverse == number)
+            starts, stops = tools.rows_to_ranges(rows)
+
+            # Rows of the same shape usually come in long runs whose values are contiguous.
+            if starts.size * RUN_ROWS <= rows.size:
+                values = np.concatenate([
+                    self.values[self.offsets[start]:self.offsets[stop]] for start, stop in zip(starts, stops)
+                ])
+
+            else:
+                values = self.values[tools.ranges_to_rows(self.offsets[rows], self.offsets[rows + 1])]
+
+            shape = tuple(int(axis) for axis in shape)
+            groups[shape] = (rows, values.reshape((rows.size,) + shape))
+
+        return groups
+
+    def to_array(self) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Cells stacked into a single array, only possible when all cells have the same shape.
+        """
+        shapes = self.unique_shapes()
+
+        if len(shapes) > 1:
+            raise ValueError(f"Cells have {len(shapes)} different shapes, read them as a RaggedArray instead")
+
+        return self.values.reshape((len(self),) + (shapes[0] if shapes else (0,) * self.shapes.shape[1]))
+
+
+def read_array_file_header(data: np.ndarray, big_endian: bool) -> ArrayFileHeader:
+    endian = ">" if big_endian else "<"
+
+    header = ArrayFileHeader()
+    header.version = int(data[:types.FOUR_BYTES].view(f"{endian}u4")[0])
+    header.length = int(data[types.FOUR_BYTES:FILE_HEADER].view(f"{endian}i8")[0])
+    header.big_endian = big_endian
+
+    return header
+
+
+def cell_layout(nrows: int, rows: np.ndarray, ndims: np.ndarray, shapes: np.ndarray, ndim: int) -> tuple:
+    """
+    Shapes in numpy order and element offsets per row from the decoded cell headers of the given (defined) rows.
+
+    :return: tuple
+        Shapes (nrows, ndim) and element offsets (nrows + 1,).
+    """
+    if ndims.size > 0 and np.any(ndims != ndims[0]):
+        raise NotImplementedError("Cells with different numbers of dimensions are not supported")
+
+    if ndims.size > 0:
+        ndim = int(ndims[0])
+
+    numpy_shapes = np.zeros((nrows, ndim), dtype=np.int64)
+    numpy_shapes[rows] = shapes[:, :ndim][:, ::-1]
+
+    # Arrays without axes hold no values.
+    counts = np.prod(numpy_shapes, axis=1) if ndim > 0 else np.zeros(nrows, dtype=np.int64)
+
+    return numpy_shapes, np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+
+def read_cells(
+        data: np.ndarray,
+        header: ArrayFileHeader,
+        offsets: np.ndarray,
+        value_type: str,
+        ndim: int
+) -> RaggedArray:
+    """
+    Decode the cells at the given offsets of a StManArrayFile (table.f<N>i). The cells are visited in file order, so
+    a batch of rows is read sequentially whatever the row order, and written to their row positions.
+
+    :param data: np.ndarray
+        Bytes of the array file.
+    :param offsets: np.ndarray
+        File offset of the cell of each row, 0 for rows without a value.
+    :param value_type: str
+        Value type of the column.
+    :param ndim: int
+        Number of dimensions of the column, 0 or less when it isn't fixed.
+    :return: RaggedArray
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+
+    rows = np.flatnonzero(offsets > 0)
+    rows = rows[np.argsort(offsets[rows], kind="stable")]
+
+    # From version 1 on every cell starts with a reference count, cells may be shared between rows.
+    starts = offsets[rows] + (types.FOUR_BYTES if header.version >= 1 else 0)
+
+    ndims, shapes, data_starts = decode.cell_headers(
+        data, starts, ndim if ndim > 0 else MAX_NDIM, header.big_endian
+    )
+
+    shapes, element_offsets = cell_layout(offsets.size, rows, ndims, shapes, max(ndim, 0))
+    counts = element_offsets[rows + 1] - element_offsets[rows]
+    total = int(element_offsets[-1])
+
+    if value_type == "bool":
+        values = np.empty(total, dtype=bool)
+        decode.unpack_ranges(data, data_starts * 8, counts, element_offsets[rows], values.view(np.uint8))
+
+    elif value_type in types.DATA_TYPE:
+        dtype = np.dtype((">" if header.big_endian else "<") + types.DATA_TYPE[value_type])
+
+        raw = np.empty(total * dtype.itemsize, dtype=np.uint8)
+        decode.copy(data, data_starts, counts * dtype.itemsize, element_offsets[rows] * dtype.itemsize, raw)
+
+        values = raw.view(dtype).astype(dtype.newbyteorder("="), copy=False)
+
+    else:
+        raise NotImplementedError(f"Can't read indirect arrays of type {value_type}")
+
+    return ragged_array(values, element_offsets, shapes)
+
+
+def ragged_array(values: np.ndarray, offsets: np.ndarray, shapes: np.ndarray) -> RaggedArray:
+    ragged = RaggedArray()
+    ragged.values = values
+    ragged.offsets = offsets
+    ragged.shapes = shapes
+
+    return ragged
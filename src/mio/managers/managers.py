@@ -1,81 +1,1056 @@
+import re
+import pathlib
+
 import numpy as np
 
 from mio.utilities import types
+from mio.utilities import tools
 
-from mio.core.binary import BinaryFileReader
+from mio.managers import buckets
+from mio.managers import incremental
+from mio.managers import tiles
+from mio.managers import indirect
+from mio.core.binary import BinaryFileReader, MappedFileReader, map_file
 from mio.core.block import read_block, Block
+from mio.core import lru
+from mio.core import decode
+from mio.core import packed
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Union
 
 from toolviper.utils import logger
 
+# Row ranges at least this long are read on their own by read_ranges(), shorter ones are gathered together.
+RANGE_ROWS: int = 256
 
-class StandardStorageManager:
-    __slots__ = ["name", "offset", "index_map", "file_handle"]
+
+class DataManager:
+    """
+    Common state of the storage managers. The table.dat section of a manager is parsed by its read() classmethod, the
+    column set then binds the manager to the table directory and the columns it stores so that data can be read from
+    the table.f<sequence_number> files on demand.
+    """
+    __slots__ = [
+        "name", "sequence_number", "path", "nrows", "columns", "shapes", "boundaries", "array_file", "signature"
+    ]
 
     def __init__(self):
         self.name = None
+        self.sequence_number = None
+        self.path = None
+        self.nrows = None
+        self.columns = OrderedDict()
+        self.shapes = {}
+        self.boundaries = {}
+        self.array_file = None
+        self.signature = None
+
+    def bind(self, path, sequence_number: int, nrows: int, columns: list):
+        """
+        :param path: str
+            Table directory holding the table.f<sequence_number> files.
+        :param sequence_number: int
+            Sequence number of the data manager.
+        :param nrows: int
+            Number of rows in the table.
+        :param columns: list
+            (ColumnDescription, PlainColumn) pairs of the columns stored by this manager, in table order.
+        """
+        self.path = pathlib.Path(path)
+        self.sequence_number = sequence_number
+        self.nrows = nrows
+
+        for description, plain_column in columns:
+            self.columns[description.name] = description
+            self.shapes[description.name] = cell_shape(description, plain_column)
+
+    def filename(self, suffix="") -> pathlib.Path:
+        return self.path.joinpath(f"table.f{self.sequence_number}{suffix}")
+
+    def file_signature(self) -> tuple:
+        """
+        Identity of the data files of the manager (table.f<N> and table.f<N>i, table.f<N>_TSM<M>, ...), a table
+        rewritten in place changes at least one of the values. It is taken once per opening of the files, close()
+        drops it.
+        """
+        if self.signature is None:
+            pattern = re.compile(rf"table\.f{self.sequence_number}(\D.*)?$")
+            signature = []
+
+            for path in sorted(self.path.iterdir()):
+                if pattern.match(path.name):
+                    status = path.stat()
+                    signature.append((path.name, status.st_mtime_ns, status.st_size, status.st_ino))
+
+            self.signature = tuple(signature)
+
+        return self.signature
+
+    def close(self):
+        self.signature = None
+
+    def refresh(self, nrows: int):
+        """
+        Rows were appended to the table. The state parsed from table.dat is kept, the files are mapped again and
+        their headers and indexes re-read on the next access.
+        """
+        lru.shared().discard(str(self.filename()))
+
+        self.close()
+        self.nrows = nrows
+
+    def check_files(self):
+        """
+        Check that the files of the manager hold all rows. The writer may update table.lock before the data files
+        are flushed, their headers and indexes can then be read but the data of the new rows lies past the end of the
+        mapped files.
+
+        :raises ValueError: when a file is shorter than its header says or its index doesn't cover all rows yet.
+        """
+        pass
+
+    def read_column(self, name: str, rows=None, cell=None) -> np.ndarray:
+        raise NotImplementedError(f"Reading column data is not supported by {type(self).__name__}")
+
+    def is_indirect(self, name: str) -> bool:
+        """
+        Indirect array columns only store an offset per row, the arrays live in the table.f<N>i file.
+        """
+        description = self.columns[name]
+
+        return description.ndims != 0 and not description.direct
+
+    def open_array_file(self, big_endian: bool) -> tuple:
+        """
+        :return: tuple
+            Bytes and header of the memory mapped table.f<N>i file holding the indirect arrays.
+        """
+        if self.array_file is None:
+            data = np.frombuffer(map_file(str(self.filename("i"))), dtype=np.uint8)
+            self.array_file = (data, indirect.read_array_file_header(data, big_endian))
+
+        return self.array_file
+
+    def cell_offsets(self, name: str, rows: np.ndarray) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Offset of the array of each row in the table.f<N>i file, 0 for rows without an array.
+        """
+        raise NotImplementedError(f"Indirect arrays are not supported by {type(self).__name__}")
+
+    def read_indirect(self, name: str, rows=None) -> indirect.RaggedArray:
+        """
+        Read the cells of an indirect (variable shape) array column. The cell offsets of all rows are gathered first
+        and the cells decoded in file order.
+
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :return: RaggedArray
+            Values and offsets of the cells, use groups() to split them by shape or to_array() when all cells have the
+            same shape.
+        """
+        if not self.is_indirect(name):
+            raise ValueError(f"Column {name} is not an indirect array column")
+
+        return self.read_cells(name, self.cell_offsets(name, tools.row_array(rows, self.nrows)))
+
+    def read_cells(self, name: str, offsets: np.ndarray) -> indirect.RaggedArray:
+        """
+        :param offsets: np.ndarray
+            Offsets of the cells in the table.f<N>i file, see cell_offsets().
+        :return: RaggedArray
+        """
+        # Managers storing indirect arrays write the array file with the endianess of their own file.
+        data, header = self.open_array_file(self.header.big_endian)
+
+        return indirect.read_cells(data, header, offsets, self.columns[name].value_type, self.columns[name].ndims)
+
+    def read_packed(self, name: str, rows=None, cell=None) -> packed.PackedBool:
+        """
+        Read a boolean column bit packed. Managers that don't store the bits as they are read and pack blocks of
+        rows, the column never exists unpacked in full.
+
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: PackedBool
+        """
+        if self.columns[name].value_type != "bool":
+            raise ValueError(f"Column {name} is not a boolean column")
+
+        rows = tools.row_array(rows, self.nrows)
+
+        cell_size = int(np.prod(self.shapes[name] or tuple(), dtype=np.int64))
+        block_rows = max(8, packed.UNPACK_ELEMENTS // max(cell_size, 1) // 8 * 8)
+
+        bits, shape = [], None
+
+        # Blocks hold a multiple of 8 rows so that their packed bits can be joined.
+        for start in range(0, max(rows.size, 1), block_rows):
+            block = packed.pack(self.read_column(name, rows=rows[start:start + block_rows], cell=cell))
+
+            bits.append(block.bits)
+            shape = (rows.size,) + block.shape[1:]
+
+        return packed.packed_bool(np.concatenate(bits), shape)
+
+    def row_boundaries(self, name: str) -> np.ndarray:
+        """
+        First rows of the storage units (buckets, tiles) of a column followed by the number of rows. Chunks that
+        start and end on these rows never decode a storage unit twice.
+        """
+        return np.array([0, self.nrows], dtype=np.int64)
+
+    def apply_cell(self, name: str, values: np.ndarray, cell) -> np.ndarray:
+        """
+        Apply a numpy style cell index to values read with the full cells.
+        """
+        return values[(slice(None),) + (cell if isinstance(cell, tuple) else (cell,))]
+
+    def row_bytes(self, name: str) -> int:
+        shape = self.shapes[name] or tuple()
+
+        # Decoded strings are sized by their longest value, assume a typical length.
+        itemsize = max(tools.column_dtype(self.columns[name].value_type).itemsize, types.EIGHT_BYTES)
+
+        return int(np.prod(shape, dtype=np.int64)) * itemsize
+
+    def read_cached(self, name: str, rows: np.ndarray, cell=None) -> Union[np.ndarray, None]:
+        """
+        Read through the process wide bucket and tile cache (see mio.core.lru). The storage units (buckets or rows of
+        tiles, see row_boundaries()) holding the rows are decoded whole with their full cells and cached. Entries are
+        keyed by the file signature, a table rewritten in place never hits the entries of its previous content.
+
+        :return: np.ndarray
+            Column values, None when the cache is disabled, the read is too large or spread over too many units to
+            be cached or slices the cells (decoding full cells would undo the tile aligned slicing), the caller then
+            decodes the rows directly.
+        """
+        cache = lru.shared()
+
+        if not cache.enabled or rows.size == 0 or cell is not None:
+            return None
+
+        limit = cache.budget // lru.READ_FRACTION
+        row_bytes = max(self.row_bytes(name), 1)
+
+        if rows.size * row_bytes > limit:
+            return None
+
+        if name not in self.boundaries:
+            self.boundaries[name] = self.row_boundaries(name)
+
+        boundaries = self.boundaries[name]
+
+        # Fewer rows than lru.MAX_UNITS can't touch that many units.
+        lowest, highest = np.searchsorted(boundaries, [rows.min(), rows.max()], side="right")
+
+        if rows.size >= lru.MAX_UNITS and highest - lowest >= lru.MAX_UNITS:
+            return None
+
+        units = np.searchsorted(boundaries, rows, side="right") - 1
+
+        if units.min() == units.max():
+            # Most interactive reads stay within a single bucket or row of tiles.
+            groups = [slice(None)]
+            unique = units[:1]
+
+        else:
+            order = np.argsort(units, kind="stable")
+            change = np.flatnonzero(np.diff(units[order])) + 1
+
+            groups = np.split(order, change)
+            unique = units[order[np.concatenate(([0], change))]]
+
+        if int(np.sum(boundaries[unique + 1] - boundaries[unique])) * row_bytes > limit:
+            return None
+
+        parts = []
+
+        for unit, group in zip(unique, groups):
+            first, stop = int(boundaries[unit]), int(boundaries[unit + 1])
+
+            block = cache.get_or_load(
+                (str(self.filename()), self.file_signature(), name, first, stop),
+                lambda: self.read_column(name, rows=slice(first, stop), cached=False)
+            )
+
+            parts.append((group, block[rows[group] - first]))
+
+        # Decoded strings of different units may have different lengths.
+        dtype = np.result_type(*[part.dtype for _, part in parts])
+        values = np.empty((rows.size,) + parts[0][1].shape[1:], dtype=dtype)
+
+        for group, part in parts:
+            values[group] = part
+
+        return values if cell is None else self.apply_cell(name, values, cell)
+
+    def read_runs(self, name: str, rows=None, cell=None):
+        """
+        Run-length encoded column values. Managers that don't store runs read the values and compress them.
+
+        :return: RunLength
+        """
+        values = self.read_column(name, rows=rows, cell=cell)
+        starts, values = incremental.merge_runs(np.arange(values.shape[0], dtype=np.int64), values)
+
+        return RunLength(values=values, starts=starts, nrows=len(tools.row_array(rows, self.nrows)))
+
+    def read_ranges(self, name: str, starts: np.ndarray, stops: np.ndarray, cell=None) -> np.ndarray:
+        """
+        Read sorted row ranges. Long ranges are read one by one so the managers can use their contiguous (bucket or
+        tile row) paths, short ones are gathered together in a single read.
+
+        :param name: str
+            Column name.
+        :param starts: np.ndarray
+            First row of each range.
+        :param stops: np.ndarray
+            End (exclusive) of each range.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: np.ndarray
+            Column values of the rows of all ranges, in order.
+        """
+        lengths = stops - starts
+        long = lengths >= RANGE_ROWS
+
+        if not np.any(long):
+            return self.read_column(name, rows=tools.ranges_to_rows(starts, stops), cell=cell)
+
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        pieces = []
+
+        for index in np.flatnonzero(long):
+            pieces.append((
+                slice(offsets[index], offsets[index + 1]),
+                self.read_column(name, rows=slice(starts[index], stops[index]), cell=cell)
+            ))
+
+        if not np.all(long):
+            pieces.append((
+                np.flatnonzero(np.repeat(~long, lengths)),
+                self.read_column(name, rows=tools.ranges_to_rows(starts[~long], stops[~long]), cell=cell)
+            ))
+
+        values = np.empty((int(offsets[-1]),) + pieces[0][1].shape[1:], dtype=pieces[0][1].dtype)
+
+        for position, piece in pieces:
+            values[position] = piece
+
+        return values
+
+
+@dataclass
+class RunLength:
+    """
+    Column values as runs of equal values, run i holds values[i] for the selected rows starts[i] up to the start of
+    the next run (or nrows). Row numbers are positions in the selection, not table rows.
+    """
+    values: np.ndarray
+    starts: np.ndarray
+    nrows: int
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(np.append(self.starts, self.nrows))
+
+    def expand(self) -> np.ndarray:
+        return np.repeat(self.values, self.lengths(), axis=0)
+
+
+def cell_shape(description, plain_column):
+    """
+    Cell shape of an array column in numpy (C) order, casacore stores shapes in Fortran order. Returns None for
+    scalar columns and for columns without a fixed shape.
+    """
+    if description.ndims == 0:
+        return None
+
+    if description.shape is not None and len(description.shape) > 0:
+        return tuple(int(value) for value in description.shape[::-1])
+
+    if plain_column is not None and len(plain_column.data.shape) > 0:
+        return tuple(int(value) for value in plain_column.data.shape[::-1])
+
+    return None
+
+
+class StandardStorageManager(DataManager):
+    __slots__ = ["offset", "index_map", "file_handle", "header", "indexes"]
+
+    def __init__(self):
+        super().__init__()
         self.offset = None
         self.index_map = None
         self.file_handle = None
+        self.header = None
+        self.indexes = None
 
     @classmethod
     def read(cls, file_handle: BinaryFileReader):
+        manager = cls()
+
         file_handle.header()
-        cls.name = file_handle.string(size=types.FOUR_BYTES)
+        manager.name = file_handle.string(size=types.FOUR_BYTES)
 
-        cls.offset = read_block(
+        # Byte offset of each column inside a bucket
+        manager.offset = read_block(
             file_handle,
             file_handle.integer
         )
 
-        cls.index_map = read_block(
+        # Row index used by each column
+        manager.index_map = read_block(
             file_handle,
             file_handle.integer
         )
 
-        cls.file_handle = file_handle
+        return manager
+
+    def open(self):
+        """
+        Map the bucket file and parse its header and row indexes. This is deferred until data is requested so that
+        listing columns only costs the table.dat parse.
+        """
+        if self.file_handle is not None:
+            return
+
+        file_handle = MappedFileReader(str(self.filename()), mode="rb")
+
+        try:
+            header = buckets.read_standard_header(file_handle)
+
+            # The buckets are gathered through a strided view of the map, it must not reach past the file.
+            if buckets.bucket_start(header, header.nbuckets) > len(file_handle.view):
+                raise ValueError(
+                    f"{self.filename()} is shorter than its {header.nbuckets} buckets, the table may be incomplete"
+                )
+
+            indexes = buckets.read_standard_indexes(file_handle, header)
+
+        except BaseException:
+            file_handle.close()
+            raise
+
+        self.file_handle, self.header, self.indexes = file_handle, header, indexes
+
+    def close(self):
+        self.boundaries.clear()
+        self.array_file = None
+        self.signature = None
+
+        if self.file_handle is not None:
+            self.file_handle.close()
+            self.file_handle = None
+
+    def check_files(self):
+        # open() checks the buckets against the size of the file.
+        self.open()
+
+        for index in self.indexes:
+            if self.nrows > 0 and (index.nused == 0 or int(index.last_row[index.nused - 1]) + 1 < self.nrows):
+                raise ValueError(f"The bucket index of {self.filename()} doesn't cover all {self.nrows} rows yet")
+
+    def gather(self, name: str, rows: np.ndarray, nbytes: int) -> np.ndarray:
+        """
+        :return: np.ndarray
+            Raw (nrows, nbytes) bytes stored for the rows of a column in the buckets.
+        """
+        self.open()
+
+        column = list(self.columns).index(name)
+
+        return buckets.gather_fixed(
+            buckets.file_bytes(self.file_handle),
+            self.header,
+            self.indexes[self.index_map.elements[column]],
+            self.offset.elements[column],
+            nbytes,
+            rows
+        )
+
+    def cell_offsets(self, name: str, rows: np.ndarray) -> np.ndarray:
+        offsets = np.ascontiguousarray(self.gather(name, rows, types.EIGHT_BYTES))
+
+        return offsets.view(">i8" if self.header.big_endian else "<i8").ravel()
+
+    def read_indirect(self, name: str, rows=None) -> indirect.RaggedArray:
+        description = self.columns[name]
+
+        if description.value_type != "string" or not self.is_indirect(name):
+            return super().read_indirect(name, rows=rows)
+
+        # String arrays are kept in the string buckets instead of the array file.
+        rows = tools.row_array(rows, self.nrows)
+        entries = self.gather(name, rows, buckets.STRING_ENTRY)
+
+        return buckets.decode_string_arrays(
+            buckets.file_bytes(self.file_handle),
+            self.header,
+            entries,
+            ">" if self.header.big_endian else "<",
+            description.ndims
+        )
+
+    def read_packed(self, name: str, rows=None, cell=None) -> packed.PackedBool:
+        description = self.columns[name]
+
+        if cell is not None or description.value_type != "bool" or self.is_indirect(name):
+            return super().read_packed(name, rows=rows, cell=cell)
+
+        # Direct boolean cells are bit packed in the buckets already, their bits are copied as they are.
+        self.open()
+
+        column = list(self.columns).index(name)
+        rows = tools.row_array(rows, self.nrows)
+        shape = self.shapes[name] or tuple()
+
+        bits = buckets.gather_packed_bits(
+            buckets.file_bytes(self.file_handle),
+            self.header,
+            self.indexes[self.index_map.elements[column]],
+            self.offset.elements[column],
+            int(np.prod(shape, dtype=np.int64)),
+            rows
+        )
+
+        return packed.packed_bool(bits, (rows.size,) + shape)
+
+    def row_boundaries(self, name: str) -> np.ndarray:
+        self.open()
+
+        index = self.indexes[self.index_map.elements[list(self.columns).index(name)]]
+
+        return np.append(index.first_row, self.nrows).astype(np.int64)
+
+    def read_column(self, name: str, rows=None, cell=None, cached: bool = True) -> np.ndarray:
+        """
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :param cached: bool
+            Read small selections through the process wide bucket cache.
+        :return: np.ndarray
+            Column values with the row axis first and the cell axes in numpy (C) order.
+        """
+        self.open()
+
+        description = self.columns[name]
+        column = list(self.columns).index(name)
+
+        rows = tools.row_array(rows, self.nrows)
+
+        # Only direct array columns are stored in the buckets, others hold an offset into the table.f<N>i file.
+        if self.is_indirect(name):
+            if rows.size == 0:
+                return np.empty((0,) + (self.shapes[name] or tuple()), dtype=tools.column_dtype(description.value_type))
+
+            values = self.read_indirect(name, rows=rows).to_array()
 
-        return cls
+            return values if cell is None else self.apply_cell(name, values, cell)
 
+        if cached:
+            values = self.read_cached(name, rows, cell)
 
-class IncrementalStorageManager:
-    __slots__ = ["name"]
+            if values is not None:
+                return values
+
+        index = self.indexes[self.index_map.elements[column]]
+        offset = self.offset.elements[column]
+
+        endian = ">" if self.header.big_endian else "<"
+        data = buckets.file_bytes(self.file_handle)
+
+        shape = self.shapes[name] or tuple()
+        nelements = int(np.prod(shape, dtype=np.int64))
+
+        if description.value_type == "bool":
+            values = buckets.gather_bits(data, self.header, index, offset, nelements, rows)
+
+        elif description.value_type == "string":
+            if description.ndims != 0:
+                raise NotImplementedError(f"String array column {name} is not supported")
+
+            if description.max_length > 0:
+                values = buckets.gather_fixed(data, self.header, index, offset, description.max_length, rows)
+                values = np.ascontiguousarray(values).view(f"S{description.max_length}").ravel()
+                values = decode.to_str(values)
+
+            else:
+                values = buckets.decode_strings(
+                    data,
+                    self.header,
+                    buckets.gather_fixed(data, self.header, index, offset, buckets.STRING_ENTRY, rows),
+                    endian
+                )
+
+        elif description.value_type in types.DATA_TYPE:
+            dtype = np.dtype(endian + types.DATA_TYPE[description.value_type])
+            values = buckets.gather_fixed(data, self.header, index, offset, nelements * dtype.itemsize, rows)
+            values = np.ascontiguousarray(values).view(dtype).astype(dtype.newbyteorder("="), copy=False)
+
+        else:
+            raise NotImplementedError(f"Can't read column {name} of type {description.value_type}")
+
+        values = values.reshape((rows.size,) + shape)
+
+        if cell is not None:
+            values = self.apply_cell(name, values, cell)
+
+        return values
+
+
+class IncrementalStorageManager(DataManager):
+    """
+    Reader of the IncrementalStMan. A value is only stored when it differs from the one of the previous row, so each
+    column is decoded once into runs (first row and value of every run) and rows are resolved by a binary search on
+    the run starts.
+    """
+    __slots__ = ["file_handle", "header", "index", "runs", "appended"]
 
     def __init__(self):
-        self.name = None
+        super().__init__()
+        self.file_handle = None
+        self.header = None
+        self.index = None
+        self.runs = {}
+        self.appended = {}
 
     @classmethod
     def read(cls, file_handle):
+        manager = cls()
+
         file_handle.header()
-        cls.name = file_handle.string(size=types.FOUR_BYTES)
+        manager.name = file_handle.string(size=types.FOUR_BYTES)
 
-        return cls
+        return manager
 
+    def open(self):
+        if self.file_handle is not None:
+            return
 
-class TiledCellStorageManager:
-    pass
+        self.file_handle = MappedFileReader(str(self.filename()), mode="rb")
+        self.header = incremental.read_incremental_header(self.file_handle)
+        self.index = incremental.read_incremental_index(self.file_handle, self.header)
 
+    def close(self):
+        self.runs.clear()
+        self.appended.clear()
+        self.array_file = None
+        self.signature = None
 
-class TiledShapeStorageManager:
-    __slots__ = ["name"]
+        if self.file_handle is not None:
+            self.file_handle.close()
+            self.file_handle = None
 
-    def __init__(self):
-        self.name = None
+    def refresh(self, nrows: int):
+        """
+        Rows were appended to the table. Rows are only ever added to the last bucket or to new buckets, the runs
+        decoded before the last bucket are kept and only the buckets from there on are decoded on the next access.
+        """
+        first_row = int(self.index.rows[self.index.nused - 1]) if self.index is not None and self.index.nused > 0 else 0
+
+        # Columns not read since the previous refresh keep the runs kept then.
+        appended = dict(self.appended)
+
+        for name, (starts, values) in self.runs.items():
+            keep = int(np.searchsorted(starts, first_row, side="left"))
+            appended[name] = (starts[:keep], values[:keep], first_row)
+
+        super().refresh(nrows)
+
+        self.appended = appended
+
+    def check_files(self):
+        self.open()
+
+        if int(self.index.rows[self.index.nused]) < self.nrows:
+            raise ValueError(f"The bucket index of {self.filename()} doesn't cover all {self.nrows} rows yet")
+
+    def column_runs(self, name: str) -> tuple:
+        """
+        :return: tuple
+            First table row of each run and the run values of the full column.
+        """
+        if name in self.runs:
+            return self.runs[name]
+
+        self.open()
+
+        description = self.columns[name]
+        column = list(self.columns).index(name)
+
+        # Indirect array columns store the offset of their arrays in the table.f<N>i file.
+        if self.is_indirect(name):
+            value_type, shape = "int64", tuple()
+
+        else:
+            value_type, shape = description.value_type, self.shapes[name] or tuple()
+
+        data = buckets.file_bytes(self.file_handle)
+
+        # Runs kept by refresh(), only the buckets from the first row they don't cover on are decoded.
+        starts, values, from_row = self.appended.pop(name, (None, None, 0))
+
+        starts = [] if starts is None else [starts]
+        values = [] if values is None else [values]
+
+        for first_row, bucket in zip(self.index.rows, self.index.bucket_number):
+            if first_row < from_row:
+                continue
+
+            rows, offsets = incremental.read_bucket_index(data, self.header, int(bucket), len(self.columns))[column]
+
+            starts.append(first_row + rows)
+            values.append(
+                incremental.decode_values(data, self.header, int(bucket), offsets, value_type, shape)
+            )
+
+        self.runs[name] = incremental.merge_runs(np.concatenate(starts), np.concatenate(values))
+
+        return self.runs[name]
+
+    def row_boundaries(self, name: str) -> np.ndarray:
+        self.open()
+
+        return np.append(self.index.rows[:-1], self.nrows).astype(np.int64)
+
+    def read_runs(self, name: str, rows=None, cell=None) -> RunLength:
+        """
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: RunLength
+            Values and run boundaries of the selected rows without expanding them to one value per row.
+        """
+        runs = self.select_runs(name, rows=rows)
+
+        # Each distinct array of an indirect column is decoded once, whatever the number of rows sharing it.
+        if self.is_indirect(name):
+            runs.values = self.read_cells(name, runs.values).to_array()
+
+        if cell is not None:
+            runs.values = runs.values[(slice(None),) + (cell if isinstance(cell, tuple) else (cell,))]
+
+        return runs
+
+    def cell_offsets(self, name: str, rows: np.ndarray) -> np.ndarray:
+        return self.select_runs(name, rows=rows).expand()
+
+    def read_indirect(self, name: str, rows=None) -> indirect.RaggedArray:
+        if not self.is_indirect(name):
+            raise ValueError(f"Column {name} is not an indirect array column")
+
+        runs = self.select_runs(name, rows=rows)
+
+        return self.read_cells(name, runs.values).take(np.repeat(np.arange(runs.values.size), runs.lengths()))
+
+    def select_runs(self, name: str, rows=None) -> RunLength:
+        """
+        Runs of the stored values of the selected rows, array offsets for indirect columns.
+        """
+        starts, values = self.column_runs(name)
+        rows = tools.row_array(rows, self.nrows)
+
+        if buckets.is_contiguous(rows):
+            first, last = np.searchsorted(starts, [rows[0], rows[-1]], side="right") - 1
+
+            runs = RunLength(
+                values=values[first:last + 1],
+                starts=np.maximum(starts[first:last + 1], rows[0]) - rows[0],
+                nrows=rows.size
+            )
+
+        else:
+            run = np.searchsorted(starts, rows, side="right") - 1
+            change = np.concatenate(([True], run[1:] != run[:-1])) if rows.size > 0 else np.zeros(0, dtype=bool)
+
+            runs = RunLength(values=values[run[change]], starts=np.flatnonzero(change), nrows=rows.size)
+
+        return runs
+
+    def read_column(self, name: str, rows=None, cell=None) -> np.ndarray:
+        """
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: np.ndarray
+            Column values with the row axis first and the cell axes in numpy (C) order.
+        """
+        return self.read_runs(name, rows=rows, cell=cell).expand()
+
+
+class TiledCellStorageManager(DataManager):
+    """
+    TiledCellStMan, a hypercube per row. Its columns are listed with their descriptions, reading their data isn't
+    supported.
+    """
+    __slots__ = []
 
     @classmethod
     def read(cls, file_handle):
-        return cls
+        # The column set skips over the table.dat section, the hypercubes are described by the table.f<N> file.
+        return cls()
 
 
-class TiledColumnStorageManager:
-    __slots__ = ["name"]
+class TiledStorageManager(DataManager):
+    """
+    Shared reader of the tiled storage managers. The table.f<N> header file describes the hypercubes, their tile
+    shapes and where they live in the table.f<N>_TSM<M> files. Reads gather only the tiles intersecting the
+    requested rows and cell slice from the memory mapped hypercube files.
+    """
+    __slots__ = ["header", "file_handle", "buffers"]
 
     def __init__(self):
-        self.name = "TiledColumnStMan"
+        super().__init__()
+        self.header = None
+        self.file_handle = None
+        self.buffers = {}
 
     @classmethod
     def read(cls, file_handle):
-        return cls
+        return cls()
+
+    def open(self):
+        if self.header is not None:
+            return
+
+        self.file_handle = MappedFileReader(str(self.filename()), mode="rb")
+        self.header = tiles.read_tiled_header(self.file_handle)
 
+    def close(self):
+        self.buffers.clear()
+        self.boundaries.clear()
+        self.signature = None
 
-class AipsIOStorageManager:
-    pass
+        if self.file_handle is not None:
+            self.file_handle.close()
+            self.file_handle = None
+            self.header = None
+
+    def check_files(self):
+        self.open()
+
+        for number, tiled_file in self.header.files.items():
+            path = self.filename(f"_TSM{number}")
+
+            if tiled_file.length > 0 and (not path.exists() or path.stat().st_size < tiled_file.length):
+                raise ValueError(f"{path} is shorter than the {tiled_file.length} bytes of its header")
+
+    def apply_cell(self, name: str, values: np.ndarray, cell) -> np.ndarray:
+        # Cell indices select the outer product of the per axis indices, like the direct tile reads.
+        indices, squeeze = cell_indices(values.shape[1:], cell)
+        values = values[np.ix_(np.arange(values.shape[0]), *indices)]
+
+        return values[(slice(None),) + tuple(0 if axis else slice(None) for axis in squeeze)]
+
+    def buffer(self, file_sequence: int):
+        if file_sequence not in self.buffers:
+            # Tile reads are strided over the file, readahead would fault in the tiles around the requested ones.
+            self.buffers[file_sequence] = map_file(str(self.filename(f"_TSM{file_sequence}")), random_access=True)
+
+        return self.buffers[file_sequence]
+
+    def locate(self, rows: np.ndarray) -> tuple:
+        """
+        :return: tuple
+            Hypercube number and position along the row axis of the hypercube for each row.
+        """
+        raise NotImplementedError
+
+    def segments(self) -> list:
+        """
+        :return: list
+            (first row, last row, hypercube, position of the first row) of each range of rows stored contiguously in
+            a hypercube.
+        """
+        raise NotImplementedError
+
+    def row_boundaries(self, name: str) -> np.ndarray:
+        self.open()
+
+        boundaries = [np.array([self.nrows], dtype=np.int64)]
+
+        for first, last, number, position in self.segments():
+            tile_rows = self.header.cubes[number].tile_shape[-1] if self.header.cubes[number].ndims > 0 else 1
+
+            # Rows at which a new row of tiles starts inside the hypercube.
+            boundaries.append(np.array([first], dtype=np.int64))
+            boundaries.append(np.arange(first + (-position) % tile_rows, last + 1, tile_rows, dtype=np.int64))
+
+        return np.unique(np.concatenate(boundaries))
+
+    def read_column(self, name: str, rows=None, cell=None, cached: bool = True) -> np.ndarray:
+        """
+        :param name: str
+            Column name.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index (int, slice or index array per axis) applied to the cell axes, e.g.
+            (slice(0, 64), 0) for the first 64 channels of the first correlation.
+        :param cached: bool
+            Read small selections through the process wide tile cache.
+        :return: np.ndarray
+            Column values with the row axis first and the cell axes in numpy (C) order.
+        """
+        self.open()
+
+        rows = tools.row_array(rows, self.nrows)
+
+        if cached:
+            values = self.read_cached(name, rows, cell)
+
+            if values is not None:
+                return values
+
+        column = list(self.columns).index(name)
+
+        data_type = self.header.data_types[column]
+        endian = ">" if self.header.big_endian else "<"
+
+        numbers, positions = self.locate(rows)
+
+        values = None
+
+        for number in np.unique(numbers):
+            cube = self.header.cubes[number]
+
+            if cube.ndims == 0:
+                raise ValueError(f"Column {name} has undefined cells in the requested rows")
+
+            offsets, bucket_size = tiles.column_layout(self.header.data_types, cube.tile_shape)
+            indices, squeeze = cell_indices(cube.shape[-2::-1], cell)
+
+            mask = numbers == number
+
+            chunk = tiles.gather(
+                self.buffer(cube.file_sequence),
+                cube,
+                data_type,
+                endian,
+                offsets[column],
+                bucket_size,
+                [positions[mask]] + indices
+            )
+
+            if values is None:
+                values = np.empty((rows.size,) + chunk.shape[1:], dtype=chunk.dtype)
+
+            elif values.shape[1:] != chunk.shape[1:]:
+                raise ValueError(f"Requested rows of column {name} have different cell shapes, read them separately")
+
+            values[mask] = chunk
+
+        if values is None:
+            shape = self.header.cubes[-1].shape[-2::-1] if self.header.cubes else tuple()
+            indices, squeeze = cell_indices(shape, cell)
+            values = np.empty((0,) + tuple(index.size for index in indices), dtype=types.DATA_TYPE[data_type])
+
+        return values[(slice(None),) + tuple(0 if axis else slice(None) for axis in squeeze)]
+
+
+def cell_indices(shape: tuple, cell) -> tuple:
+    """
+    :param shape: tuple
+        Cell shape in numpy order.
+    :param cell: tuple
+        Numpy style index of the cell axes, missing trailing axes select everything.
+    :return: tuple
+        Index array per cell axis and whether the axis was selected by an integer (and should be dropped).
+    """
+    if cell is None:
+        cell = tuple()
+
+    elif not isinstance(cell, tuple):
+        cell = (cell,)
+
+    if len(cell) > len(shape):
+        raise IndexError(f"Too many indices for cell shape {shape}")
+
+    indices = []
+    squeeze = []
+
+    for axis, length in enumerate(shape):
+        index = cell[axis] if axis < len(cell) else slice(None)
+
+        if isinstance(index, slice):
+            indices.append(np.arange(*index.indices(length), dtype=np.int64))
+            squeeze.append(False)
+
+        else:
+            indices.append(tools.row_array(index, length))
+            squeeze.append(np.ndim(index) == 0)
+
+    return indices, squeeze
+
+
+class TiledShapeStorageManager(TiledStorageManager):
+    __slots__ = []
+
+    def locate(self, rows: np.ndarray) -> tuple:
+        # Row ranges are mapped to a hypercube, the maps hold the last row and last position of each range.
+        slot = np.searchsorted(self.header.row_map, rows, side="left")
+
+        if np.any(slot >= self.header.row_map.size):
+            raise IndexError("Rows beyond the row map of the hypercubes")
+
+        return (
+            self.header.cube_map[slot],
+            self.header.position_map[slot] - (self.header.row_map[slot] - rows)
+        )
+
+    def segments(self) -> list:
+        first_rows = np.concatenate(([0], self.header.row_map[:-1] + 1))
+
+        return [
+            (int(first), int(last), int(number), int(position - (last - first)))
+            for first, last, number, position in zip(
+                first_rows, self.header.row_map, self.header.cube_map, self.header.position_map
+            )
+        ]
+
+
+class TiledColumnStorageManager(TiledStorageManager):
+    __slots__ = []
+
+    def __init__(self):
+        super().__init__()
+        self.name = "TiledColumnStMan"
+
+    def locate(self, rows: np.ndarray) -> tuple:
+        # A single hypercube holding all rows
+        return np.zeros(rows.size, dtype=np.int64), rows
+
+    def segments(self) -> list:
+        return [(0, self.nrows - 1, 0, 0)] if self.nrows > 0 else []
+
+
+class AipsIOStorageManager(DataManager):
+    """
+    StManAipsIO, the whole table is held in memory by casacore and written to table.f<N> as a single AipsIO object.
+    Its columns are listed with their descriptions, reading their data isn't supported.
+    """
+    __slots__ = []
+
+    @classmethod
+    def read(cls, file_handle):
+        # The column set skips over the table.dat section.
+        return cls()
@@ -0,0 +1,256 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.core.binary import BinaryFileReader
+from mio.core import decode
+from mio.core.block import read_array_block
+from mio.utilities import types
+
+
+@dataclass(init=False)
+class TiledFile:
+    version: int
+    sequence_number: int
+    length: int
+
+
+@dataclass(init=False)
+class Hypercube:
+    version: int
+    extensible: bool
+    ndims: int
+    shape: tuple
+    tile_shape: tuple
+    ntiles: tuple
+    file_sequence: int
+    offset: int
+
+
+@dataclass(init=False)
+class TiledHeader:
+    type: str
+    version: int
+    big_endian: bool
+    sequence_number: int
+    nrows: int
+    data_types: list
+    hypercolumn: str
+    cache_size: int
+    ndims: int
+    files: dict
+    cubes: list
+    default_tile_shape: tuple
+    row_map: np.ndarray
+    cube_map: np.ndarray
+    position_map: np.ndarray
+
+
+def read_shape(file_handle: BinaryFileReader) -> tuple:
+    # IPosition, version 1 stores 4 byte values and later versions 8 byte values.
+    _, version = file_handle.header()
+    ndims = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    if version == 1:
+        return tuple(int(file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)) for _ in range(ndims))
+
+    return tuple(int(file_handle.integer(size=types.EIGHT_BYTES, dtype=np.int64)) for _ in range(ndims))
+
+
+def read_tiled_file(file_handle: BinaryFileReader) -> TiledFile:
+    tiled_file = TiledFile()
+
+    tiled_file.version = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    tiled_file.sequence_number = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    if tiled_file.version == 1:
+        tiled_file.length = int(file_handle.integer(size=types.FOUR_BYTES, dtype=np.uint32))
+
+    else:
+        tiled_file.length = int(file_handle.integer(size=types.EIGHT_BYTES, dtype=np.int64))
+
+    return tiled_file
+
+
+def read_hypercube(file_handle: BinaryFileReader) -> Hypercube:
+    cube = Hypercube()
+
+    cube.version = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    # Record of coordinate/id values, not used for reading data so skip over it.
+    start = file_handle.tell()
+    file_handle.seek(start + file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32))
+
+    cube.extensible = file_handle.boolean()
+    cube.ndims = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    cube.shape = read_shape(file_handle)
+    cube.tile_shape = read_shape(file_handle)
+    cube.file_sequence = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    if cube.version == 1:
+        cube.offset = int(file_handle.integer(size=types.FOUR_BYTES, dtype=np.uint32))
+
+    else:
+        cube.offset = int(file_handle.integer(size=types.EIGHT_BYTES, dtype=np.int64))
+
+    cube.ntiles = tuple(
+        -(-length // tile) for length, tile in zip(cube.shape, cube.tile_shape)
+    )
+
+    return cube
+
+
+def read_tiled_header(file_handle: BinaryFileReader) -> TiledHeader:
+    """
+    Parse the table.f<N> header file of a tiled storage manager: the files, the hypercubes with their shapes, tile
+    shapes and offsets, and for TiledShapeStMan the map from rows to (hypercube, position).
+    """
+    header = TiledHeader()
+
+    header.default_tile_shape = tuple()
+    header.row_map = header.cube_map = header.position_map = None
+
+    # The magic code and endianess are checked when the file is opened.
+    file_handle.seek(types.FOUR_BYTES)
+    header.type, _ = file_handle.header()
+
+    if header.type in ("TiledColumnStMan", "TiledCellStMan"):
+        header.default_tile_shape = read_shape(file_handle)
+
+    _, header.version = file_handle.header()
+
+    # Files written before version 2 are always big endian.
+    header.big_endian = file_handle.boolean() if header.version >= 2 else True
+
+    header.sequence_number = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.nrows = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    ncolumns = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.data_types = [
+        types.TYPE_LIST[file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)] for _ in range(ncolumns)
+    ]
+
+    header.hypercolumn = file_handle.string(size=types.FOUR_BYTES)
+    header.cache_size = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.ndims = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+    header.files = {}
+
+    for index in range(file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)):
+        if file_handle.boolean():
+            header.files[index] = read_tiled_file(file_handle)
+
+    ncubes = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+    header.cubes = [read_hypercube(file_handle) for _ in range(ncubes)]
+
+    if header.type == "TiledShapeStMan":
+        header.default_tile_shape = read_shape(file_handle)
+
+        nused = file_handle.integer(size=types.FOUR_BYTES, dtype=np.int32)
+
+        header.row_map = read_array_block(file_handle).elements[:nused]
+        header.cube_map = read_array_block(file_handle).elements[:nused]
+        header.position_map = read_array_block(file_handle).elements[:nused]
+
+    return header
+
+
+def column_layout(data_types: list, tile_shape: tuple) -> tuple:
+    """
+    All data columns of a hypercube share its tiles, each tile holds the tile of every column one after the other.
+
+    :return: tuple
+        Byte offset of each column inside a tile and the total tile (bucket) size.
+    """
+    nelements = int(np.prod(tile_shape, dtype=np.int64))
+
+    offsets = []
+    bucket_size = 0
+
+    for data_type in data_types:
+        offsets.append(bucket_size)
+
+        if data_type == "bool":
+            bucket_size += -(-nelements // 8)
+
+        else:
+            bucket_size += nelements * np.dtype(types.DATA_TYPE[data_type]).itemsize
+
+    return offsets, bucket_size
+
+
+def split_indices(indices: list, tile_shape: tuple) -> tuple:
+    """
+    Split per axis indices (numpy order) into tile numbers and positions inside the tile, shaped so that they
+    broadcast into the outer product of the selection.
+    """
+    ndims = len(indices)
+
+    tile_numbers = []
+    positions = []
+
+    for axis, (index, tile) in enumerate(zip(indices, tile_shape[::-1])):
+        shape = [1] * ndims
+        shape[axis] = -1
+
+        tile_numbers.append((index // tile).reshape(shape))
+        positions.append((index % tile).reshape(shape))
+
+    return tile_numbers, positions
+
+
+def check_extent(buffer, cube: Hypercube, bucket_size: int, indices: list):
+    last_tile = 0
+    stride = 1
+
+    for index, tile, ntiles in zip(indices[::-1], cube.tile_shape, cube.ntiles):
+        last_tile += (int(index.max()) // tile) * stride if index.size > 0 else 0
+        stride *= ntiles
+
+    if cube.offset + (last_tile + 1) * bucket_size > len(buffer):
+        raise ValueError("Requested tiles lie beyond the end of the hypercube file, the table may be incomplete")
+
+
+def gather(buffer, cube: Hypercube, data_type: str, endian: str, column_offset: int, bucket_size: int,
+           indices: list) -> np.ndarray:
+    """
+    Gather the outer product of the per axis indices (numpy order, row axis first) out of a memory mapped hypercube.
+    Only the tiles intersecting the selection are touched.
+
+    :return: np.ndarray
+        Array of shape (len(indices[0]), len(indices[1]), ...).
+    """
+    check_extent(buffer, cube, bucket_size, indices)
+
+    tile_numbers, positions = split_indices(indices, cube.tile_shape)
+
+    # Strides of the tile grid and of the elements inside a tile, tiles and their content are in Fortran order.
+    grid_strides = np.cumprod((1,) + cube.ntiles[:-1], dtype=np.int64)
+    tile_strides = np.cumprod((1,) + cube.tile_shape[:-1], dtype=np.int64)
+
+    start = cube.offset + column_offset
+
+    if data_type == "bool":
+        tile = sum(number * stride for number, stride in zip(tile_numbers, grid_strides[::-1]))
+        bit = sum(position * stride for position, stride in zip(positions, tile_strides[::-1]))
+
+        bits = np.asarray((start + tile * bucket_size) * 8 + bit, dtype=np.int64)
+        values = np.empty(bits.shape, dtype=bool)
+
+        decode.take_bits(np.frombuffer(buffer, dtype=np.uint8), bits.reshape(-1), values.view(np.uint8).reshape(-1))
+
+        return values
+
+    dtype = np.dtype(endian + types.DATA_TYPE[data_type])
+
+    # Treat the hypercube as a 2N dimensional array, tile grid axes followed by the axes inside a tile, both in
+    # numpy order, so a single fancy index gathers the selection.
+    base = np.frombuffer(buffer, dtype=dtype, count=(len(buffer) - start) // dtype.itemsize, offset=start)
+    view = np.lib.stride_tricks.as_strided(
+        base,
+        shape=cube.ntiles[::-1] + cube.tile_shape[::-1],
+        strides=tuple(bucket_size * grid_strides[::-1]) + tuple(dtype.itemsize * tile_strides[::-1]),
+        writeable=False
+    )
+
+    return view[tuple(tile_numbers + positions)].astype(dtype.newbyteorder("="), copy=False)
@@ -0,0 +1,785 @@
+import os
+import time
+import pathlib
+import threading
+
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from mio.core.casams import CasaMeasurementSet
+from mio.core import arrow
+from mio.core import averaging
+from mio.core import chunks
+from mio.core import graph
+from mio.core import selection
+from mio.core import index
+from mio.core import shared
+from mio.utilities import tools
+
+from toolviper.utils import logger
+
+from typing import Union
+
+
+def open(path: Union[str, pathlib.Path], memory_map: bool = True, cache=None, stats=None):
+    """
+    Open a casacore table (e.g. a measurement set). Only table.dat is parsed, column data is read on access.
+
+    :param path: str
+        Table directory or the table.dat file inside it.
+    :param memory_map: bool
+        Memory map table.dat instead of reading it through a file handle.
+    :param cache: bool, str or pathlib.Path
+        Opt-in metadata cache, True for the default cache directory or the directory to use.
+    :param stats: IOStats
+        Opt-in instrumentation of the table.dat reads, shared with the subtables opened through the table.
+    :return: Table
+    """
+    return Table(path, memory_map=memory_map, cache=cache, stats=stats)
+
+
+class Table:
+    """
+    Table with lazy columns, e.g. table["DATA"][1000:2000, :, 0] decodes only the requested rows and cells.
+    Subtables referenced by the table keywords are opened on first access through table.subtables["ANTENNA"].
+    """
+    __slots__ = ["path", "measurement_set", "handles", "subtables", "index"]
+
+    def __init__(
+            self,
+            path: Union[str, pathlib.Path],
+            memory_map: bool = True,
+            cache=None,
+            measurement_set=None,
+            stats=None
+    ):
+        """
+        :param measurement_set: CasaMeasurementSet
+            Already parsed table.dat of the table, e.g. parsed in another process.
+        """
+        path = pathlib.Path(path)
+
+        if path.is_dir():
+            path = path.joinpath("table.dat")
+
+        self.path = path.resolve().parent
+
+        if measurement_set is None:
+            measurement_set = CasaMeasurementSet(str(path), memory_map=memory_map, cache=cache, stats=stats)
+            measurement_set.read()
+
+        self.measurement_set = measurement_set
+        self.handles = {}
+        self.index = None
+        self.subtables = Subtables(self, memory_map=memory_map, cache=cache, stats=stats)
+
+    @property
+    def nrows(self) -> int:
+        return int(self.measurement_set.nrows)
+
+    @property
+    def stats(self):
+        """
+        :return: IOStats
+            Instrumentation passed to open(), None when disabled.
+        """
+        return self.measurement_set.stats
+
+    @property
+    def columns(self) -> list:
+        return [description.name for description in self.measurement_set.description]
+
+    @property
+    def keywords(self) -> dict:
+        return self.measurement_set.table.keywords.records
+
+    def __getitem__(self, name: str):
+        if name not in self.handles:
+            for description in self.measurement_set.description:
+                if description.name == name:
+                    self.handles[name] = Column(self, description)
+                    break
+
+            else:
+                raise KeyError(f"Column {name} not found in {self.path}")
+
+        return self.handles[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"Table({str(self.path)!r}, nrows={self.nrows}, columns={self.columns})"
+
+    def close(self):
+        self.subtables.close()
+        self.measurement_set.close()
+
+    def prefetch_subtables(self, workers: int = None, processes: bool = False) -> dict:
+        """
+        Parse the table.dat of every subtable concurrently.
+
+        :param workers: int
+            Size of the pool, defaults to the executor default.
+        :param processes: bool
+            Parse in a process pool instead of a thread pool.
+        :return: dict
+            Subtables by name.
+        """
+        return self.subtables.prefetch(workers=workers, processes=processes)
+
+    def readable_columns(self) -> list:
+        """
+        :return: list
+            Names of the columns with a fixed cell shape that the storage managers can decode, other columns are
+            logged and left out.
+        """
+        columns = []
+
+        for name in self.columns:
+            column = self[name]
+
+            if column.cell_shape is None:
+                logger.warning(f"Skipping column {name} of {self.path.name}: no fixed cell shape")
+                continue
+
+            try:
+                column.read(rows=slice(0, 0))
+
+            except NotImplementedError as error:
+                logger.warning(f"Skipping column {name} of {self.path.name}: {error}")
+                continue
+
+            columns.append(name)
+
+        return columns
+
+    def build_index(self, location: Union[str, pathlib.Path] = None, rebuild: bool = False):
+        """
+        Load the secondary TIME, SCAN_NUMBER and baseline indexes of the table, building and storing them when they
+        are missing or older than the table. Once loaded, select() resolves predicates on these columns with a
+        binary search instead of reading them.
+
+        :param location: str or pathlib.Path
+            Directory of the index files, the metadata cache directory by default. Pass the table directory to keep
+            the indexes next to the table.
+        :param rebuild: bool
+            Build the indexes even if up to date ones are stored.
+        :return: TableIndex
+        """
+        self.index = index.open_index(self.measurement_set, location=location, rebuild=rebuild)
+
+        return self.index
+
+    def select(self, **predicates):
+        """
+        Select rows by predicates on scalar columns, e.g. table.select(FIELD_ID=3, ANTENNA1=[0, 1], TIME=(t0, t1)).
+        A value selects equal rows, a list (or set, array) any of its values, a (low, high) tuple an inclusive range
+        with None for an open side and a callable returns a mask for the values it is given. See build_index() for
+        queries that don't read the TIME, SCAN_NUMBER, ANTENNA1 and ANTENNA2 columns.
+
+        :return: Selection
+            Matching rows as sorted row ranges, columns read through it only decode those rows.
+        """
+        return Selection(self, *selection.evaluate(self.measurement_set, predicates, table_index=self.index))
+
+    def refresh(self) -> bool:
+        """
+        Pick up rows appended since the table was opened or last refreshed, see CasaMeasurementSet.refresh().
+
+        :return: bool
+            False when the table didn't change.
+        """
+        if not self.measurement_set.refresh():
+            return False
+
+        # Column handles may refer to data managers that were parsed again, secondary indexes only cover the rows
+        # that existed when they were built.
+        self.handles.clear()
+        self.index = None
+
+        return True
+
+    def follow(
+            self,
+            columns: list = None,
+            start: int = None,
+            interval: float = 1.0,
+            batch_rows: int = 65536,
+            timeout: float = None,
+            workers: int = None
+    ):
+        """
+        Follow a table that is still being written, e.g. a measurement set during an observation. The table is
+        refreshed every `interval` seconds (see refresh()) and the rows appended since are read and yielded in
+        batches, only the new rows are decoded.
+
+        :param columns: list
+            Column names, defaults to the readable columns.
+        :param start: int
+            First row to yield, defaults to the current number of rows so that only new rows are yielded.
+        :param interval: float
+            Seconds between refreshes.
+        :param batch_rows: int
+            Maximum number of rows per batch.
+        :param timeout: float
+            Stop once no rows were appended for this many seconds, None follows the table until the generator is
+            closed.
+        :param workers: int
+            Number of threads of read_columns().
+        :return: generator
+            (rows, values) per batch, the slice of new rows and the values per column.
+        """
+        columns = self.readable_columns() if columns is None else list(columns)
+        start = self.nrows if start is None else start
+        last_change = time.monotonic()
+
+        while True:
+            self.refresh()
+
+            while start < self.nrows:
+                rows = slice(start, min(start + batch_rows, self.nrows))
+
+                try:
+                    values = self.read_columns(columns, rows=rows, workers=workers)
+
+                except ValueError as error:
+                    # The rows ran past the end of a file still being written, map the files again and retry later.
+                    logger.warning(f"Couldn't read rows {rows.start}-{rows.stop} of {self.path.name}: {error}")
+                    self.measurement_set.unmap()
+
+                    break
+
+                yield rows, values
+
+                start = rows.stop
+                last_change = time.monotonic()
+
+            if timeout is not None and time.monotonic() - last_change >= timeout:
+                return
+
+            time.sleep(interval)
+
+    def read_columns(self, columns: list = None, rows=None, workers: int = None) -> dict:
+        """
+        Read several columns over the same rows. Columns of different data managers live in different files and
+        are decoded concurrently on a thread pool, the columns of one manager are read one after another by the
+        same thread.
+
+        :param columns: list
+            Column names, defaults to the readable columns.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full columns.
+        :param workers: int
+            Number of threads, defaults to one per data manager up to the number of CPUs. 1 reads sequentially.
+        :return: dict
+            Values per column, in the order of the columns.
+        """
+        columns = self.readable_columns() if columns is None else list(columns)
+
+        return read_by_manager(
+            self, columns, lambda column: column.manager.read_column(column.name, rows=rows), workers=workers
+        )
+
+    def read_shared(self, columns: list = None, rows=None, blocks: shared.SharedBlocks = None, workers: int = None):
+        """
+        Decode columns into a single shared memory block for a process pool. Workers attach() to the descriptors
+        without copying, e.g. blocks.track(executor.submit(grid, descriptors), descriptors) keeps the block until
+        the task is done. The owner drops its own reference with blocks.release(descriptors) once it has handed the
+        descriptors out.
+
+        :param columns: list
+            Column names, defaults to the readable columns.
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full columns.
+        :param blocks: SharedBlocks
+            Owner of the block, the process wide owner by default.
+        :param workers: int
+            Number of threads, see read_columns().
+        :return: dict
+            SharedArray (block name, dtype, shape and offset) per column.
+        """
+        columns = self.readable_columns() if columns is None else list(columns)
+        blocks = shared.owner() if blocks is None else blocks
+
+        rows = tools.row_array(rows, self.nrows)
+
+        # Strings are sized by their longest value, they are decoded before the block can be laid out.
+        strings = {name: self[name].read(rows=rows) for name in columns if self[name].dtype.kind == "U"}
+        specs = {}
+
+        for name in columns:
+            if name in strings:
+                specs[name] = (strings[name].dtype, strings[name].shape)
+
+            elif self[name].cell_shape is None:
+                raise ValueError(f"Column {name} has no fixed cell shape")
+
+            else:
+                specs[name] = (self[name].dtype, (rows.size,) + self[name].cell_shape)
+
+        descriptors, arrays = blocks.allocate(specs)
+
+        def read(column):
+            if column.name in strings:
+                arrays[column.name][...] = strings[column.name]
+
+            else:
+                shared.decode_into(column.manager, column.name, rows, arrays[column.name])
+
+        try:
+            read_by_manager(self, columns, read, workers=workers)
+
+        except BaseException:
+            blocks.release(descriptors)
+            raise
+
+        return descriptors
+
+    def iter_chunks(self, by: str = "TIME", columns: list = None, max_bytes: int = 2 ** 28, workers: int = None):
+        """
+        Walk the table in row order one group of rows at a time, e.g. one integration (by="TIME") or one scan
+        (by="SCAN_NUMBER"). While the caller works on a chunk the next one is read on a background thread, at most
+        two chunks are held whatever the size of the table.
+
+        :param by: str
+            Scalar column whose runs of equal values form the chunks, None cuts the table into chunks of max_bytes.
+        :param columns: list
+            Column names, defaults to the readable columns.
+        :param max_bytes: int
+            Upper bound on the decoded size of a chunk, larger groups are split into consecutive chunks.
+        :param workers: int
+            Number of threads of read_columns().
+        :return: generator
+            (rows, values) per chunk, the slice of rows and the values per column.
+        """
+        columns = self.readable_columns() if columns is None else list(columns)
+
+        # The boundaries are found and the chunks read on the same thread, the data managers are never used by two
+        # threads at once.
+        ranges = chunks.chunk_rows(self.measurement_set, columns, by=by, max_bytes=max_bytes)
+
+        def read_next():
+            rows = next(ranges, None)
+
+            return None if rows is None else (rows, self.read_columns(columns, rows=rows, workers=workers))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(read_next)
+
+            while True:
+                chunk = future.result()
+
+                if chunk is None:
+                    return
+
+                future = executor.submit(read_next)
+
+                yield chunk
+
+    def average(
+            self,
+            name: str,
+            channels: int = 1,
+            time_bin: float = None,
+            decimate: bool = False,
+            flag: str = "FLAG",
+            weight: str = "WEIGHT"
+    ) -> averaging.AveragedColumn:
+        """
+        Read a column averaged over bins of channels and of time per baseline, e.g. for plots or quick look images.
+        The column is reduced bucket by bucket (tile by tile) as it is read, the full resolution column is never
+        held in memory.
+
+        :param name: str
+            Column name, e.g. DATA.
+        :param channels: int
+            Number of adjacent channels per bin.
+        :param time_bin: float
+            Seconds of TIME per bin, None keeps the rows.
+        :param decimate: bool
+            Keep the first sample of every bin instead of the flagged and weighted mean.
+        :param flag: str
+            Flag column, None to ignore it. FLAG_ROW is applied when present.
+        :param weight: str
+            Weight column, WEIGHT or WEIGHT_SPECTRUM, None to weigh samples equally.
+        :return: AveragedColumn
+            Values, flags and weights of the bins and the first input row of each output row.
+        """
+        return averaging.average(
+            self.measurement_set, name, channels=channels, time_bin=time_bin, decimate=decimate, flag=flag,
+            weight=weight
+        )
+
+    def iter_record_batches(self, columns: list = None, batch_rows: int = 65536):
+        """
+        :param columns: list
+            Column names, defaults to the readable columns.
+        :param batch_rows: int
+            Rows per batch.
+        :return: generator
+            pyarrow.RecordBatch per batch_rows rows, wrapping the decoded numpy buffers without copying. Array
+            columns become FixedSizeList arrays and complex values (real, imaginary) pairs.
+        """
+        columns = self.readable_columns() if columns is None else list(columns)
+
+        for start in range(0, self.nrows, batch_rows):
+            rows = slice(start, min(start + batch_rows, self.nrows))
+
+            yield arrow.record_batch(columns, [self[name].read(rows=rows) for name in columns])
+
+    def to_dask(self, name: str, chunks="auto", cell=None):
+        """
+        :param name: str
+            Column name.
+        :param chunks: str, int or tuple
+            "auto" sizes chunks by the dask array.chunk-size setting, an int is the preferred number of rows per
+            chunk, both are aligned to the buckets or tiles of the column. A tuple of row counts is used as is.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: dask.array.Array
+            Lazy array, each chunk is decoded by its own task with its own file handles.
+        """
+        return graph.to_dask(self.measurement_set, name, chunks=chunks, cell=cell)
+
+
+def read_by_manager(table: Table, columns: list, read, workers: int = None) -> dict:
+    """
+    Group columns by data manager and run read(column) for each group on its own thread. Managers keep their own
+    memory maps and decode state, a manager is only ever used by one thread at a time.
+
+    :return: dict
+        Result of read() per column name, in the order of the columns.
+    """
+    groups = {}
+
+    # Resolve the columns up front, the handle cache of the table isn't shared with the threads.
+    for name in columns:
+        column = table[name]
+        groups.setdefault(id(column.manager), []).append(column)
+
+    def read_group(group: list) -> dict:
+        return {column.name: read(column) for column in group}
+
+    workers = min(len(groups), os.cpu_count() or 1) if workers is None else workers
+
+    values = {}
+
+    if workers <= 1 or len(groups) <= 1:
+        for group in groups.values():
+            values.update(read_group(group))
+
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(read_group, groups.values()):
+                values.update(result)
+
+    return {name: values[name] for name in columns}
+
+
+def parse_table(filename: str, memory_map: bool = True, cache=None, stats=None) -> CasaMeasurementSet:
+    """
+    Parse a table.dat and release its file handle so the result can be sent back from a worker process.
+    """
+    measurement_set = CasaMeasurementSet(filename, memory_map=memory_map, cache=cache, stats=stats)
+    measurement_set.read()
+    measurement_set.close()
+
+    # The instrumentation stays with the caller, it can't be sent back from a worker process.
+    measurement_set.stats = None
+
+    return measurement_set
+
+
+class Subtables:
+    """
+    Subtables of a table, found through its "table" typed keywords and opened on first access.
+    """
+    __slots__ = ["paths", "tables", "memory_map", "cache", "stats", "lock"]
+
+    def __init__(self, table: Table, memory_map: bool = True, cache=None, stats=None):
+        record = table.measurement_set.table.keywords
+
+        self.paths = {
+            name: pathlib.Path(record.records[name])
+            for name, record_type in zip(record.description.names, record.description.types)
+            if record_type == "table" and pathlib.Path(record.records[name]).joinpath("table.dat").is_file()
+        }
+
+        self.tables = {}
+        self.memory_map = memory_map
+        self.cache = cache
+        self.stats = stats
+        self.lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Table:
+        if name not in self.paths:
+            raise KeyError(f"No subtable {name}")
+
+        with self.lock:
+            if name not in self.tables:
+                self.tables[name] = Table(
+                    self.paths[name], memory_map=self.memory_map, cache=self.cache, stats=self.stats
+                )
+
+            return self.tables[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __repr__(self) -> str:
+        return f"Subtables({list(self.paths)})"
+
+    def keys(self):
+        return self.paths.keys()
+
+    def prefetch(self, workers: int = None, processes: bool = False) -> dict:
+        with self.lock:
+            missing = [name for name in self.paths if name not in self.tables]
+
+        executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+
+        with executor(max_workers=workers) as pool:
+            parsed = pool.map(
+                parse_table,
+                [str(self.paths[name].joinpath("table.dat")) for name in missing],
+                [self.memory_map] * len(missing),
+                [self.cache] * len(missing),
+                [None if processes else self.stats] * len(missing)
+            )
+
+            for name, measurement_set in zip(missing, parsed):
+                table = Table(self.paths[name], memory_map=self.memory_map, measurement_set=measurement_set)
+
+                with self.lock:
+                    self.tables.setdefault(name, table)
+
+        return {name: self[name] for name in self.paths}
+
+    def close(self):
+        with self.lock:
+            for table in self.tables.values():
+                table.close()
+
+            self.tables.clear()
+
+
+class Column:
+    """
+    Lazy handle of a table column. Indexing follows numpy, the first index selects rows and the remaining ones the
+    cell axes (numpy order). The data manager storing the column is resolved when the handle is created but its
+    files are only opened on the first read.
+    """
+    __slots__ = ["table", "description", "manager"]
+
+    def __init__(self, table: Table, description):
+        self.table = table
+        self.description = description
+        self.manager = table.measurement_set.data_manager(description.name)
+
+    @property
+    def name(self) -> str:
+        return self.description.name
+
+    @property
+    def cell_shape(self) -> tuple:
+        """
+        Cell shape in numpy order, None for array columns without a fixed shape.
+        """
+        if self.description.ndims == 0:
+            return tuple()
+
+        return self.manager.shapes[self.name]
+
+    @property
+    def shape(self) -> tuple:
+        cell_shape = self.cell_shape
+
+        return (self.table.nrows,) + (cell_shape if cell_shape is not None else tuple())
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return tools.column_dtype(self.description.value_type)
+
+    def __len__(self) -> int:
+        return self.table.nrows
+
+    def __repr__(self) -> str:
+        return f"Column({self.name!r}, shape={self.shape}, dtype={self.dtype}, manager={type(self.manager).__name__})"
+
+    def __getitem__(self, key) -> np.ndarray:
+        cell_shape = self.cell_shape
+
+        # Columns without a fixed shape may still fix their number of dimensions.
+        if cell_shape is not None:
+            ndim = len(cell_shape)
+
+        else:
+            ndim = int(self.description.ndims) if self.description.ndims > 0 else None
+
+        rows, cell = tools.split_key(key, ndim)
+
+        values = self.read(rows=rows, cell=cell)
+
+        # An integer row index drops the row axis like numpy does.
+        if np.ndim(rows) == 0 and not isinstance(rows, slice):
+            return values[0]
+
+        return values
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self.read()
+
+        return values if dtype is None else values.astype(dtype)
+
+    def read(self, rows=None, cell=None) -> np.ndarray:
+        """
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: np.ndarray
+        """
+        return self.manager.read_column(self.name, rows=rows, cell=cell)
+
+    def runs(self, rows=None, cell=None):
+        """
+        :return: RunLength
+            Run-length encoded values of the selected rows.
+        """
+        return self.manager.read_runs(self.name, rows=rows, cell=cell)
+
+    def cells(self, rows=None):
+        """
+        Read an indirect (variable shape) array column without stacking its cells.
+
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :return: RaggedArray
+            Values and offsets of the cells, groups() splits them by shape.
+        """
+        return self.manager.read_indirect(self.name, rows=rows)
+
+    def packed(self, rows=None, cell=None):
+        """
+        Read a boolean column (e.g. FLAG) without unpacking its bits.
+
+        :param rows: None, int, slice, list or np.ndarray
+            Rows to read, None reads the full column.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: PackedBool
+            Bit packed values with count/OR/AND reductions and masking, indexing unpacks only the selected rows.
+        """
+        return self.manager.read_packed(self.name, rows=rows, cell=cell)
+
+
+class Selection:
+    """
+    Rows of a table matching a select(), stored as sorted ranges. Reads are pushed down to the data managers as
+    ranges, so the StandardStMan copies whole bucket runs and the tiled managers only touch the tiles of the
+    selected rows.
+    """
+    __slots__ = ["table", "starts", "stops"]
+
+    def __init__(self, table: Table, starts: np.ndarray, stops: np.ndarray):
+        self.table = table
+        self.starts = starts
+        self.stops = stops
+
+    @property
+    def nrows(self) -> int:
+        return int(np.sum(self.stops - self.starts))
+
+    @property
+    def rows(self) -> np.ndarray:
+        return tools.ranges_to_rows(self.starts, self.stops)
+
+    @property
+    def ranges(self) -> list:
+        """
+        :return: list
+            (start, stop) of each range of consecutive rows, stop excluded.
+        """
+        return [(int(start), int(stop)) for start, stop in zip(self.starts, self.stops)]
+
+    @property
+    def columns(self) -> list:
+        return self.table.columns
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def __repr__(self) -> str:
+        return f"Selection({str(self.table.path)!r}, nrows={self.nrows}, ranges={self.starts.size})"
+
+    def __getitem__(self, key) -> np.ndarray:
+        """
+        selection["DATA"] or selection["DATA", :, 0] decodes the column (cells) of the selected rows.
+        """
+        name, cell = (key[0], key[1:] or None) if isinstance(key, tuple) else (key, None)
+
+        return self.read(name, cell=cell)
+
+    def read(self, name: str, cell=None) -> np.ndarray:
+        """
+        :param name: str
+            Column name.
+        :param cell: tuple
+            Optional numpy style index applied to the cell axes of array columns.
+        :return: np.ndarray
+            Column values of the selected rows.
+        """
+        column = self.table[name]
+
+        return column.manager.read_ranges(name, self.starts, self.stops, cell=cell)
+
+    def read_columns(self, columns: list = None, workers: int = None) -> dict:
+        """
+        Read several columns of the selected rows, concurrently per data manager, see Table.read_columns().
+
+        :return: dict
+            Values per column.
+        """
+        columns = self.table.readable_columns() if columns is None else list(columns)
+
+        return read_by_manager(
+            self.table,
+            columns,
+            lambda column: column.manager.read_ranges(column.name, self.starts, self.stops),
+            workers=workers
+        )
+
+    def select(self, **predicates):
+        """
+        :return: Selection
+            Rows of this selection that also match the predicates, see Table.select().
+        """
+        starts, stops = selection.evaluate(
+            self.table.measurement_set, predicates, self.starts, self.stops, table_index=self.table.index
+        )
+
+        return Selection(self.table, starts, stops)
@@ -0,0 +1,227 @@
+import sys
+import json
+import time
+import pathlib
+import argparse
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from mio import reader
+from mio.utilities import synthetic
+
+from typing import Union
+
+# Generator settings recorded with the results of synthetic tables.
+PARAMETERS = [
+    "nrows", "nchannels", "ncorrelations", "nextra", "keyword_depth", "nantennas", "integrations_per_scan",
+    "bucket_size", "tile_shape", "endian"
+]
+
+
+def peak_rss() -> int:
+    """
+    :return: int
+        Peak resident set size of this process in bytes.
+    """
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Reported in kilobytes on Linux and in bytes on macOS.
+        return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+    except ImportError:
+        import psutil
+
+        return int(psutil.Process().memory_info().rss)
+
+
+def isolated(function, *args) -> dict:
+    """
+    Run a benchmark in a fresh process so the peak memory reported belongs to that benchmark alone.
+    """
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(function, *args).result()
+
+
+def open_time(path: str, repeat: int) -> dict:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = reader.open(path)
+        timings.append(time.perf_counter() - start)
+        table.close()
+
+    return {"median_s": float(np.median(timings)), "min_s": float(np.min(timings)), "peak_rss_bytes": peak_rss()}
+
+
+def column_throughput(path: str, column: str, repeat: int) -> dict:
+    timings = []
+    nbytes = 0
+
+    for _ in range(repeat):
+        with reader.open(path) as table:
+            start = time.perf_counter()
+            values = table[column][:]
+            timings.append(time.perf_counter() - start)
+
+            nbytes = values.nbytes
+
+    best = float(np.min(timings))
+
+    return {
+        "bytes": int(nbytes),
+        "median_s": float(np.median(timings)),
+        "min_s": best,
+        "gb_per_s": nbytes / best / 1e9 if best > 0 else None,
+        "peak_rss_bytes": peak_rss()
+    }
+
+
+def random_row_latency(path: str, column: str, samples: int, seed: int) -> dict:
+    generator = np.random.default_rng(seed)
+
+    with reader.open(path) as table:
+        rows = generator.integers(0, table.nrows, samples)
+
+        # The first access maps the files and parses the indexes, keep it out of the latencies.
+        table[column][int(rows[0])]
+
+        timings = []
+
+        for row in rows:
+            start = time.perf_counter()
+            table[column][int(row)]
+            timings.append(time.perf_counter() - start)
+
+    timings = np.array(timings) * 1e6
+
+    return {
+        "median_us": float(np.median(timings)),
+        "p95_us": float(np.percentile(timings, 95)),
+        "max_us": float(np.max(timings)),
+        "peak_rss_bytes": peak_rss()
+    }
+
+
+def git_commit() -> Union[str, None]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=pathlib.Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(
+        path: Union[str, pathlib.Path] = None,
+        output: Union[str, pathlib.Path] = "benchmark.json",
+        columns: list = None,
+        repeat: int = 5,
+        samples: int = 1000,
+        seed: int = 0,
+        **kwargs
+) -> dict:
+    """
+    Benchmark table open time, full column throughput and random row latency, each in its own process so that the
+    peak memory use is reported per benchmark. Results are written to JSON together with the commit and platform
+    so runs of different commits can be compared.
+
+    :param path: str
+        Table to benchmark, a synthetic measurement set is generated in a temporary directory when not given.
+    :param output: str
+        JSON file to write the results to.
+    :param columns: list
+        Columns to benchmark, defaults to every column.
+    :param repeat: int
+        Repetitions of the open and throughput benchmarks, the best and median time are reported.
+    :param samples: int
+        Number of random rows read for the latency benchmark.
+    :param seed: int
+        Seed of the random rows.
+    :param kwargs:
+        Parameters of the synthetic measurement set, see SyntheticMeasurementSet.
+    :return: dict
+        Results as written to the JSON file.
+    """
+    with tempfile.TemporaryDirectory(prefix="mio-benchmark-") as directory:
+        parameters = {}
+
+        if path is None:
+            path = pathlib.Path(directory).joinpath("synthetic.ms")
+            generator = synthetic.generate(path, **kwargs)
+            parameters = {name: getattr(generator, name) for name in PARAMETERS}
+
+        path = str(path)
+
+        if columns is None:
+            with reader.open(path) as table:
+                columns = table.readable_columns()
+
+        results = {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "table": path if not parameters else None,
+            "synthetic": parameters or None,
+            "open": isolated(open_time, path, repeat),
+            "throughput": {column: isolated(column_throughput, path, column, repeat) for column in columns},
+            "random_rows": {column: isolated(random_row_latency, path, column, samples, seed) for column in columns},
+        }
+
+    pathlib.Path(output).write_text(json.dumps(results, indent=2))
+
+    return results
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Benchmark the mio table readers.")
+    parser.add_argument("--table", default=None, help="Table to benchmark, a synthetic table is used by default.")
+    parser.add_argument("--output", default="benchmark.json", help="JSON file for the results.")
+    parser.add_argument("--columns", nargs="*", default=None, help="Columns to benchmark.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--correlations", type=int, default=4)
+    parser.add_argument("--extra-columns", type=int, default=0)
+    parser.add_argument("--keyword-depth", type=int, default=1)
+
+    arguments = parser.parse_args(argv)
+
+    results = run(
+        path=arguments.table,
+        output=arguments.output,
+        columns=arguments.columns,
+        repeat=arguments.repeat,
+        samples=arguments.samples,
+        nrows=arguments.rows,
+        nchannels=arguments.channels,
+        ncorrelations=arguments.correlations,
+        nextra=arguments.extra_columns,
+        keyword_depth=arguments.keyword_depth
+    )
+
+    for column, result in results["throughput"].items():
+        print(f"{column:>16}: {result['gb_per_s'] or 0:8.3f} GB/s, {results['random_rows'][column]['median_us']:9.1f} us/row")
+
+
+if __name__ == "__main__":
+    main()
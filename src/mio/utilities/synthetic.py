@@ -0,0 +1,788 @@
+import struct
+import pathlib
+
+import numpy as np
+
+from dataclasses import dataclass
+
+from mio.utilities import types
+
+from typing import Union
+
+MAGIC: bytes = b"\xbe\xbe\xbe\xbe"
+
+# Buckets of the StandardStMan and IncrementalStMan files start after a fixed size header.
+BUCKET_OFFSET: int = 512
+
+# Value type names used in the column description type, e.g. ScalarColumnDesc<double  >
+TYPE_NAME = {
+    "bool": "Bool    ",
+    "int": "Int     ",
+    "float": "float   ",
+    "double": "double  ",
+    "complex": "Complex ",
+    "dcomplex": "DComplex",
+    "string": "String  ",
+}
+
+
+class AipsWriter:
+    """
+    Minimal AipsIO writer: objects are written as length, type name and version, the length is patched in when the
+    object ends. Only top level objects start with the magic code.
+    """
+    __slots__ = ["buffer", "endian", "starts"]
+
+    def __init__(self, endian: str = ">"):
+        self.buffer = bytearray()
+        self.endian = endian
+        self.starts = []
+
+    def pack(self, fmt: str, *values):
+        self.buffer += struct.pack(self.endian + fmt, *values)
+
+    def integer(self, value: int):
+        self.pack("i", int(value))
+
+    def unsigned(self, value: int):
+        self.pack("I", int(value))
+
+    def long(self, value: int):
+        self.pack("q", int(value))
+
+    def double(self, value: float):
+        self.pack("d", float(value))
+
+    def boolean(self, value: bool):
+        self.buffer.append(1 if value else 0)
+
+    def string(self, value: str):
+        encoded = value.encode("utf-8")
+
+        self.unsigned(len(encoded))
+        self.buffer += encoded
+
+    def start(self, type_name: str, version: int, top: bool = False):
+        if top:
+            self.buffer += MAGIC
+
+        self.starts.append(len(self.buffer))
+        self.unsigned(0)
+        self.string(type_name)
+        self.unsigned(version)
+
+    def end(self):
+        start = self.starts.pop()
+        struct.pack_into(self.endian + "I", self.buffer, start, len(self.buffer) - start)
+
+    def position(self, values):
+        self.start("IPosition", 1)
+        self.unsigned(len(values))
+
+        for value in values:
+            self.integer(value)
+
+        self.end()
+
+    def block(self, values):
+        self.start("Block", 1)
+        self.unsigned(len(values))
+        self.buffer += np.asarray(values, dtype=self.endian + "u4").tobytes()
+        self.end()
+
+    def record_description(self, record: dict):
+        self.start("RecordDesc", 2)
+        self.integer(len(record))
+
+        for name, value in record.items():
+            self.string(name)
+            self.integer(types.TYPE_LIST.index(value_type(value)))
+
+            # Sub records carry their own description with the value.
+            if isinstance(value, dict):
+                self.record_description({})
+
+            # Field comment
+            self.string("")
+
+        self.end()
+
+    def record(self, record: dict):
+        self.start("TableRecord", 1)
+        self.record_description(record)
+
+        # Record type, variable structure
+        self.integer(1)
+
+        for value in record.values():
+            if isinstance(value, dict):
+                self.record(value)
+
+            elif isinstance(value, str):
+                self.string(value)
+
+            elif isinstance(value, float):
+                self.double(value)
+
+            else:
+                self.integer(value)
+
+        self.end()
+
+
+def value_type(value) -> str:
+    if isinstance(value, dict):
+        return "record"
+
+    if isinstance(value, str):
+        return "string"
+
+    if isinstance(value, float):
+        return "double"
+
+    if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+        return "int"
+
+    raise NotImplementedError(f"Keyword values of type {type(value).__name__} are not supported")
+
+
+@dataclass(init=False)
+class SyntheticColumn:
+    name: str
+    value_type: str
+    shape: tuple
+    manager: str
+    keywords: dict
+
+
+class SyntheticMeasurementSet:
+    """
+    Writer of measurement set like main tables with known content: scalar and UVW columns in a StandardStMan,
+    slowly varying ids in an IncrementalStMan and DATA/FLAG in a TiledShapeStMan hypercube. The value of every cell
+    is a function of its row, see values(), so readers can be checked against the generator.
+    """
+    __slots__ = [
+        "nrows", "nchannels", "ncorrelations", "nextra", "keyword_depth", "nantennas", "integrations_per_scan",
+        "bucket_size", "tile_shape", "endian", "baselines", "columns"
+    ]
+
+    def __init__(
+            self,
+            nrows: int = 10000,
+            nchannels: int = 64,
+            ncorrelations: int = 4,
+            nextra: int = 0,
+            keyword_depth: int = 1,
+            nantennas: int = 10,
+            integrations_per_scan: int = 10,
+            bucket_size: int = 32768,
+            tile_shape: tuple = None,
+            endian: str = "<"
+    ):
+        """
+        :param nrows: int
+            Number of rows.
+        :param nchannels: int
+            Number of channels of DATA and FLAG.
+        :param ncorrelations: int
+            Number of correlations of DATA and FLAG.
+        :param nextra: int
+            Number of additional double columns (EXTRA_<i>) in the StandardStMan.
+        :param keyword_depth: int
+            Nesting depth of the records in the table keywords.
+        :param nantennas: int
+            Number of antennas, every integration holds all cross correlation baselines.
+        :param integrations_per_scan: int
+            Integrations per SCAN_NUMBER.
+        :param bucket_size: int
+            Bucket size of the StandardStMan and IncrementalStMan files.
+        :param tile_shape: tuple
+            Tile shape of the hypercube in casacore order (correlations, channels, rows).
+        :param endian: str
+            Byte order of the data files, "<" or ">". table.dat is always big endian.
+        """
+        self.nrows = int(nrows)
+        self.nchannels = int(nchannels)
+        self.ncorrelations = int(ncorrelations)
+        self.nextra = int(nextra)
+        self.keyword_depth = int(keyword_depth)
+        self.nantennas = int(nantennas)
+        self.integrations_per_scan = int(integrations_per_scan)
+        self.bucket_size = int(bucket_size)
+        self.endian = endian
+
+        if tile_shape is None:
+            # About 128 kiB of visibilities per tile
+            channels = min(self.nchannels, 64)
+            tile_shape = (self.ncorrelations, channels, max(1, 131072 // (8 * self.ncorrelations * channels)))
+
+        self.tile_shape = tuple(int(length) for length in tile_shape)
+        self.baselines = np.stack(np.triu_indices(self.nantennas, k=1), axis=1).astype(np.int32)
+
+        self.columns = [
+            self.column("TIME", "double", None, "StandardStMan", {"UNIT": "s", "MEASINFO": {"type": "epoch"}}),
+            self.column("ANTENNA1", "int", None, "StandardStMan"),
+            self.column("ANTENNA2", "int", None, "StandardStMan"),
+            self.column("INTERVAL", "double", None, "StandardStMan", {"UNIT": "s"}),
+            self.column("FLAG_ROW", "bool", None, "StandardStMan"),
+            self.column("UVW", "double", (3,), "StandardStMan", {"UNIT": "m"}),
+        ]
+
+        self.columns += [
+            self.column(f"EXTRA_{index}", "double", None, "StandardStMan") for index in range(self.nextra)
+        ]
+
+        self.columns += [
+            self.column("ARRAY_ID", "int", None, "IncrementalStMan"),
+            self.column("DATA_DESC_ID", "int", None, "IncrementalStMan"),
+            self.column("FIELD_ID", "int", None, "IncrementalStMan"),
+            self.column("SCAN_NUMBER", "int", None, "IncrementalStMan"),
+            self.column("DATA", "complex", (self.nchannels, self.ncorrelations), "TiledShapeStMan"),
+            self.column("FLAG", "bool", (self.nchannels, self.ncorrelations), "TiledShapeStMan"),
+        ]
+
+    @staticmethod
+    def column(name: str, column_type: str, shape, manager: str, keywords: dict = None) -> SyntheticColumn:
+        column = SyntheticColumn()
+
+        column.name = name
+        column.value_type = column_type
+        column.shape = shape
+        column.manager = manager
+        column.keywords = keywords or {}
+
+        return column
+
+    def keywords(self) -> dict:
+        record = {"MS_VERSION": 2.0}
+        nested = {}
+
+        for level in range(self.keyword_depth, 0, -1):
+            nested = {"LEVEL": level, "NAME": f"level_{level}", "VALUE": level * 0.5, "CHILD": nested}
+
+        if self.keyword_depth > 0:
+            record["SYNTHETIC"] = nested
+
+        return record
+
+    def values(self, name: str, rows: np.ndarray) -> np.ndarray:
+        """
+        :param name: str
+            Column name.
+        :param rows: np.ndarray
+            Row numbers.
+        :return: np.ndarray
+            Expected column values, cells in numpy order.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+
+        integration = rows // len(self.baselines)
+        baseline = rows % len(self.baselines)
+        scan = 1 + integration // self.integrations_per_scan
+
+        if name == "TIME":
+            return 4.9e9 + integration.astype(np.float64)
+
+        if name == "INTERVAL":
+            return np.ones(rows.size, dtype=np.float64)
+
+        if name == "ANTENNA1":
+            return self.baselines[baseline, 0]
+
+        if name == "ANTENNA2":
+            return self.baselines[baseline, 1]
+
+        if name == "FLAG_ROW":
+            return rows % 17 == 0
+
+        if name == "UVW":
+            return np.stack([rows * 0.5, baseline * 1.0, integration * -0.25], axis=1)
+
+        if name.startswith("EXTRA_"):
+            return rows * (int(name.split("_")[1]) + 1) * 0.125
+
+        if name in ("ARRAY_ID", "DATA_DESC_ID"):
+            return np.zeros(rows.size, dtype=np.int32)
+
+        if name == "SCAN_NUMBER":
+            return scan.astype(np.int32)
+
+        if name == "FIELD_ID":
+            return ((scan - 1) % 3).astype(np.int32)
+
+        channels = np.arange(self.nchannels)[:, None]
+        correlations = np.arange(self.ncorrelations)[None, :]
+
+        if name == "DATA":
+            real = rows[:, None, None] + channels * 0.001
+            imaginary = correlations - channels * 0.5
+
+            return (real + 1j * imaginary).astype(np.complex64)
+
+        if name == "FLAG":
+            return (rows[:, None, None] + channels + correlations) % 7 == 0
+
+        raise KeyError(f"Unknown column {name}")
+
+    def managers(self) -> list:
+        return ["StandardStMan", "IncrementalStMan", "TiledShapeStMan"]
+
+    def write(self, path: Union[str, pathlib.Path]) -> pathlib.Path:
+        """
+        :param path: str
+            Table directory to create.
+        :return: pathlib.Path
+        """
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        blobs = {
+            0: write_standard(self, path.joinpath("table.f0")),
+            1: write_incremental(self, path.joinpath("table.f1")),
+            2: write_tiled_shape(self, path.joinpath("table.f2"), sequence_number=2),
+        }
+
+        path.joinpath("table.dat").write_bytes(write_table_dat(self, blobs))
+        path.joinpath("table.info").write_text("Type = Measurement Set\nSubType = \n")
+
+        return path
+
+    def manager_columns(self, manager: str) -> list:
+        return [column for column in self.columns if column.manager == manager]
+
+
+def write_column_description(writer: AipsWriter, column: SyntheticColumn, manager_name: str):
+    kind = "ArrayColumnDesc" if column.shape is not None else "ScalarColumnDesc"
+
+    writer.integer(1)
+    writer.string(f"{kind}<{TYPE_NAME[column.value_type]}")
+    writer.integer(1)
+    writer.string(column.name)
+    writer.string("")
+    writer.string(column.manager)
+    writer.string(manager_name)
+    writer.integer(types.TYPE_LIST.index(column.value_type))
+
+    if column.shape is None:
+        writer.integer(0)
+        writer.integer(0)
+
+    else:
+        # Small fixed shape arrays (UVW) are stored directly in the buckets.
+        writer.integer(types.DIRECT | types.FIXED_SHAPE if column.manager == "StandardStMan" else types.FIXED_SHAPE)
+        writer.integer(len(column.shape))
+        writer.position(column.shape[::-1])
+
+    # Maximum string length
+    writer.integer(0)
+    writer.record(column.keywords)
+
+    writer.integer(1)
+
+    # Default value
+    if column.shape is not None:
+        writer.boolean(False)
+
+    elif column.value_type == "string":
+        writer.string("")
+
+    else:
+        writer.buffer += bytes(types.TYPE_TO_BYTES[column.value_type])
+
+
+def write_table_dat(synthetic: SyntheticMeasurementSet, blobs: dict) -> bytes:
+    writer = AipsWriter(">")
+    names = {"StandardStMan": "SSM", "IncrementalStMan": "ISM", "TiledShapeStMan": "TiledData"}
+
+    writer.start("Table", 2, top=True)
+    writer.unsigned(synthetic.nrows)
+    writer.unsigned(0 if synthetic.endian == ">" else 1)
+    writer.string("PlainTable")
+
+    writer.start("TableDesc", 2)
+
+    for _ in range(3):
+        writer.string("")
+
+    writer.record(synthetic.keywords())
+    writer.record({})
+
+    writer.integer(len(synthetic.columns))
+
+    for column in synthetic.columns:
+        write_column_description(writer, column, names[column.manager])
+
+    writer.end()
+
+    # Column set
+    managers = synthetic.managers()
+
+    writer.integer(-2)
+    writer.unsigned(synthetic.nrows)
+    writer.unsigned(len(managers))
+    writer.unsigned(len(managers))
+
+    for sequence_number, manager in enumerate(managers):
+        writer.string(manager)
+        writer.unsigned(sequence_number)
+
+    for column in synthetic.columns:
+        writer.integer(2)
+        writer.string(column.name)
+        writer.integer(1)
+        writer.integer(managers.index(column.manager))
+
+        if column.shape is not None:
+            writer.boolean(True)
+            writer.position(column.shape[::-1])
+
+    for sequence_number in range(len(managers)):
+        writer.unsigned(len(blobs[sequence_number]))
+        writer.buffer += blobs[sequence_number]
+
+    writer.end()
+
+    return bytes(writer.buffer)
+
+
+def cell_bits(column: SyntheticColumn) -> int:
+    ncells = int(np.prod(column.shape)) if column.shape is not None else 1
+
+    if column.value_type == "bool":
+        return ncells
+
+    return ncells * 8 * types.TYPE_TO_BYTES[column.value_type]
+
+
+def write_standard(synthetic: SyntheticMeasurementSet, filename: pathlib.Path) -> bytes:
+    """
+    Write the StandardStMan bucket file, every column gets a fixed range of each bucket.
+
+    :return: bytes
+        Data manager section of table.dat.
+    """
+    columns = synthetic.manager_columns("StandardStMan")
+    endian = synthetic.endian
+
+    bits = [cell_bits(column) for column in columns]
+    rows_per_bucket = (synthetic.bucket_size * 8) // sum(bits)
+
+    offsets = np.concatenate(([0], np.cumsum([-(-rows_per_bucket * nbits // 8) for nbits in bits])[:-1]))
+    nbuckets = max(-(-synthetic.nrows // rows_per_bucket), 1)
+
+    with open(filename, "wb") as file:
+        file.write(bytes(BUCKET_OFFSET))
+
+        # Write groups of buckets to bound memory use.
+        group = max(1, (64 << 20) // synthetic.bucket_size)
+
+        for first in range(0, nbuckets, group):
+            count = min(group, nbuckets - first)
+            data = np.zeros((count, synthetic.bucket_size), dtype=np.uint8)
+
+            rows = np.arange(first * rows_per_bucket, min((first + count) * rows_per_bucket, synthetic.nrows))
+
+            for column, nbits, offset in zip(columns, bits, offsets):
+                values = synthetic.values(column.name, rows)
+                padded = np.zeros((count * rows_per_bucket,) + values.shape[1:], dtype=values.dtype)
+                padded[:rows.size] = values
+
+                if column.value_type == "bool":
+                    raw = np.packbits(padded.reshape(count, -1), axis=1, bitorder="little")
+
+                else:
+                    dtype = np.dtype(endian + types.DATA_TYPE[column.value_type])
+                    raw = padded.astype(dtype).reshape(count, -1).view(np.uint8)
+
+                data[:, offset:offset + raw.shape[1]] = raw
+
+            file.write(data.tobytes())
+
+        last_row = np.minimum(np.arange(1, nbuckets + 1) * rows_per_bucket, synthetic.nrows) - 1
+
+        index = AipsWriter(endian)
+        index.start("SSMIndex", 1, top=True)
+        index.unsigned(nbuckets)
+        index.unsigned(rows_per_bucket)
+        index.integer(len(columns))
+
+        # Free space map, empty
+        index.start("SimpleOrderedMap", 1)
+        index.integer(0)
+        index.unsigned(0)
+        index.unsigned(1)
+        index.end()
+
+        index.block(last_row)
+        index.block(np.arange(nbuckets))
+        index.end()
+
+        # The index goes into extra buckets, chained when it doesn't fit into a single one.
+        space = synthetic.bucket_size - 8
+        nindex = max(-(-len(index.buffer) // space), 1)
+
+        for number in range(nindex):
+            following = nbuckets + number + 1 if number + 1 < nindex else -1
+
+            bucket = bytearray(synthetic.bucket_size)
+            bucket[:8] = struct.pack(">ii", following, following)
+            chunk = index.buffer[number * space:(number + 1) * space]
+            bucket[8:8 + len(chunk)] = chunk
+
+            file.write(bucket)
+
+        header = AipsWriter(endian)
+        header.start("StandardStMan", 3, top=True)
+        header.boolean(endian == ">")
+        header.unsigned(synthetic.bucket_size)
+        header.unsigned(nbuckets + nindex)
+        header.unsigned(2)
+        header.unsigned(0)
+        header.integer(-1)
+        header.unsigned(nindex)
+        header.unsigned(nbuckets)
+        header.unsigned(8 if nindex == 1 else 0)
+        header.integer(-1)
+        header.unsigned(len(index.buffer))
+        header.unsigned(1)
+        header.end()
+
+        file.seek(0)
+        file.write(header.buffer)
+
+    blob = AipsWriter(">")
+    blob.start("SSM", 2, top=True)
+    blob.string("SSM")
+    blob.block(offsets)
+    blob.block(np.zeros(len(columns), dtype=np.int64))
+    blob.end()
+
+    return bytes(blob.buffer)
+
+
+def column_runs(synthetic: SyntheticMeasurementSet, column: SyntheticColumn) -> tuple:
+    values = synthetic.values(column.name, np.arange(synthetic.nrows))
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+
+    return starts, values
+
+
+def write_incremental(synthetic: SyntheticMeasurementSet, filename: pathlib.Path) -> bytes:
+    """
+    Write the IncrementalStMan bucket file, a value is only stored for rows where it changes and at the first row of
+    every bucket.
+
+    :return: bytes
+        Data manager section of table.dat.
+    """
+    columns = synthetic.manager_columns("IncrementalStMan")
+    endian = synthetic.endian
+
+    runs = [column_runs(synthetic, column) for column in columns]
+    sizes = [types.TYPE_TO_BYTES[column.value_type] for column in columns]
+
+    # Assign row ranges to buckets, every stored value costs its size, a row number and an offset.
+    events = np.unique(np.concatenate([starts[1:] for starts, _ in runs] + [np.zeros(0, dtype=np.int64)]))
+    base = 4 + sum(12 + size for size in sizes)
+
+    changes = [set(starts.tolist()) for starts, _ in runs]
+
+    bucket_starts = [0]
+    used = base
+
+    for event in events.tolist():
+        cost = sum(8 + size for changed, size in zip(changes, sizes) if event in changed)
+
+        if used + cost > synthetic.bucket_size:
+            bucket_starts.append(int(event))
+            used = base
+
+        else:
+            used += cost
+
+    bucket_starts = np.array(bucket_starts, dtype=np.int64)
+    bucket_ends = np.append(bucket_starts[1:], synthetic.nrows)
+
+    with open(filename, "wb") as file:
+        file.write(bytes(BUCKET_OFFSET))
+
+        for start, stop in zip(bucket_starts, bucket_ends):
+            data = bytearray()
+            index = bytearray()
+
+            for (starts, values), column in zip(runs, columns):
+                rows = np.concatenate(([start], starts[(starts > start) & (starts < stop)]))
+                dtype = np.dtype(endian + types.DATA_TYPE[column.value_type])
+
+                offsets = len(data) + np.arange(rows.size) * dtype.itemsize
+                data += values[rows].astype(dtype).tobytes()
+
+                index += np.array([rows.size], dtype=endian + "u4").tobytes()
+                index += (rows - start).astype(endian + "u4").tobytes()
+                index += offsets.astype(endian + "u4").tobytes()
+
+            bucket = bytearray(synthetic.bucket_size)
+            bucket[:4] = struct.pack(endian + "I", 4 + len(data))
+            bucket[4:4 + len(data)] = data
+            bucket[4 + len(data):4 + len(data) + len(index)] = index
+
+            file.write(bucket)
+
+        index = AipsWriter(endian)
+        index.start("ISMIndex", 1, top=True)
+        index.unsigned(bucket_starts.size)
+        index.block(np.append(bucket_starts, synthetic.nrows))
+        index.block(np.arange(bucket_starts.size))
+        index.end()
+
+        file.write(index.buffer)
+
+        header = AipsWriter(endian)
+        header.start("IncrementalStMan", 5, top=True)
+        header.boolean(endian == ">")
+        header.unsigned(synthetic.bucket_size)
+        header.unsigned(bucket_starts.size)
+        header.unsigned(1)
+        header.unsigned(0)
+        header.unsigned(0)
+        header.integer(-1)
+        header.end()
+
+        file.seek(0)
+        file.write(header.buffer)
+
+    blob = AipsWriter(">")
+    blob.start("ISM", 3, top=True)
+    blob.string("ISM")
+    blob.end()
+
+    return bytes(blob.buffer)
+
+
+def write_hypercube(writer: AipsWriter, extensible: bool, shape: tuple, tile_shape: tuple, file_sequence: int,
+                    offset: int):
+    writer.integer(1)
+
+    # Coordinate record, empty
+    writer.start("Record", 1)
+    writer.start("RecordDesc", 2)
+    writer.integer(0)
+    writer.end()
+    writer.integer(1)
+    writer.end()
+
+    writer.boolean(extensible)
+    writer.unsigned(len(shape))
+    writer.position(shape)
+    writer.position(tile_shape)
+    writer.integer(file_sequence)
+    writer.unsigned(offset)
+
+
+def write_tiled_shape(synthetic: SyntheticMeasurementSet, filename: pathlib.Path, sequence_number: int) -> bytes:
+    """
+    Write a TiledShapeStMan holding DATA and FLAG in a single hypercube. Tiles are written in Fortran order of the
+    tile grid, each tile holds the DATA tile followed by the bit packed FLAG tile.
+
+    :return: bytes
+        Data manager section of table.dat, empty for tiled managers.
+    """
+    columns = synthetic.manager_columns("TiledShapeStMan")
+    endian = synthetic.endian
+
+    shape = (synthetic.ncorrelations, synthetic.nchannels, synthetic.nrows)
+    tile = synthetic.tile_shape
+    ntiles = tuple(-(-length // size) for length, size in zip(shape, tile))
+
+    tile_cells = int(np.prod(tile))
+
+    with open(f"{filename}_TSM1", "wb") as file:
+        # Rows of tiles written per pass
+        group = max(1, (64 << 20) // (tile_cells * 8 * ntiles[0] * ntiles[1]))
+
+        for first in range(0, ntiles[2], group):
+            count = min(group, ntiles[2] - first)
+            rows = np.arange(first * tile[2], min((first + count) * tile[2], synthetic.nrows))
+
+            parts = []
+
+            for column in columns:
+                values = synthetic.values(column.name, rows)
+
+                padded = np.zeros((count * tile[2], ntiles[1] * tile[1], ntiles[0] * tile[0]), dtype=values.dtype)
+                padded[:rows.size, :shape[1], :shape[0]] = values
+
+                # (row tiles, rows, channel tiles, channels, correlation tiles, correlations) into tile order
+                tiled = padded.reshape(count, tile[2], ntiles[1], tile[1], ntiles[0], tile[0])
+                tiled = tiled.transpose(0, 2, 4, 1, 3, 5).reshape(-1, tile_cells)
+
+                if column.value_type == "bool":
+                    parts.append(np.packbits(tiled, axis=1, bitorder="little"))
+
+                else:
+                    dtype = np.dtype(endian + types.DATA_TYPE[column.value_type])
+                    parts.append(tiled.astype(dtype).view(np.uint8))
+
+            file.write(np.hstack(parts).tobytes())
+
+        length = file.tell()
+
+    writer = AipsWriter(">")
+    writer.start("TiledShapeStMan", 1, top=True)
+
+    writer.start("TiledStMan", 2)
+    writer.boolean(endian == ">")
+    writer.unsigned(sequence_number)
+    writer.unsigned(synthetic.nrows)
+    writer.unsigned(len(columns))
+
+    for column in columns:
+        writer.integer(types.TYPE_LIST.index(column.value_type))
+
+    writer.string("TiledData")
+    writer.unsigned(0)
+    writer.unsigned(len(shape))
+
+    # File 0 belongs to the empty hypercube 0, file 1 holds the data.
+    writer.unsigned(2)
+    writer.boolean(False)
+    writer.boolean(True)
+
+    if length < 2 ** 32:
+        writer.unsigned(1)
+        writer.unsigned(1)
+        writer.unsigned(length)
+
+    else:
+        writer.unsigned(2)
+        writer.unsigned(1)
+        writer.long(length)
+
+    writer.unsigned(2)
+    write_hypercube(writer, False, tuple(), tuple(), -1, 0)
+    write_hypercube(writer, True, shape, tile, 1, 0)
+    writer.end()
+
+    writer.position(tile)
+    writer.unsigned(1)
+    writer.block([synthetic.nrows - 1])
+    writer.block([1])
+    writer.block([synthetic.nrows - 1])
+    writer.end()
+
+    filename.write_bytes(bytes(writer.buffer))
+
+    return b""
+
+
+def generate(path: Union[str, pathlib.Path], **kwargs) -> SyntheticMeasurementSet:
+    """
+    Write a synthetic measurement set main table, see SyntheticMeasurementSet for the parameters.
+
+    :return: SyntheticMeasurementSet
+        Generator of the table, its values() method returns the expected content.
+    """
+    synthetic = SyntheticMeasurementSet(**kwargs)
+    synthetic.write(path)
+
+    return synthetic
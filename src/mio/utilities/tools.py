@@ -0,0 +1,151 @@
+import numpy as np
+
+from mio.utilities import types
+
+from typing import Union
+
+
+def row_array(rows: Union[None, int, slice, list, np.ndarray], nrows: int) -> np.ndarray:
+    """
+    :param rows: None, int, slice, list or np.ndarray
+        Row selection, None selects every row. Negative values count from the end like regular python indexing.
+    :param nrows: int
+        Number of rows in the table.
+    :return: np.ndarray
+        Selected row numbers as int64.
+    """
+    if rows is None:
+        return np.arange(nrows, dtype=np.int64)
+
+    if isinstance(rows, slice):
+        return np.arange(*rows.indices(nrows), dtype=np.int64)
+
+    rows = np.asarray(rows, dtype=np.int64)
+
+    if rows.ndim == 0:
+        rows = rows.reshape(1)
+
+    rows = np.where(rows < 0, rows + nrows, rows)
+
+    if rows.size > 0 and (rows.min() < 0 or rows.max() >= nrows):
+        raise IndexError(f"Row selection out of range for table with {nrows} rows")
+
+    return rows
+
+
+def split_key(key, ndim: Union[int, None]) -> tuple:
+    """
+    Split a numpy style index of a column into its row and cell parts, expanding an Ellipsis into full slices the
+    way numpy does, e.g. [..., 0] selects every row and the first element of the last cell axis.
+
+    :param key: int, slice, list, np.ndarray, Ellipsis or tuple
+        Index, the first entry selects the rows.
+    :param ndim: int
+        Number of cell axes, None when the column has no fixed number of dimensions.
+    :return: tuple
+        Row selection and cell index, None when the cell isn't indexed.
+    """
+    key = key if isinstance(key, tuple) else (key,)
+
+    ellipses = [position for position, entry in enumerate(key) if entry is Ellipsis]
+
+    if len(ellipses) > 1:
+        raise IndexError("An index can only have a single ellipsis ('...')")
+
+    if ellipses:
+        position = ellipses[0]
+        rest = len(key) - 1
+
+        # A trailing ellipsis covers whatever axes are left, the number of cell axes is only needed otherwise.
+        if position == len(key) - 1:
+            key = key[:position]
+
+        elif ndim is None:
+            raise IndexError("Can't expand an ellipsis for a column without a fixed number of dimensions")
+
+        else:
+            if rest > ndim + 1:
+                raise IndexError(f"Too many indices for a column of {ndim + 1} dimensions")
+
+            key = key[:position] + (slice(None),) * (ndim + 1 - rest) + key[position + 1:]
+
+    rows = key[0] if key else slice(None)
+    cell = key[1:]
+
+    # Cell indices that select everything are dropped so that the whole cell path is used.
+    if all(isinstance(entry, slice) and entry == slice(None) for entry in cell):
+        cell = None
+
+    return rows, cell
+
+
+def column_dtype(value_type: str) -> np.dtype:
+    """
+    :param value_type: str
+        casacore value type of a column, e.g. "double" or "string".
+    :return: np.dtype
+        Numpy dtype of the decoded values.
+    """
+    if value_type == "string":
+        return np.dtype(str)
+
+    return np.dtype(types.DATA_TYPE[value_type])
+
+
+def snap_boundaries(boundaries: np.ndarray, nrows: int, target: int) -> np.ndarray:
+    """
+    Pick chunk boundaries out of the natural (bucket or tile) boundaries of a column so that chunks hold about
+    target rows.
+
+    :param boundaries: np.ndarray
+        Sorted first rows of the buckets or tiles.
+    :param nrows: int
+        Number of rows in the table.
+    :param target: int
+        Preferred number of rows per chunk.
+    :return: np.ndarray
+        Chunk boundaries starting with 0 and ending with nrows.
+    """
+    boundaries = np.unique(np.concatenate(([0], boundaries, [nrows])))
+    boundaries = boundaries[boundaries <= nrows]
+
+    targets = np.arange(max(int(target), 1), nrows, max(int(target), 1))
+
+    # Snap every multiple of the target to the nearest natural boundary.
+    after = np.minimum(np.searchsorted(boundaries, targets, side="left"), boundaries.size - 1)
+    before = np.maximum(after - 1, 0)
+    nearest = np.where(targets - boundaries[before] < boundaries[after] - targets, before, after)
+
+    return np.unique(np.concatenate(([0], boundaries[nearest], [nrows])))
+
+
+def rows_to_ranges(rows: np.ndarray) -> tuple:
+    """
+    :param rows: np.ndarray
+        Sorted, unique row numbers.
+    :return: tuple
+        First row and end (exclusive) of each run of consecutive rows.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+
+    if rows.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+
+    return rows[np.concatenate(([0], breaks))], rows[np.concatenate((breaks - 1, [rows.size - 1]))] + 1
+
+
+def ranges_to_rows(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """
+    :param starts: np.ndarray
+        First row of each range.
+    :param stops: np.ndarray
+        End (exclusive) of each range.
+    :return: np.ndarray
+        Row numbers of all ranges, in order.
+    """
+    lengths = np.asarray(stops, dtype=np.int64) - np.asarray(starts, dtype=np.int64)
+    offsets = np.cumsum(lengths) - lengths
+
+    return np.arange(int(lengths.sum()), dtype=np.int64) + np.repeat(starts - offsets, lengths)
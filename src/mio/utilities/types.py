@@ -4,13 +4,21 @@ FOUR_BYTES: int = 4
 EIGHT_BYTES: int = 8
 SIXTEEN_BYTES: int = 16
 
+# Column description option bits
+DIRECT: int = 1
+UNDEFINED: int = 2
+FIXED_SHAPE: int = 4
+
 
 TYPE_TO_BYTES = {
     "bool": ONE_BYTE,
+    "char": ONE_BYTE,
+    "uchar": ONE_BYTE,
     "ushort": TWO_BYTES,
     "short": TWO_BYTES,
     "uint": FOUR_BYTES,
     "int": FOUR_BYTES,
+    "int64": EIGHT_BYTES,
     "float": FOUR_BYTES,
     "double": EIGHT_BYTES,
     "complex": EIGHT_BYTES,
@@ -25,17 +33,25 @@ DATA_TYPE = {
     "float": "f4",
     "int": "i4",
     "uint": "u4",
+    "int64": "i8",
     "short": "i2",
+    "ushort": "u2",
+    "char": "i1",
+    "uchar": "u1",
     "string": "U",
     "bool": "bool",
     "record": "O"
 }
 
 BUFFER_FORMAT = {
-    "int8": "i",
-    "int16": "i",
+    "int8": "b",
+    "int16": "h",
+    "uint8": "B",
+    "uint16": "H",
     "int32": "i",
     "int64": "q",
+    "uint32": "I",
+    "uint64": "Q",
     "float32": "f",
     "float64": "d"
 }
@@ -67,5 +83,9 @@ TYPE_LIST = [
     'arraydcomplex',
     'arraystr',
     'record',
-    'other'
+    'other',
+    'quantity',
+    'arrayquantity',
+    'int64',
+    'arrayint64'
 ]
\ No newline at end of file
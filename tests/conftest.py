@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+from mio.utilities import synthetic
+
+# Rows of the tables written by python-casacore, small buckets and tiles spread them over many of each.
+CASACORE_ROWS: int = 3000
+
+NCHANNELS: int = 16
+NCORRELATIONS: int = 4
+
+
+@pytest.fixture
+def synthetic_ms(tmp_path):
+    """
+    Factory writing synthetic measurement sets into tmp_path, see mio.utilities.synthetic.generate().
+
+    :return: function
+        generate(name="synthetic.ms", **kwargs) returning the table path and its generator.
+    """
+
+    def generate(name: str = "synthetic.ms", **kwargs) -> tuple:
+        path = tmp_path.joinpath(name)
+
+        return path, synthetic.generate(path, **kwargs)
+
+    return generate
+
+
+@pytest.fixture(scope="session", params=["<", ">"], ids=["little", "big"])
+def synthetic_main(request, tmp_path_factory):
+    """
+    Synthetic measurement set shared by the read only tests, in both byte orders.
+
+    :return: tuple
+        Table path and its generator.
+    """
+    path = tmp_path_factory.mktemp("synthetic").joinpath("main.ms")
+    generator = synthetic.generate(
+        path, nrows=5000, nchannels=NCHANNELS, nextra=1, keyword_depth=2, bucket_size=4096, endian=request.param
+    )
+
+    return path, generator
+
+
+def casacore_values(nrows: int, seed: int = 0) -> dict:
+    """
+    :return: dict
+        Values of the columns of the casacore table per column name, cells in numpy order. Indirect columns hold
+        a list of cells.
+    """
+    generator = np.random.default_rng(seed)
+    rows = np.arange(nrows)
+
+    return {
+        "TIME": 4.9e9 + rows // 10 * 1.5,
+        "ANTENNA1": (rows % 10).astype(np.int32),
+        "FLAG_ROW": rows % 13 == 0,
+        "NAME": np.array([f"row_{row % 97}" * (row % 3) for row in rows]),
+        "GAIN": (generator.normal(size=nrows) + 1j * generator.normal(size=nrows)).astype(np.complex64),
+        "UVW": generator.normal(size=(nrows, 3)),
+        "VAR": [np.arange(row % 4 + 1, dtype=np.float64) + row for row in rows],
+        "SCAN_NUMBER": (1 + rows // 700).astype(np.int32),
+        "INTERVAL": 1.0 + (rows // 7) % 3,
+        "STATE": np.array([f"state_{row // 500}" for row in rows]),
+        "DATA": (
+            generator.normal(size=(nrows, NCHANNELS, NCORRELATIONS))
+            + 1j * generator.normal(size=(nrows, NCHANNELS, NCORRELATIONS))
+        ).astype(np.complex64),
+        "FLAG": generator.random((nrows, NCHANNELS, NCORRELATIONS)) < 0.2,
+        "WEIGHT_SPECTRUM": generator.random((nrows, NCHANNELS, NCORRELATIONS)).astype(np.float32),
+    }
+
+
+def write_casacore_table(path, nrows: int = CASACORE_ROWS, endian: str = "little"):
+    """
+    Write a table with python-casacore holding columns of every data manager mio reads: StandardStMan (scalars,
+    strings, fixed and variable shape arrays), IncrementalStMan and the TiledShapeStMan and TiledColumnStMan.
+    """
+    tables = pytest.importorskip("casacore.tables")
+
+    shape = [NCHANNELS, NCORRELATIONS]
+
+    description = tables.maketabdesc([
+        tables.makescacoldesc("TIME", 0.0),
+        tables.makescacoldesc("ANTENNA1", 0),
+        tables.makescacoldesc("FLAG_ROW", False),
+        tables.makescacoldesc("NAME", ""),
+        tables.makescacoldesc("GAIN", 0j, valuetype="complex"),
+        tables.makearrcoldesc("UVW", 0.0, shape=[3]),
+        tables.makearrcoldesc("VAR", 0.0, ndim=1),
+        tables.makescacoldesc("SCAN_NUMBER", 0),
+        tables.makescacoldesc("INTERVAL", 0.0),
+        tables.makescacoldesc("STATE", ""),
+        tables.makearrcoldesc("DATA", 0j, valuetype="complex", shape=shape),
+        tables.makearrcoldesc("FLAG", False, shape=shape),
+        tables.makearrcoldesc("WEIGHT_SPECTRUM", 0.0, valuetype="float", shape=shape),
+    ])
+
+    dminfo = {
+        "*1": {
+            "TYPE": "StandardStMan", "NAME": "SSM", "SPEC": {"BUCKETSIZE": 2048},
+            "COLUMNS": ["TIME", "ANTENNA1", "FLAG_ROW", "NAME", "GAIN", "UVW", "VAR"],
+        },
+        "*2": {
+            "TYPE": "IncrementalStMan", "NAME": "ISM", "SPEC": {"BUCKETSIZE": 1024},
+            "COLUMNS": ["SCAN_NUMBER", "INTERVAL", "STATE"],
+        },
+        "*3": {
+            "TYPE": "TiledShapeStMan", "NAME": "TiledData",
+            "SPEC": {"DEFAULTTILESHAPE": np.array([NCORRELATIONS, 8, 64], dtype=np.int32)},
+            "COLUMNS": ["DATA", "FLAG"],
+        },
+        "*4": {
+            "TYPE": "TiledColumnStMan", "NAME": "TiledWeight",
+            "SPEC": {"DEFAULTTILESHAPE": np.array([NCORRELATIONS, 8, 128], dtype=np.int32)},
+            "COLUMNS": ["WEIGHT_SPECTRUM"],
+        },
+    }
+
+    values = casacore_values(nrows)
+
+    table = tables.table(str(path), description, nrow=nrows, dminfo=dminfo, endian=endian, ack=False)
+
+    for name, column in values.items():
+        if isinstance(column, list):
+            for row, cell in enumerate(column):
+                table.putcell(name, row, cell)
+
+        else:
+            table.putcol(name, column)
+
+    table.close()
+
+    return values
+
+
+@pytest.fixture(scope="session", params=["little", "big"])
+def casacore_main(request, tmp_path_factory):
+    """
+    Table written by python-casacore, see write_casacore_table(), in both byte orders.
+
+    :return: str
+        Table path.
+    """
+    path = tmp_path_factory.mktemp("casacore").joinpath(f"{request.param}.tab")
+    write_casacore_table(path, endian=request.param)
+
+    return str(path)
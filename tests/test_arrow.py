@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import arrow
+
+pa = pytest.importorskip("pyarrow")
+tables = pytest.importorskip("casacore.tables")
+
+
+def nested(value_type, *lengths):
+    for length in lengths[::-1]:
+        value_type = pa.list_(value_type, length)
+
+    return value_type
+
+
+# Arrow type and field metadata of each readable column of the casacore table.
+SCHEMA = {
+    "TIME": (pa.float64(), None),
+    "ANTENNA1": (pa.int32(), None),
+    "FLAG_ROW": (pa.bool_(), None),
+    "NAME": (pa.string(), None),
+    "GAIN": (nested(pa.float32(), 2), {b"complex": b"true"}),
+    "UVW": (nested(pa.float64(), 3), {b"shape": b"3"}),
+    "SCAN_NUMBER": (pa.int32(), None),
+    "INTERVAL": (pa.float64(), None),
+    "STATE": (pa.string(), None),
+    "DATA": (nested(pa.float32(), 16, 4, 2), {b"shape": b"16,4", b"complex": b"true"}),
+    "FLAG": (nested(pa.bool_(), 16, 4), {b"shape": b"16,4"}),
+    "WEIGHT_SPECTRUM": (nested(pa.float32(), 16, 4), {b"shape": b"16,4"}),
+}
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main):
+    table = reader.open(casacore_main)
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+def to_numpy(array: pa.Array, field: pa.Field) -> np.ndarray:
+    """
+    Rebuild the numpy values of an exported column from the field metadata.
+    """
+    if pa.types.is_string(array.type):
+        return np.asarray(array.to_pylist())
+
+    metadata = field.metadata or {}
+
+    shape = tuple(int(length) for length in metadata[b"shape"].split(b",")) if b"shape" in metadata else ()
+    complex_values = metadata.get(b"complex") == b"true"
+
+    values = array.flatten() if shape or complex_values else array
+
+    for _ in range(len(shape) + complex_values - 1):
+        values = values.flatten()
+
+    values = values.to_numpy(zero_copy_only=False)
+
+    if complex_values:
+        return values.view(np.complex64 if values.dtype == np.float32 else np.complex128).reshape((len(array),) + shape)
+
+    return values.reshape((len(array),) + shape)
+
+
+def test_schema(tables_pair):
+    table, _ = tables_pair
+
+    batch = next(table.iter_record_batches(batch_rows=10))
+
+    # Variable shape columns aren't exported.
+    assert batch.schema.names == list(SCHEMA)
+
+    for field in batch.schema:
+        value_type, metadata = SCHEMA[field.name]
+
+        assert field.type == value_type, field.name
+        assert field.metadata == metadata, field.name
+        assert not field.nullable
+
+
+@pytest.mark.parametrize("batch_rows", [700, 3000, 4096])
+def test_batches_match_casacore(tables_pair, batch_rows):
+    table, reference = tables_pair
+
+    batches = list(table.iter_record_batches(batch_rows=batch_rows))
+
+    sizes = [batch_rows] * (3000 // batch_rows) + ([3000 % batch_rows] if 3000 % batch_rows else [])
+    assert [batch.num_rows for batch in batches] == sizes
+    assert all(batch.schema == batches[0].schema for batch in batches)
+
+    exported = pa.Table.from_batches(batches).combine_chunks()
+
+    for field in exported.schema:
+        values = to_numpy(exported.column(field.name).chunk(0), field)
+
+        np.testing.assert_array_equal(values, np.asarray(reference.getcol(field.name)), err_msg=field.name)
+
+
+def test_selected_columns(tables_pair):
+    table, reference = tables_pair
+
+    batch = next(table.iter_record_batches(columns=["FLAG", "TIME"], batch_rows=1001))
+
+    assert batch.schema.names == ["FLAG", "TIME"]
+
+    # Boolean batches starting at a row that isn't a multiple of 8 are packed into a bitmap of their own.
+    batch = list(table.iter_record_batches(columns=["FLAG_ROW"], batch_rows=1001))[1]
+
+    np.testing.assert_array_equal(
+        batch.column(0).to_numpy(zero_copy_only=False), reference.getcol("FLAG_ROW", startrow=1001, nrow=1001)
+    )
+
+
+def test_numeric_buffers_are_not_copied():
+    values = np.arange(24, dtype=np.float64).reshape(4, 3, 2)
+
+    array = arrow.to_arrow(values)
+
+    assert array.type == nested(pa.float64(), 3, 2)
+    assert array.flatten().flatten().buffers()[1].address == values.ctypes.data
+
+
+def test_string_arrays_raise():
+    with pytest.raises(NotImplementedError):
+        arrow.to_arrow(np.array([["a", "b"], ["c", "d"]]))
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import averaging
+from mio.utilities import synthetic
+
+from conftest import CASACORE_ROWS, casacore_values
+
+# 25 integrations of the 45 baselines of 10 antennas, 10 integrations per scan.
+NROWS: int = 1125
+NCHANNELS: int = 10
+
+KEY_COLUMNS = ["ANTENNA1", "ANTENNA2", "DATA_DESC_ID", "FIELD_ID", "SCAN_NUMBER"]
+
+
+@pytest.fixture(scope="module")
+def averaged_ms(tmp_path_factory):
+    path = tmp_path_factory.mktemp("averaging").joinpath("averaging.ms")
+    generator = synthetic.generate(path, nrows=NROWS, nchannels=NCHANNELS, bucket_size=1024, tile_shape=(4, 4, 64))
+
+    return path, generator
+
+
+def reference(generator, channels: int, time_bin: float, decimate: bool) -> tuple:
+    """
+    Row by row average of the synthetic DATA column, unweighted as the table has no WEIGHT column.
+    """
+    rows = np.arange(generator.nrows)
+
+    time = generator.values("TIME", rows)
+    keys = np.stack([generator.values(name, rows) for name in KEY_COLUMNS], axis=1)
+
+    data = generator.values("DATA", rows)
+    valid = ~generator.values("FLAG", rows) & ~generator.values("FLAG_ROW", rows)[:, None, None]
+
+    groups = {}
+
+    for row in rows:
+        time_key = row if time_bin is None else int(np.floor((time[row] - time.min()) / time_bin))
+        groups.setdefault((time_key,) + tuple(keys[row]), []).append(row)
+
+    first_rows = np.array([members[0] for members in groups.values()])
+    nbins = -(-NCHANNELS // channels)
+
+    values = np.zeros((len(groups), nbins, generator.ncorrelations), dtype=np.complex128)
+    weights = np.zeros(values.shape)
+
+    for output, members in enumerate(groups.values()):
+        for number in range(nbins):
+            if decimate:
+                values[output, number] = data[members[0], number * channels]
+                weights[output, number] = valid[members[0], number * channels]
+                continue
+
+            window = slice(number * channels, (number + 1) * channels)
+            weight = valid[members, window].sum(axis=(0, 1))
+
+            weights[output, number] = weight
+            values[output, number] = np.where(
+                weight > 0, (data[members, window] * valid[members, window]).sum(axis=(0, 1)) / np.maximum(weight, 1), 0
+            )
+
+    return values, weights, first_rows
+
+
+@pytest.mark.parametrize("channels, time_bin, decimate", [
+    (1, None, False),
+    (4, None, False),
+    (3, 3.0, False),
+    (NCHANNELS, 25.0, False),
+    (4, 3.0, True),
+])
+def test_average_matches_reference(averaged_ms, channels, time_bin, decimate):
+    path, generator = averaged_ms
+
+    with reader.open(path) as table:
+        averaged = table.average("DATA", channels=channels, time_bin=time_bin, decimate=decimate)
+
+    values, weights, first_rows = reference(generator, channels, time_bin, decimate)
+
+    np.testing.assert_array_equal(averaged.rows, first_rows)
+    np.testing.assert_allclose(averaged.weights, weights)
+    np.testing.assert_array_equal(averaged.flags, weights <= 0)
+    np.testing.assert_allclose(averaged.values, values, rtol=1e-6, atol=1e-4)
+
+    assert averaged.values.dtype == np.complex64
+
+
+def test_bins_continue_over_blocks(averaged_ms):
+    path, generator = averaged_ms
+
+    with reader.open(path) as table:
+        whole = averaging.average(table.measurement_set, "DATA", channels=3, time_bin=3.0)
+        blocks = averaging.average(table.measurement_set, "DATA", channels=3, time_bin=3.0, block_bytes=1000)
+
+    np.testing.assert_array_equal(blocks.rows, whole.rows)
+    np.testing.assert_allclose(blocks.values, whole.values, rtol=1e-6)
+    np.testing.assert_array_equal(blocks.weights, whole.weights)
+
+
+@pytest.mark.parametrize("name, channels", [("DATA", 0), ("TIME", 2), ("FLAG_ROW", 1)])
+def test_invalid_averages_raise(averaged_ms, name, channels):
+    path, _ = averaged_ms
+
+    with reader.open(path) as table, pytest.raises(ValueError):
+        table.average(name, channels=channels)
+
+
+def test_weighted_channel_average(casacore_main):
+    values = casacore_values(CASACORE_ROWS)
+
+    with reader.open(casacore_main) as table:
+        averaged = table.average("DATA", channels=4, weight="WEIGHT_SPECTRUM")
+
+    valid = ~values["FLAG"] & ~values["FLAG_ROW"][:, None, None]
+    weights = np.where(valid, values["WEIGHT_SPECTRUM"], 0).astype(np.float64)
+
+    shape = (CASACORE_ROWS, -1, 4) + values["DATA"].shape[2:]
+    sums = (values["DATA"] * weights).reshape(shape).sum(axis=2)
+    weights = weights.reshape(shape).sum(axis=2)
+
+    np.testing.assert_allclose(averaged.weights, weights, rtol=1e-6)
+    np.testing.assert_allclose(averaged.values, np.where(weights > 0, sums / np.maximum(weights, 1e-30), 0), rtol=1e-5)
@@ -0,0 +1,172 @@
+import os
+
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.utilities import synthetic
+
+pytest.importorskip("pytest_benchmark")
+
+# Size of the benchmark table, large enough for the reads to dominate the per call overhead. $MIO_BENCHMARK_ROWS
+# (e.g. 5000000) runs the benchmarks on a larger table.
+BENCHMARK_ROWS: int = int(os.environ.get("MIO_BENCHMARK_ROWS", 100000))
+BENCHMARK_CHANNELS: int = 16
+
+RANDOM_ROWS: int = 1000
+
+# Rows read one by one with getcell() by the python-casacore comparisons.
+CASACORE_RANDOM_ROWS: int = 10000
+
+
+@pytest.fixture(scope="module")
+def benchmark_ms(tmp_path_factory):
+    path = tmp_path_factory.mktemp("benchmark").joinpath("benchmark.ms")
+    generator = synthetic.generate(path, nrows=BENCHMARK_ROWS, nchannels=BENCHMARK_CHANNELS, nextra=4)
+
+    return path, generator
+
+
+@pytest.fixture(scope="module")
+def benchmark_table(benchmark_ms):
+    path, _ = benchmark_ms
+
+    with reader.open(path) as table:
+        yield table
+
+
+@pytest.fixture(scope="module")
+def casacore_table(benchmark_ms):
+    tables = pytest.importorskip("casacore.tables")
+    path, _ = benchmark_ms
+
+    table = tables.table(str(path), ack=False)
+
+    yield table
+
+    table.close()
+
+
+def test_open(benchmark, benchmark_ms):
+    path, generator = benchmark_ms
+
+    def open_table():
+        table = reader.open(path)
+        table.close()
+
+        return table
+
+    benchmark.group = "open"
+    table = benchmark(open_table)
+
+    assert table.nrows == generator.nrows
+
+
+@pytest.mark.parametrize("name", ["TIME", "ANTENNA1", "UVW", "SCAN_NUMBER", "DATA", "FLAG"])
+def test_column_throughput(benchmark, benchmark_table, benchmark_ms, name):
+    _, generator = benchmark_ms
+
+    benchmark.group = "column"
+    values = benchmark(lambda: benchmark_table[name][:])
+
+    benchmark.extra_info["bytes"] = int(values.nbytes)
+    np.testing.assert_array_equal(values[:100], generator.values(name, np.arange(100)))
+
+
+@pytest.mark.parametrize("name", ["TIME", "UVW", "SCAN_NUMBER", "DATA"])
+def test_random_rows(benchmark, benchmark_table, benchmark_ms, name):
+    _, generator = benchmark_ms
+    rows = np.sort(np.random.default_rng(0).integers(0, generator.nrows, RANDOM_ROWS))
+
+    benchmark.group = "random rows"
+    values = benchmark(lambda: benchmark_table[name][rows])
+
+    np.testing.assert_array_equal(values, generator.values(name, rows))
+
+
+@pytest.mark.parametrize("name", ["DATA", "FLAG"])
+def test_channel_window(benchmark, benchmark_table, benchmark_ms, name):
+    _, generator = benchmark_ms
+    rows = slice(0, generator.nrows // 4)
+
+    benchmark.group = "channel window"
+    values = benchmark(lambda: benchmark_table[name][rows, 4:8])
+
+    assert values.shape == (generator.nrows // 4, 4, generator.ncorrelations)
+
+
+@pytest.mark.parametrize("library", ["mio", "casacore"])
+@pytest.mark.parametrize("name", ["TIME", "ANTENNA1", "UVW"])
+def test_standard_column_against_casacore(benchmark, benchmark_table, casacore_table, name, library):
+    """
+    Full StandardStMan column reads, Table[name][:] against getcol().
+    """
+    read = {
+        "mio": lambda: benchmark_table[name][:],
+        "casacore": lambda: casacore_table.getcol(name),
+    }[library]
+
+    benchmark.group = f"standard column {name}"
+    values = benchmark(read)
+
+    np.testing.assert_array_equal(values, benchmark_table[name][:])
+
+
+@pytest.mark.parametrize("library", ["mio", "casacore"])
+def test_standard_random_rows_against_casacore(benchmark, benchmark_table, casacore_table, benchmark_ms, library):
+    """
+    Random rows of a StandardStMan column, one read of all rows against a getcell() loop.
+    """
+    _, generator = benchmark_ms
+    rows = np.random.default_rng(0).integers(0, generator.nrows, CASACORE_RANDOM_ROWS)
+
+    read = {
+        "mio": lambda: benchmark_table["TIME"][rows],
+        "casacore": lambda: np.array([casacore_table.getcell("TIME", int(row)) for row in rows]),
+    }[library]
+
+    benchmark.group = "standard random rows"
+    values = benchmark(read)
+
+    np.testing.assert_array_equal(values, generator.values("TIME", rows))
+
+
+@pytest.fixture(scope="module")
+def indirect_table(tmp_path_factory):
+    """
+    StandardStMan table written by python-casacore with a variable shape dcomplex column, the cells are stored in
+    the table.f0i array file.
+    """
+    tables = pytest.importorskip("casacore.tables")
+    path = tmp_path_factory.mktemp("benchmark").joinpath("indirect.tab")
+
+    description = tables.maketabdesc([tables.makearrcoldesc("VAR", 0j, ndim=2, valuetype="dcomplex")])
+    table = tables.table(str(path), description, nrow=BENCHMARK_ROWS, ack=False)
+
+    for row in range(BENCHMARK_ROWS):
+        table.putcell("VAR", row, np.full((4 * (row % 4 + 1), 4), row + 1j, dtype=np.complex128))
+
+    table.close()
+    table = tables.table(str(path), ack=False)
+
+    yield table
+
+    table.close()
+
+
+@pytest.mark.parametrize("library", ["mio", "casacore"])
+def test_indirect_cells_against_casacore(benchmark, indirect_table, library):
+    """
+    All cells of a variable shape column, Column.cells() against a getcell() loop.
+    """
+    with reader.open(indirect_table.name()) as table:
+        read = {
+            "mio": lambda: table["VAR"].cells(),
+            "casacore": lambda: [indirect_table.getcell("VAR", row) for row in range(BENCHMARK_ROWS)],
+        }[library]
+
+        benchmark.group = "indirect cells"
+        cells = benchmark(read)
+
+    assert len(cells) == BENCHMARK_ROWS
+    np.testing.assert_array_equal(cells[BENCHMARK_ROWS - 1], indirect_table.getcell("VAR", BENCHMARK_ROWS - 1))
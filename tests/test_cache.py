@@ -0,0 +1,144 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import cache
+from mio.core import stats
+
+tables = pytest.importorskip("casacore.tables")
+
+
+@pytest.fixture
+def table_path(casacore_main, tmp_path):
+    path = tmp_path.joinpath("table.tab")
+    shutil.copytree(casacore_main, path)
+
+    return path
+
+
+def open_table(path, directory) -> tuple:
+    """
+    :return: tuple
+        Opened table and the bytes of table.dat read while opening it, none when it was loaded from the cache.
+    """
+    io_stats = stats.IOStats()
+    table = reader.open(path, cache=directory, stats=io_stats)
+
+    return table, io_stats.bytes
+
+
+def entries(directory) -> list:
+    return sorted(directory.glob("*.mio"))
+
+
+def test_unchanged_table_is_loaded_from_the_cache(table_path, tmp_path):
+    directory = tmp_path.joinpath("cache")
+
+    table, nbytes = open_table(table_path, directory)
+    expected = {name: table[name][:] for name in ["TIME", "STATE", "DATA"]}
+    table.close()
+
+    assert nbytes > 0
+    assert entries(directory) == [cache.entry(directory, table_path.joinpath("table.dat"))]
+
+    with tables.table(str(table_path), ack=False) as reference:
+        for name, values in expected.items():
+            np.testing.assert_array_equal(values, np.asarray(reference.getcol(name)))
+
+    table, nbytes = open_table(table_path, directory)
+
+    with table:
+        assert nbytes == 0
+        assert table.nrows == 3000
+        assert table["VAR"].manager.columns["VAR"].ndims == 1
+
+        for name, values in expected.items():
+            np.testing.assert_array_equal(table[name][:], values)
+
+
+def test_appended_rows_are_picked_up_from_a_cached_table(table_path, tmp_path):
+    directory = tmp_path.joinpath("cache")
+
+    open_table(table_path, directory)[0].close()
+
+    # casacore keeps the number of rows of the appended table in table.lock and leaves table.dat as it was.
+    with tables.table(str(table_path), readonly=False, ack=False) as reference:
+        reference.addrows(5)
+        reference.putcol("SCAN_NUMBER", np.full(5, 42, dtype=np.int32), startrow=3000)
+
+    table, nbytes = open_table(table_path, directory)
+
+    with table:
+        assert nbytes == 0
+        assert table.nrows == 3005
+        np.testing.assert_array_equal(table["SCAN_NUMBER"][2999:], [5, 42, 42, 42, 42, 42])
+
+
+def test_rewritten_table_is_parsed_again(table_path, tmp_path):
+    directory = tmp_path.joinpath("cache")
+
+    open_table(table_path, directory)[0].close()
+
+    with tables.table(str(table_path), readonly=False, ack=False) as reference:
+        reference.putkeyword("CALIBRATED", True)
+
+    table, nbytes = open_table(table_path, directory)
+
+    with table:
+        assert nbytes > 0
+        assert table.keywords["CALIBRATED"] is True
+
+    # The stale entry was overwritten, the next open hits the cache again.
+    assert len(entries(directory)) == 1
+
+    table, nbytes = open_table(table_path, directory)
+
+    with table:
+        assert nbytes == 0
+        assert table.keywords["CALIBRATED"] is True
+
+
+def test_modification_time_invalidates_the_entry(table_path, tmp_path):
+    directory = tmp_path.joinpath("cache")
+    filename = table_path.joinpath("table.dat")
+
+    open_table(table_path, directory)[0].close()
+
+    status = os.stat(filename)
+    os.utime(filename, ns=(status.st_atime_ns, status.st_mtime_ns + 10 ** 9))
+
+    assert cache.load(directory, filename) is None
+
+    table, nbytes = open_table(table_path, directory)
+    table.close()
+
+    assert nbytes > 0
+    assert cache.load(directory, filename) is not None
+
+
+def test_cache_version_invalidates_the_entry(table_path, tmp_path, monkeypatch):
+    directory = tmp_path.joinpath("cache")
+
+    open_table(table_path, directory)[0].close()
+
+    monkeypatch.setattr(cache, "CACHE_VERSION", cache.CACHE_VERSION + 1)
+
+    assert cache.load(directory, table_path.joinpath("table.dat")) is None
+
+
+def test_unreadable_entry_is_ignored(table_path, tmp_path):
+    directory = tmp_path.joinpath("cache")
+    directory.mkdir()
+
+    cache.entry(directory, table_path.joinpath("table.dat")).write_bytes(b"not a pickle")
+
+    table, nbytes = open_table(table_path, directory)
+
+    with table:
+        assert nbytes > 0
+        assert table.nrows == 3000
+
+    assert open_table(table_path, directory)[1] == 0
@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+
+from mio import catalog
+from mio import reader
+
+tables = pytest.importorskip("casacore.tables")
+
+
+def add_rows(path, nrows: int):
+    table = tables.table(str(path), readonly=False, ack=False)
+    table.addrows(nrows)
+    table.close()
+
+
+@pytest.fixture
+def measurement_set(tmp_path):
+    path = tmp_path.joinpath("tables", "observation.ms")
+    path.parent.mkdir()
+
+    tables.default_ms(str(path)).close()
+    add_rows(path.joinpath("ANTENNA"), 7)
+
+    return path
+
+
+def entry(result, path) -> dict:
+    return {row["path"]: row for row in result.to_pylist()}[str(path.resolve())]
+
+
+def test_subtable_rows_follow_appended_rows(measurement_set, tmp_path):
+    result = catalog.scan(tmp_path.joinpath("tables"), output=tmp_path.joinpath("catalog.parquet"), workers=1)
+    described = entry(result, measurement_set)
+
+    assert described["error"] is None
+
+    rows = dict(zip(described["subtables"], described["subtable_rows"]))
+
+    assert rows["ANTENNA"] == 7
+    assert rows["ANTENNA"] == reader.open(measurement_set.joinpath("ANTENNA")).nrows
+
+
+def test_modified_subtable_invalidates_the_entry(measurement_set, tmp_path):
+    output = tmp_path.joinpath("catalog.parquet")
+
+    first = entry(catalog.scan(tmp_path.joinpath("tables"), output=output, workers=1), measurement_set)
+
+    # Make sure the modification time moves on filesystems with coarse timestamps.
+    time.sleep(0.01)
+    add_rows(measurement_set.joinpath("ANTENNA"), 5)
+
+    second = entry(catalog.scan(tmp_path.joinpath("tables"), output=output, workers=1), measurement_set)
+
+    assert second["mtime_ns"] > first["mtime_ns"]
+    assert dict(zip(second["subtables"], second["subtable_rows"]))["ANTENNA"] == 12
+    assert second["size_bytes"] >= first["size_bytes"]
+
+
+def test_unchanged_tables_are_kept(measurement_set, tmp_path):
+    output = tmp_path.joinpath("catalog.parquet")
+
+    first = entry(catalog.scan(tmp_path.joinpath("tables"), output=output, workers=1), measurement_set)
+    second = entry(catalog.scan(tmp_path.joinpath("tables"), output=output, workers=1), measurement_set)
+
+    assert first == second
+
+
+def test_modification_time_includes_subtables(measurement_set):
+    before = catalog.modification_time(measurement_set)
+
+    # A write to a subtable file only, the main table files stay untouched.
+    later = before + 10 ** 9
+    os.utime(measurement_set.joinpath("ANTENNA", "table.f0"), ns=(later, later))
+
+    assert catalog.modification_time(measurement_set) == later
+
+
+def test_aipsio_tables_are_described(tmp_path):
+    path = tmp_path.joinpath("tables", "aipsio.tab")
+    path.parent.mkdir()
+
+    description = tables.maketabdesc([
+        tables.makescacoldesc("TIME", 0.0),
+        tables.makearrcoldesc("DATA", 0j, valuetype="complex", shape=[4, 2]),
+    ])
+    dminfo = {"*1": {"TYPE": "StManAipsIO", "NAME": "AipsIO", "SPEC": {}, "COLUMNS": ["TIME", "DATA"]}}
+
+    tables.table(str(path), description, nrow=10, dminfo=dminfo, ack=False).close()
+
+    described = entry(catalog.scan(tmp_path.joinpath("tables"), output=tmp_path.joinpath("catalog.parquet"), workers=1),
+                      path)
+
+    assert described["error"] is None
+    assert described["nrows"] == 10
+    assert described["columns"] == ["TIME", "DATA"]
+    assert described["value_types"] == ["double", "complex"]
+    assert described["shapes"] == [[], [4, 2]]
+    assert described["managers"] == ["AipsIOStorageManager"] * 2
+
+    # Data reads fail loudly instead.
+    with reader.open(path) as table, pytest.raises(NotImplementedError):
+        table["TIME"][:]
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import chunks
+
+tables = pytest.importorskip("casacore.tables")
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main):
+    table = reader.open(casacore_main)
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+def runs(values) -> list:
+    """
+    :return: list
+        (start, stop) of each run of equal consecutive values.
+    """
+    values = np.asarray(values)
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+
+    return [(int(start), int(stop)) for start, stop in zip(starts, np.append(starts[1:], values.size))]
+
+
+@pytest.mark.parametrize("by", ["TIME", "SCAN_NUMBER", "STATE", "INTERVAL", "ANTENNA1"])
+def test_chunks_are_the_runs_of_casacore_values(tables_pair, by):
+    table, reference = tables_pair
+
+    expected = runs(reference.getcol(by))
+    result = list(table.iter_chunks(by=by, columns=[by, "FLAG"]))
+
+    assert [(rows.start, rows.stop) for rows, _ in result] == expected
+
+    for rows, values in result:
+        assert list(values) == [by, "FLAG"]
+
+        np.testing.assert_array_equal(values[by], np.asarray(reference.getcol(by, rows.start, rows.stop - rows.start)))
+        np.testing.assert_array_equal(values["FLAG"], reference.getcol("FLAG", rows.start, rows.stop - rows.start))
+
+
+@pytest.mark.parametrize("block_rows", [1, 7, 10, 64, 700, 2999, 3000, 10 ** 6])
+@pytest.mark.parametrize("by", ["TIME", "SCAN_NUMBER", "STATE"])
+def test_groups_continue_across_blocks(tables_pair, by, block_rows):
+    table, reference = tables_pair
+
+    # TIME changes every 10 rows, blocks of 10 rows start on a new group and others in the middle of one.
+    ranges = list(chunks.group_ranges(table.measurement_set, by, block_rows=block_rows))
+
+    assert ranges == runs(reference.getcol(by))
+
+
+def test_large_groups_are_split(tables_pair):
+    table, reference = tables_pair
+
+    # 150 rows of DATA (16 x 4 complex64), scans hold 700 rows.
+    result = list(table.iter_chunks(by="SCAN_NUMBER", columns=["DATA"], max_bytes=150 * 512))
+    scans = reference.getcol("SCAN_NUMBER")
+
+    assert [rows.stop - rows.start for rows, _ in result[:5]] == [150, 150, 150, 150, 100]
+    assert result[0][0].start == 0 and result[-1][0].stop == 3000
+    assert all(previous.stop == rows.start for (previous, _), (rows, _) in zip(result[:-1], result[1:]))
+
+    # Scan numbers increase, a chunk whose first and last rows are in the same scan doesn't cross a boundary.
+    assert all(scans[rows.start] == scans[rows.stop - 1] for rows, _ in result)
+
+    np.testing.assert_array_equal(np.concatenate([values["DATA"] for _, values in result]), reference.getcol("DATA"))
+
+
+def test_chunks_by_size(tables_pair):
+    table, _ = tables_pair
+
+    result = [rows for rows, _ in table.iter_chunks(by=None, columns=["DATA", "TIME"], max_bytes=1000 * 520)]
+
+    assert [(rows.start, rows.stop) for rows in result] == [(0, 1000), (1000, 2000), (2000, 3000)]
+
+
+def test_stopping_early(tables_pair):
+    table, reference = tables_pair
+
+    for number, (rows, values) in enumerate(table.iter_chunks(by="TIME", columns=["TIME"])):
+        if number == 3:
+            break
+
+    assert (rows.start, rows.stop) == (30, 40)
+    np.testing.assert_array_equal(values["TIME"], reference.getcol("TIME", 30, 10))
+
+
+def test_array_columns_raise(tables_pair):
+    table, _ = tables_pair
+
+    with pytest.raises(ValueError):
+        list(table.iter_chunks(by="UVW", columns=["TIME"]))
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import zarr
+
+from mio import convert
+
+tables = pytest.importorskip("casacore.tables")
+
+# Holds 300 rows of the largest (DATA) column twice, the casacore table is converted in 10 chunks.
+BUDGET = 2 * 300 * 512
+
+
+def cells(group: zarr.Group, name: str) -> dict:
+    """
+    :return: dict
+        Cell of each row of a variable shape column written per cell shape.
+    """
+    values = {}
+
+    for _, shape_group in group[name].groups():
+        for row, cell in zip(shape_group["rows"][:], shape_group["values"][:]):
+            assert row not in values
+            values[int(row)] = cell
+
+    return values
+
+
+@pytest.fixture(scope="module")
+def reference(casacore_main):
+    table = tables.table(casacore_main, ack=False)
+
+    yield table
+
+    table.close()
+
+
+def test_convert_matches_casacore(casacore_main, reference, tmp_path):
+    root = convert.convert(casacore_main, tmp_path.joinpath("table.zarr"), memory_budget=BUDGET, subtables=False)
+
+    assert root.attrs["mio"]["chunk_rows"] == 300
+    assert root.attrs["mio"]["completed"] == 10
+    assert root.attrs["mio"]["variable_columns"] == ["VAR"]
+
+    for name in root.attrs["mio"]["columns"]:
+        np.testing.assert_array_equal(root[name][:], np.asarray(reference.getcol(name)))
+
+    values = cells(root, "VAR")
+
+    assert sorted(values) == list(range(reference.nrows()))
+    assert sorted(key for key, _ in root["VAR"].groups()) == ["1", "2", "3", "4"]
+
+    for row, cell in values.items():
+        np.testing.assert_array_equal(cell, reference.getcell("VAR", row))
+
+
+def test_resume_rewrites_cells_of_unfinished_chunks(casacore_main, reference, tmp_path):
+    store = tmp_path.joinpath("table.zarr")
+    root = convert.convert(casacore_main, store, memory_budget=BUDGET, subtables=False)
+
+    # Interrupted while writing the fourth chunk, whose cells were written already.
+    root.attrs["mio"] = {**root.attrs["mio"], "completed": 3}
+    root = convert.convert(casacore_main, store, memory_budget=BUDGET, subtables=False)
+
+    assert root.attrs["mio"]["completed"] == 10
+
+    values = cells(root, "VAR")
+
+    assert sorted(values) == list(range(reference.nrows()))
+
+    for row in [0, 899, 900, 1234, 2999]:
+        np.testing.assert_array_equal(values[row], reference.getcell("VAR", row))
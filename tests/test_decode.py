@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from mio.core import decode
+
+
+def length_prefixed(*values: bytes) -> np.ndarray:
+    return np.frombuffer(b"".join(len(value).to_bytes(4, "little") + value for value in values), dtype=np.uint8)
+
+
+def test_strings():
+    values, end = decode.strings(length_prefixed(b"TIME", b"", b"ANTENNA1"), 0, 3)
+
+    assert values.tolist() == ["TIME", "", "ANTENNA1"]
+    assert end == 24
+
+
+@pytest.mark.parametrize("size", [2, 6, 10, 23])
+def test_truncated_strings_raise(size):
+    data = length_prefixed(b"TIME", b"", b"ANTENNA1")[:size]
+
+    with pytest.raises(ValueError):
+        decode.strings(data, 0, 3)
+
+
+def test_gather_past_the_end_raises():
+    data = np.frombuffer(b"abcdef", dtype=np.uint8)
+
+    with pytest.raises(ValueError):
+        decode.gather_str(data, np.array([4], dtype=np.int64), np.array([4], dtype=np.int64))
+
+
+@pytest.mark.parametrize("out_size", [decode.KERNEL_THRESHOLD, decode.MEMMOVE_THRESHOLD])
+def test_copy_out_of_bounds_raises(out_size):
+    data = np.arange(100, dtype=np.uint8)
+    out = np.empty(out_size, dtype=np.uint8)
+
+    for starts, nbytes, destinations in [([90], [20], [0]), ([-1], [4], [0]), ([0], [4], [out_size - 2])]:
+        with pytest.raises(ValueError):
+            decode.copy(data, np.array(starts), np.array(nbytes), np.array(destinations), out)
+
+
+def test_copy():
+    data = np.arange(100, dtype=np.uint8)
+    out = np.zeros(8, dtype=np.uint8)
+
+    decode.copy(data, np.array([10, 50]), np.array([3, 5]), np.array([0, 3]), out)
+
+    np.testing.assert_array_equal(out, [10, 11, 12, 50, 51, 52, 53, 54])
+
+
+def test_truncated_cell_headers_raise():
+    # Two dimensional cell of shape (3, 4) of which the second axis is cut off.
+    data = np.array([2, 3, 4], dtype="<i4").view(np.uint8)[:10]
+
+    with pytest.raises(ValueError):
+        decode.cell_headers(data, np.array([0], dtype=np.int64), 4, False)
+
+    with pytest.raises(ValueError):
+        decode.cell_headers(data, np.array([8], dtype=np.int64), 4, False)
+
+
+def test_bits_past_the_end_raise():
+    packed = np.array([0b10110001, 0xFF], dtype=np.uint8)
+
+    np.testing.assert_array_equal(decode.bits(packed, 4, first_bit=4), [True, True, False, True])
+
+    with pytest.raises(ValueError):
+        decode.bits(packed, 10, first_bit=8)
+
+    with pytest.raises(ValueError):
+        decode.take_bits(packed, np.array([3, 16], dtype=np.int64), np.empty(2, dtype=np.uint8))
+
+    with pytest.raises(ValueError):
+        decode.unpack_bit_rows(packed, np.array([0, 12], dtype=np.int64), np.empty(16, dtype=np.uint8))
+
+    with pytest.raises(ValueError):
+        decode.copy_bit_rows(packed, np.array([0, 12], dtype=np.int64), 8, np.zeros(2, dtype=np.uint8))
+
+    with pytest.raises(ValueError):
+        decode.unpack_ranges(
+            packed, np.array([9], dtype=np.int64), np.array([8], dtype=np.int64), np.array([0], dtype=np.int64),
+            np.empty(8, dtype=np.uint8)
+        )
@@ -0,0 +1,97 @@
+import dask
+import numpy as np
+import pytest
+
+from mio import reader
+
+tables = pytest.importorskip("casacore.tables")
+
+COLUMNS = ["TIME", "NAME", "GAIN", "UVW", "SCAN_NUMBER", "STATE", "DATA", "FLAG", "WEIGHT_SPECTRUM"]
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main):
+    table = reader.open(casacore_main)
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+def chunk_starts(array) -> np.ndarray:
+    return np.cumsum((0,) + array.chunks[0])
+
+
+@pytest.mark.parametrize("name", COLUMNS)
+def test_chunks_follow_storage_units(tables_pair, name):
+    table, reference = tables_pair
+
+    boundaries = table[name].manager.row_boundaries(name)
+    gap = int(np.max(np.diff(boundaries)))
+
+    array = table.to_dask(name, chunks=500)
+    starts = chunk_starts(array)
+
+    assert starts[0] == 0 and starts[-1] == table.nrows
+    assert set(starts.tolist()) <= set(boundaries.tolist()) | {0}
+
+    # Every chunk boundary is the storage unit boundary nearest to a multiple of the target.
+    assert len(array.chunks[0]) > 1
+    assert all(abs(size - 500) <= gap for size in array.chunks[0][:-1])
+
+    np.testing.assert_array_equal(array.compute(scheduler="threads"), np.asarray(reference.getcol(name)))
+
+
+def test_buckets_and_tiles_are_not_shared_by_chunks(tables_pair):
+    table, _ = tables_pair
+
+    # Storage units of the casacore table are much smaller than the table, a chunk per unit is one per boundary.
+    for name in ["TIME", "SCAN_NUMBER", "DATA", "WEIGHT_SPECTRUM"]:
+        boundaries = table[name].manager.row_boundaries(name)
+
+        np.testing.assert_array_equal(chunk_starts(table.to_dask(name, chunks=1)), np.union1d([0], boundaries))
+
+
+def test_auto_chunks_follow_the_dask_chunk_size(tables_pair):
+    table, reference = tables_pair
+
+    # 100 rows of DATA (16 x 4 complex64).
+    with dask.config.set({"array.chunk-size": "51200B"}):
+        array = table.to_dask("DATA")
+
+    assert 10 <= len(array.chunks[0]) <= 60
+    assert array.chunks[1:] == ((16,), (4,))
+
+    np.testing.assert_array_equal(array[1000:1100].compute(), reference.getcol("DATA", startrow=1000, nrow=100))
+
+
+def test_explicit_chunks_and_cells(tables_pair):
+    table, reference = tables_pair
+
+    array = table.to_dask("DATA", chunks=(1000, 1, 1999), cell=(slice(2, 6), 3))
+
+    assert array.chunks == ((1000, 1, 1999), (4,))
+    np.testing.assert_array_equal(array.compute(), reference.getcol("DATA")[:, 2:6, 3])
+
+    with pytest.raises(ValueError):
+        table.to_dask("DATA", chunks=(1000, 1000))
+
+    with pytest.raises(ValueError):
+        table.to_dask("DATA", chunks=1.5)
+
+
+def test_variable_shape_columns_raise(tables_pair):
+    table, _ = tables_pair
+
+    with pytest.raises(ValueError):
+        table.to_dask("VAR")
+
+
+def test_tasks_run_in_other_processes(tables_pair):
+    table, reference = tables_pair
+
+    array = table.to_dask("FLAG", chunks=700)
+
+    np.testing.assert_array_equal(array.compute(scheduler="processes", num_workers=2), reference.getcol("FLAG"))
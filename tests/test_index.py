@@ -0,0 +1,135 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import index
+from mio.utilities import tools
+
+tables = pytest.importorskip("casacore.tables")
+
+
+def query(reference, condition: str) -> np.ndarray:
+    return np.asarray(tables.taql(f"SELECT FROM $reference WHERE {condition}").rownumbers(), dtype=np.int64)
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main, tmp_path_factory):
+    table = reader.open(casacore_main)
+    table.build_index(location=tmp_path_factory.mktemp("index"))
+
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+def test_lookups_match_taql(tables_pair):
+    table, reference = tables_pair
+
+    # The casacore table has no ANTENNA2 column.
+    assert "TIME" in table.index and "SCAN_NUMBER" in table.index and "BASELINE" not in table.index
+
+    lookups = [
+        (table.index.time(4.9e9 + 60.0, 4.9e9 + 150.0), "TIME >= 4.9e9 + 60.0 && TIME <= 4.9e9 + 150.0"),
+        (table.index.time(start=4.9e9 + 300.0), "TIME >= 4.9e9 + 300.0"),
+        (table.index.time(end=4.9e9), "TIME <= 4.9e9"),
+        (table.index.scan(2), "SCAN_NUMBER == 2"),
+        (table.index.scan([1, 3, 99]), "SCAN_NUMBER IN [1, 3, 99]"),
+        (table.index.lookup("SCAN_NUMBER", (3, None)), "SCAN_NUMBER >= 3"),
+        (table.index.lookup("TIME", 4.9e9 + 1.5), "TIME == 4.9e9 + 1.5"),
+    ]
+
+    for ranges, condition in lookups:
+        np.testing.assert_array_equal(tools.ranges_to_rows(*ranges), query(reference, condition), err_msg=condition)
+
+    starts, stops = table.index.scan(1000)
+    assert starts.size == 0 and stops.size == 0
+
+
+@pytest.mark.parametrize("predicates", [
+    {"TIME": (4.9e9 + 45.0, 4.9e9 + 2000.0), "ANTENNA1": [2, 3]},
+    {"SCAN_NUMBER": [1, 4], "TIME": (None, 4.9e9 + 400.0)},
+    {"SCAN_NUMBER": 2, "STATE": "state_2"},
+])
+def test_selection_with_index_matches_selection_without(tables_pair, casacore_main, predicates):
+    table, _ = tables_pair
+
+    with reader.open(casacore_main) as plain:
+        assert plain.index is None
+
+        expected = plain.select(**predicates)
+
+    selection = table.select(**predicates)
+
+    assert selection.ranges == expected.ranges
+    np.testing.assert_array_equal(selection["DATA"], expected["DATA"])
+
+
+def test_baseline_lookups_match_taql(synthetic_ms, tmp_path):
+    path, _ = synthetic_ms(nrows=2000, nchannels=4, bucket_size=2048)
+
+    reference = tables.table(str(path), ack=False)
+
+    try:
+        with reader.open(path) as table:
+            table_index = table.build_index(location=tmp_path)
+
+            for antenna1, antenna2 in [(0, 1), (3, 5), (5, 3)]:
+                np.testing.assert_array_equal(
+                    tools.ranges_to_rows(*table_index.baseline(antenna1, antenna2)),
+                    query(reference, f"ANTENNA1 == {antenna1} && ANTENNA2 == {antenna2}")
+                )
+
+            selection = table.select(ANTENNA1=[0, 2], ANTENNA2=[1, 4])
+
+            np.testing.assert_array_equal(
+                selection.rows, query(reference, "ANTENNA1 IN [0, 2] && ANTENNA2 IN [1, 4]")
+            )
+
+    finally:
+        reference.close()
+
+
+def test_stored_index_is_reused_until_the_table_changes(casacore_main, tmp_path, monkeypatch):
+    path = tmp_path.joinpath("table.tab")
+    shutil.copytree(casacore_main, path)
+
+    with reader.open(path) as table:
+        table.build_index(location=tmp_path)
+        stored = index.index_path(tmp_path, table.measurement_set)
+
+    assert stored.is_file()
+
+    def build(measurement_set):
+        raise AssertionError("Index built again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(index, "build", build)
+
+        with reader.open(path) as table:
+            assert table.build_index(location=tmp_path).keys["SCAN_NUMBER"].rows.size == 3000
+
+    reference = tables.table(str(path), readonly=False, ack=False)
+    reference.addrows(10)
+    reference.putcol("SCAN_NUMBER", np.full(10, 99, dtype=np.int32), startrow=3000)
+    reference.close()
+
+    with reader.open(path) as table:
+        table_index = table.build_index(location=tmp_path)
+
+        np.testing.assert_array_equal(tools.ranges_to_rows(*table_index.scan(99)), np.arange(3000, 3010))
+
+
+def test_unreadable_index_is_rebuilt(casacore_main, tmp_path):
+    with reader.open(casacore_main) as table:
+        stored = index.index_path(tmp_path, table.measurement_set)
+        stored.write_bytes(b"not an index")
+
+        table_index = table.build_index(location=tmp_path)
+
+    assert table_index.keys["TIME"].rows.size == 3000
+    assert index.load(stored, table_index.signature) is not None
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from mio.core import binary
+from mio.core.casams import CasaMeasurementSet
+
+tables = pytest.importorskip("casacore.tables")
+
+# python-casacore stores int8 keywords as short and uint8/uint16 as int.
+KEYWORDS = {
+    "BOOL": True,
+    "INT8": np.int8(-5),
+    "SHORT": np.int16(-1234),
+    "USHORT": np.uint16(60000),
+    "INT": np.int32(-7),
+    "UINT": np.uint32(4000000000),
+    "INT64": np.int64(-2 ** 40),
+    "FLOAT": np.float32(1.5),
+    "DOUBLE": 2.25,
+    "COMPLEX": np.complex64(1 + 2j),
+    "DCOMPLEX": 3 - 4j,
+    "STRING": "keyword",
+}
+
+
+@pytest.fixture(scope="module")
+def keyword_table(tmp_path_factory):
+    path = tmp_path_factory.mktemp("keywords").joinpath("keywords.tab")
+
+    table = tables.table(str(path), tables.maketabdesc([tables.makescacoldesc("TIME", 0.0)]), nrow=1, ack=False)
+    table.putkeywords(KEYWORDS)
+    table.putkeyword("NESTED", dict(KEYWORDS))
+    table.putcolkeywords("TIME", KEYWORDS)
+    table.close()
+
+    reference = tables.table(str(path), ack=False)
+
+    yield path, reference.getkeywords(), reference.getcolkeywords("TIME")
+
+    reference.close()
+
+
+@pytest.mark.parametrize("memory_map", [True, False], ids=["mapped", "file"])
+@pytest.mark.parametrize("lazy", [True, False], ids=["lazy", "eager"])
+def test_scalar_keywords_match_casacore(keyword_table, memory_map, lazy):
+    path, keywords, column_keywords = keyword_table
+
+    measurement_set = CasaMeasurementSet(str(path.joinpath("table.dat")), memory_map=memory_map, lazy_keywords=lazy)
+    measurement_set.read()
+
+    records = measurement_set.table.keywords.records
+    nested = records["NESTED"].records
+    column = measurement_set.description[0].keywords.records
+
+    for name in KEYWORDS:
+        assert records[name] == keywords[name], name
+        assert nested[name] == keywords["NESTED"][name], name
+        assert column[name] == column_keywords[name], name
+
+
+@pytest.mark.parametrize("dtype, raw, value", [
+    (np.int8, b"\xfb", -5),
+    (np.uint8, b"\xc8", 200),
+    (np.int16, b"\x2e\xfb", -1234),
+    (np.uint16, b"\x60\xea", 60000),
+])
+def test_small_integers(tmp_path, dtype, raw, value):
+    # Magic code and a little endian object length, followed by the value.
+    data = b"\xbe\xbe\xbe\xbe\x01\x00\x00\x00" + raw
+    path = tmp_path.joinpath("values")
+    path.write_bytes(data)
+
+    buffer_reader = binary.BufferReader(data, endian="<")
+    buffer_reader.seek(8)
+
+    file_reader = binary.BinaryFileReader(str(path), mode="rb")
+    file_reader.seek(8)
+
+    try:
+        assert buffer_reader.integer(size=len(raw), dtype=dtype) == value
+        assert file_reader.integer(size=len(raw), dtype=dtype) == value
+
+    finally:
+        file_reader.close()
+
+
+def test_undecodable_strings_are_returned_raw(capsys, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(binary.logger, "warning", warnings.append)
+
+    raw = "café".encode("utf-8")
+    buffer_reader = binary.BufferReader(len(raw).to_bytes(4, "little") + raw, endian="<")
+
+    assert buffer_reader.string(size=4) == raw
+
+    # Reported through the logger, nothing is printed.
+    assert len(warnings) == 1 and "Couldn't decode" in warnings[0]
+    assert capsys.readouterr().out == ""
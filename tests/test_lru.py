@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import lru
+
+
+@pytest.fixture
+def cache():
+    """
+    Process wide cache, emptied and enabled for the test and restored afterwards.
+    """
+    shared = lru.shared()
+    budget = shared.budget
+
+    shared.resize("64MiB")
+    shared.clear()
+    shared.reset_statistics()
+
+    yield shared
+
+    shared.resize(budget)
+    shared.clear()
+    shared.reset_statistics()
+
+
+def test_eviction_order():
+    cache = lru.LRUCache(3 * 800)
+
+    for key in range(3):
+        cache.put(key, np.zeros(100))
+
+    # Touching 0 makes 1 the least recently used entry.
+    cache.get(0)
+    cache.put(3, np.zeros(100))
+
+    assert 1 not in cache
+    assert 0 in cache and 2 in cache and 3 in cache
+    assert cache.statistics()["evictions"] == 1
+
+
+def test_oversized_values_are_not_cached():
+    cache = lru.LRUCache(100)
+    cache.put("large", np.zeros(100))
+
+    assert len(cache) == 0
+
+
+def test_get_or_load_loads_once():
+    cache = lru.LRUCache(1 << 20)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return np.arange(10)
+
+    first = cache.get_or_load("key", load)
+    second = cache.get_or_load("key", load)
+
+    assert len(calls) == 1
+    assert first is second
+    assert not first.flags.writeable
+
+
+@pytest.mark.parametrize("name", ["TIME", "UVW", "FLAG", "DATA"])
+def test_cached_reads_match(cache, synthetic_ms, name):
+    path, generator = synthetic_ms(nrows=4000, nchannels=8, bucket_size=2048)
+    rows = np.array([5, 3999, 17, 2048, 6])
+
+    with reader.open(path) as table:
+        first = table[name][rows]
+        second = table[name][rows]
+
+    assert cache.statistics()["hits"] > 0
+    np.testing.assert_array_equal(first, generator.values(name, rows))
+    np.testing.assert_array_equal(second, first)
+
+
+def test_cell_slices_bypass_the_cache(cache, synthetic_ms):
+    path, generator = synthetic_ms(nrows=2000, nchannels=32)
+
+    with reader.open(path) as table:
+        values = table["DATA"][10:20, 4:8]
+
+    assert len(cache) == 0
+    np.testing.assert_array_equal(values, generator.values("DATA", np.arange(10, 20))[:, 4:8])
+
+
+def test_rewritten_table_is_not_served_from_the_cache(cache, synthetic_ms):
+    path, first = synthetic_ms(nrows=3000, nantennas=10)
+    rows = np.arange(0, 3000, 97)
+
+    with reader.open(path) as table:
+        np.testing.assert_array_equal(table["ANTENNA1"][rows], first.values("ANTENNA1", rows))
+
+    assert len(cache) > 0
+
+    # Same path, same sizes, different content.
+    _, second = synthetic_ms(nrows=3000, nantennas=11)
+
+    with reader.open(path) as table:
+        np.testing.assert_array_equal(table["ANTENNA1"][rows], second.values("ANTENNA1", rows))
+
+
+def test_reads_over_many_buckets_bypass_the_cache(cache, synthetic_ms):
+    path, generator = synthetic_ms(nrows=20000, nchannels=4, bucket_size=1024)
+    rows = np.arange(generator.nrows)
+
+    with reader.open(path) as table:
+        assert len(table["TIME"].manager.row_boundaries("TIME")) > lru.MAX_UNITS + 1
+
+        values = table["TIME"][:]
+
+    assert len(cache) == 0
+    np.testing.assert_array_equal(values, generator.values("TIME", rows))
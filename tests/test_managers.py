@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+
+from mio import reader
+
+tables = pytest.importorskip("casacore.tables")
+
+MANAGERS = {
+    "StandardStorageManager": ["TIME", "ANTENNA1", "FLAG_ROW", "NAME", "GAIN", "UVW"],
+    "IncrementalStorageManager": ["SCAN_NUMBER", "INTERVAL", "STATE"],
+    "TiledShapeStorageManager": ["DATA", "FLAG"],
+    "TiledColumnStorageManager": ["WEIGHT_SPECTRUM"],
+}
+
+COLUMNS = [(manager, name) for manager, names in MANAGERS.items() for name in names]
+
+ROW_SELECTIONS = {
+    "slice": slice(100, 2100),
+    "step": slice(5, 2900, 7),
+    "reverse": slice(2999, 0, -3),
+    "fancy": np.array([2999, 0, 17, 17, 1500, 64, 63, 2047, 2048]),
+    "integer": 1234,
+    "negative": -1,
+}
+
+
+def getcol(reference, name: str) -> np.ndarray:
+    # String columns come back as lists.
+    return np.asarray(reference.getcol(name))
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main):
+    table = reader.open(casacore_main)
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+@pytest.mark.parametrize("manager, name", COLUMNS)
+def test_full_column_matches_casacore(tables_pair, manager, name):
+    table, reference = tables_pair
+
+    assert type(table[name].manager).__name__ == manager
+
+    values = table[name][:]
+    expected = getcol(reference, name)
+
+    assert values.shape == expected.shape
+    np.testing.assert_array_equal(values, expected)
+
+
+@pytest.mark.parametrize("selection", list(ROW_SELECTIONS), ids=list(ROW_SELECTIONS))
+@pytest.mark.parametrize("manager, name", COLUMNS)
+def test_row_selection_matches_casacore(tables_pair, manager, name, selection):
+    table, reference = tables_pair
+    rows = ROW_SELECTIONS[selection]
+
+    np.testing.assert_array_equal(table[name][rows], getcol(reference, name)[rows])
+
+
+@pytest.mark.parametrize("name", ["DATA", "FLAG", "WEIGHT_SPECTRUM"])
+@pytest.mark.parametrize("cell", [
+    (slice(3, 11),),
+    (slice(None), 1),
+    (slice(2, 14, 3), slice(1, 3)),
+    (5, 2),
+    ([0, 7, 9], slice(None)),
+], ids=["channels", "correlation", "strided", "element", "fancy"])
+def test_cell_slicing_matches_casacore(tables_pair, name, cell):
+    table, reference = tables_pair
+    expected = getcol(reference, name)
+
+    rows = slice(50, 1900)
+
+    np.testing.assert_array_equal(table[name][(rows,) + cell], expected[(rows,) + cell])
+
+
+@pytest.mark.parametrize("cell", [(slice(1, 3),), (2,), ([2, 0],)], ids=["slice", "element", "fancy"])
+def test_direct_array_cell_slicing(tables_pair, cell):
+    table, reference = tables_pair
+    expected = getcol(reference, "UVW")
+
+    rows = slice(50, 1900)
+
+    np.testing.assert_array_equal(table["UVW"][(rows,) + cell], expected[(rows,) + cell])
+
+
+def test_indirect_cells_match_casacore(tables_pair):
+    table, reference = tables_pair
+    cells = table["VAR"].cells()
+
+    assert len(cells) == reference.nrows()
+
+    for row in range(reference.nrows()):
+        np.testing.assert_array_equal(cells[row], reference.getcell("VAR", row))
+
+
+def test_indirect_row_selection(tables_pair):
+    table, reference = tables_pair
+    rows = np.array([2500, 3, 3, 999, 0])
+    cells = table["VAR"].cells(rows)
+
+    for number, row in enumerate(rows):
+        np.testing.assert_array_equal(cells[number], reference.getcell("VAR", int(row)))
+
+
+@pytest.mark.parametrize("name", ["SCAN_NUMBER", "INTERVAL", "STATE"])
+def test_incremental_runs_expand_to_casacore(tables_pair, name):
+    table, reference = tables_pair
+    runs = table[name].runs()
+
+    np.testing.assert_array_equal(runs.expand(), getcol(reference, name))
+    assert len(runs.starts) < reference.nrows()
+
+
+@pytest.mark.parametrize("appends", [10, 14])
+def test_index_in_a_single_index_bucket(tmp_path, appends):
+    path = str(tmp_path.joinpath("index.tab"))
+
+    description = tables.maketabdesc([tables.makescacoldesc("TIME", 0.0), tables.makescacoldesc("ANTENNA1", 0)])
+    dminfo = {
+        "*1": {
+            "TYPE": "StandardStMan", "NAME": "SSM", "SPEC": {"BUCKETSIZE": 512}, "COLUMNS": ["TIME", "ANTENNA1"],
+        },
+    }
+
+    reference = tables.table(path, description, nrow=0, dminfo=dminfo, ack=False)
+
+    # Every flush writes the grown index, it ends up filling one dedicated index bucket.
+    for _ in range(appends):
+        first = reference.nrows()
+        reference.addrows(100)
+        reference.putcol("TIME", np.arange(first, first + 100) * 1.5, startrow=first)
+        reference.putcol("ANTENNA1", np.arange(first, first + 100) % 7, startrow=first)
+        reference.flush()
+
+    try:
+        with reader.open(path) as table:
+            manager = table["TIME"].manager
+            manager.open()
+
+            assert manager.header.nindex_buckets == 1 and manager.header.index_offset == 0
+
+            for name in ["TIME", "ANTENNA1"]:
+                np.testing.assert_array_equal(table[name][:], getcol(reference, name))
+
+    finally:
+        reference.close()
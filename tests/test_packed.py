@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import packed
+
+tables = pytest.importorskip("casacore.tables")
+
+ROW_SELECTIONS = {
+    "all": None,
+    "slice": slice(100, 2100),
+    "unaligned": slice(3, 2998),
+    "step": slice(5, 2900, 7),
+    "fancy": np.array([2999, 0, 17, 17, 1500, 64, 63, 2047, 2048]),
+}
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main):
+    table = reader.open(casacore_main)
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+@pytest.mark.parametrize("selection", list(ROW_SELECTIONS), ids=list(ROW_SELECTIONS))
+@pytest.mark.parametrize("name", ["FLAG", "FLAG_ROW"])
+def test_packed_matches_casacore(tables_pair, name, selection):
+    table, reference = tables_pair
+    rows = ROW_SELECTIONS[selection]
+
+    values = table[name].packed(rows=rows)
+    expected = reference.getcol(name)[rows if rows is not None else slice(None)]
+
+    assert isinstance(values, packed.PackedBool)
+    assert values.shape == expected.shape
+    assert values.nbytes == -(-expected.size // 8)
+
+    np.testing.assert_array_equal(values.unpack(), expected)
+
+
+def test_cell_selection(tables_pair):
+    table, reference = tables_pair
+
+    values = table["FLAG"].packed(rows=slice(10, 500), cell=(slice(2, 9), 1))
+
+    np.testing.assert_array_equal(values.unpack(), reference.getcol("FLAG", startrow=10, nrow=490)[:, 2:9, 1])
+
+
+def test_reductions_match_numpy(tables_pair):
+    table, reference = tables_pair
+
+    values = table["FLAG"].packed()
+    expected = reference.getcol("FLAG")
+
+    assert values.count() == np.count_nonzero(expected)
+
+    np.testing.assert_array_equal(values.count_rows(), expected.sum(axis=(1, 2)))
+    np.testing.assert_array_equal(values.count_cells(), expected.sum(axis=0))
+    np.testing.assert_array_equal(values.any_rows(), expected.any(axis=(1, 2)))
+    np.testing.assert_array_equal(values.all_rows(), expected.all(axis=(1, 2)))
+
+    # Three booleans per row aren't whole bytes.
+    narrow = table["FLAG"].packed(rows=slice(1, 1000), cell=(slice(0, 3), 0))
+
+    np.testing.assert_array_equal(narrow.count_rows(), expected[1:1000, :3, 0].sum(axis=1))
+    np.testing.assert_array_equal(narrow.any_rows(), expected[1:1000, :3, 0].any(axis=1))
+
+
+def test_indexing_and_operators_match_numpy(tables_pair):
+    table, reference = tables_pair
+
+    flag = table["FLAG"].packed()
+    flag_row = table["FLAG_ROW"].packed()
+
+    expected = reference.getcol("FLAG")
+    expected_row = reference.getcol("FLAG_ROW")
+
+    np.testing.assert_array_equal(flag[7], expected[7])
+    np.testing.assert_array_equal(flag[100:200, 3], expected[100:200, 3])
+    np.testing.assert_array_equal(flag[[5, 1, 5], :, 2], expected[[5, 1, 5], :, 2])
+    np.testing.assert_array_equal(flag.take(slice(8, 16)).unpack(), expected[8:16])
+
+    np.testing.assert_array_equal((~flag).unpack(), ~expected)
+    np.testing.assert_array_equal((~flag_row).unpack(), ~expected_row)
+    assert (~flag_row).count() == np.count_nonzero(~expected_row)
+
+    np.testing.assert_array_equal((flag | expected_row[:, None, None]).unpack(), expected | expected_row[:, None, None])
+    np.testing.assert_array_equal((flag & ~flag).unpack(), np.zeros_like(expected))
+
+    with pytest.raises(ValueError):
+        flag | flag_row
+
+
+def test_fill_and_mask_data(tables_pair):
+    table, reference = tables_pair
+
+    flag = table["FLAG"].packed(rows=slice(0, 1000))
+    expected = reference.getcol("FLAG", nrow=1000)
+    data = reference.getcol("DATA", nrow=1000)
+
+    np.testing.assert_array_equal(flag.fill(data.copy()), np.where(expected, 0, data))
+    np.testing.assert_array_equal(flag.masked(data).mask, expected)
+
+    with pytest.raises(ValueError):
+        flag.fill(data[:, :, :2].copy())
+
+
+def test_non_boolean_columns_raise(tables_pair):
+    table, _ = tables_pair
+
+    with pytest.raises(ValueError):
+        table["TIME"].packed()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from mio import reader
+
+
+@pytest.fixture(scope="module")
+def table(synthetic_main):
+    path, generator = synthetic_main
+
+    with reader.open(path) as table:
+        yield table
+
+
+@pytest.fixture(scope="module")
+def data(table):
+    return table["DATA"][:]
+
+
+def test_column_properties(table, synthetic_main):
+    _, generator = synthetic_main
+    column = table["DATA"]
+
+    assert column.shape == (generator.nrows, generator.nchannels, generator.ncorrelations)
+    assert column.ndim == 3
+    assert column.dtype == np.complex64
+    assert len(column) == generator.nrows
+    assert table["TIME"].cell_shape == tuple()
+    assert "DATA" in table and "NOT_A_COLUMN" not in table
+
+
+def test_unknown_column(table):
+    with pytest.raises(KeyError):
+        table["NOT_A_COLUMN"]
+
+
+@pytest.mark.parametrize("key", [
+    (slice(10, 20), slice(2, 5), 1),
+    (7,),
+    7,
+    (slice(None, None, 100), [1, 3]),
+    (-3, 0, slice(None)),
+], ids=["slices", "tuple-row", "row", "fancy-cell", "negative"])
+def test_indexing_follows_numpy(table, data, key):
+    np.testing.assert_array_equal(table["DATA"][key], data[key])
+
+
+@pytest.mark.parametrize("key", [
+    (Ellipsis, 0),
+    (slice(0, 20), Ellipsis, 1),
+    (3, Ellipsis),
+    Ellipsis,
+    (Ellipsis, 2, slice(1, 3)),
+    (slice(5, 9), 2, Ellipsis, 3),
+], ids=["cell", "rows-cell", "row", "all", "two-cell", "middle"])
+def test_ellipsis_follows_numpy(table, data, key):
+    np.testing.assert_array_equal(table["DATA"][key], data[key])
+
+
+def test_ellipsis_on_scalar_column(table):
+    np.testing.assert_array_equal(table["TIME"][...], table["TIME"][:])
+    assert table["TIME"][4, ...] == table["TIME"][4]
+
+
+@pytest.mark.parametrize("key", [(Ellipsis, Ellipsis), (0, Ellipsis, 1, 2, 3)], ids=["two", "too-many"])
+def test_bad_ellipsis(table, key):
+    with pytest.raises(IndexError):
+        table["DATA"][key]
+
+
+def test_truncated_bucket_file_raises(synthetic_ms):
+    path, _ = synthetic_ms(nrows=5000, nchannels=4, bucket_size=1024)
+
+    # A table.f0 caught while it is being written, the header already counts all buckets.
+    data = path.joinpath("table.f0").read_bytes()
+    path.joinpath("table.f0").write_bytes(data[:len(data) // 2])
+
+    with reader.open(path) as table:
+        assert table.nrows == 5000
+
+        with pytest.raises(ValueError, match="shorter than"):
+            table["TIME"][:]
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import lru
+
+from conftest import casacore_values, write_casacore_table
+
+tables = pytest.importorskip("casacore.tables")
+
+NAMES = ["TIME", "ANTENNA1", "UVW", "SCAN_NUMBER", "STATE", "DATA", "FLAG", "WEIGHT_SPECTRUM"]
+
+
+def append_rows(path, nrows: int):
+    """
+    Append rows with python-casacore, the values continue those of write_casacore_table().
+    """
+    table = tables.table(str(path), readonly=False, ack=False)
+    first = table.nrows()
+
+    values = casacore_values(first + nrows)
+    table.addrows(nrows)
+
+    for name in NAMES:
+        table.putcol(name, values[name][first:], startrow=first)
+
+    table.close()
+
+
+def getcol(path, name: str) -> np.ndarray:
+    reference = tables.table(str(path), ack=False)
+
+    try:
+        return np.asarray(reference.getcol(name))
+
+    finally:
+        reference.close()
+
+
+@pytest.fixture
+def growing(tmp_path):
+    path = tmp_path.joinpath("growing.tab")
+    write_casacore_table(path, nrows=500)
+
+    return path
+
+
+@pytest.fixture
+def cache():
+    shared = lru.shared()
+    budget = shared.budget
+
+    shared.resize("64MiB")
+    shared.clear()
+
+    yield shared
+
+    shared.resize(budget)
+    shared.clear()
+
+
+def test_refresh_reads_appended_rows(growing):
+    with reader.open(growing) as table:
+        assert table.refresh() is False
+
+        append_rows(growing, 700)
+
+        assert table.refresh() is True
+        assert table.nrows == 1200
+
+        for name in NAMES:
+            np.testing.assert_array_equal(table[name][:], getcol(growing, name), err_msg=name)
+
+
+def test_refresh_drops_cached_buckets(growing, cache):
+    with reader.open(growing) as table:
+        table["TIME"][np.array([3, 499])]
+        filename = str(table["TIME"].manager.filename())
+
+        assert any(key[0] == filename for key in cache.entries)
+
+        append_rows(growing, 100)
+        table.refresh()
+
+        assert not any(key[0] == filename for key in cache.entries)
+        np.testing.assert_array_equal(table["TIME"][np.array([3, 599])], getcol(growing, "TIME")[[3, 599]])
+
+
+@pytest.mark.parametrize("name", ["table.f0", "table.f1", "table.f2_TSM1", "table.f3_TSM0"])
+def test_refresh_waits_for_the_data_files(growing, name):
+    with reader.open(growing) as table:
+        before = table["TIME"][:]
+
+        append_rows(growing, 3000)
+
+        # Data file not flushed yet while table.lock already holds the new number of rows.
+        data = growing.joinpath(name).read_bytes()
+        growing.joinpath(name).write_bytes(data[:len(data) // 2])
+
+        assert table.refresh() is False
+        assert table.nrows == 500
+
+        growing.joinpath(name).write_bytes(data)
+
+        assert table.refresh() is True
+        assert table.nrows == 3500
+        np.testing.assert_array_equal(table["TIME"][:500], before)
+        np.testing.assert_array_equal(table["DATA"][:], getcol(growing, "DATA"))
+
+
+def test_follow_yields_appended_rows(growing):
+    with reader.open(growing) as table:
+        batches = table.follow(["TIME", "DATA"], interval=0.0, batch_rows=256, timeout=0.0)
+
+        append_rows(growing, 600)
+        values = list(batches)
+
+    assert [rows.stop - rows.start for rows, _ in values] == [256, 256, 88]
+    np.testing.assert_array_equal(np.concatenate([batch["TIME"] for _, batch in values]), getcol(growing, "TIME")[500:])
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from mio import reader
+
+tables = pytest.importorskip("casacore.tables")
+
+# Predicates of select() and the equivalent TaQL condition.
+PREDICATES = {
+    "value": ({"SCAN_NUMBER": 2}, "SCAN_NUMBER == 2"),
+    "list": ({"ANTENNA1": [0, 3, 7]}, "ANTENNA1 IN [0, 3, 7]"),
+    "range": ({"TIME": (4.9e9 + 60.0, 4.9e9 + 150.0)}, "TIME >= 4.9e9 + 60.0 && TIME <= 4.9e9 + 150.0"),
+    "open_range": ({"INTERVAL": (1.5, None)}, "INTERVAL >= 1.5"),
+    "string": ({"STATE": ["state_1", "state_4"]}, "STATE IN ['state_1', 'state_4']"),
+    "boolean": ({"FLAG_ROW": True}, "FLAG_ROW"),
+    "callable": ({"TIME": lambda values: values % 3.0 == 0.0}, "fmod(TIME, 3.0) == 0.0"),
+    "combined": (
+        {"SCAN_NUMBER": (2, 3), "ANTENNA1": {1, 2}, "STATE": "state_3", "NAME": ""},
+        "SCAN_NUMBER >= 2 && SCAN_NUMBER <= 3 && ANTENNA1 IN [1, 2] && STATE == 'state_3' && NAME == ''"
+    ),
+    "empty": ({"SCAN_NUMBER": 2, "STATE": "state_0"}, "SCAN_NUMBER == 2 && STATE == 'state_0'"),
+}
+
+
+@pytest.fixture(scope="module")
+def tables_pair(casacore_main):
+    table = reader.open(casacore_main)
+    reference = tables.table(casacore_main, ack=False)
+
+    yield table, reference
+
+    reference.close()
+    table.close()
+
+
+def query(reference, condition: str):
+    return tables.taql(f"SELECT FROM $reference WHERE {condition}")
+
+
+@pytest.mark.parametrize("predicates, condition", list(PREDICATES.values()), ids=list(PREDICATES))
+def test_rows_match_taql(tables_pair, predicates, condition):
+    table, reference = tables_pair
+
+    selection = table.select(**predicates)
+    expected = query(reference, condition)
+
+    np.testing.assert_array_equal(selection.rows, expected.rownumbers())
+    assert len(selection) == expected.nrows()
+
+    # Ranges are sorted, disjoint and not adjacent.
+    assert np.all(selection.starts < selection.stops)
+    assert np.all(selection.stops[:-1] < selection.starts[1:])
+
+
+@pytest.mark.parametrize("name", ["TIME", "NAME", "GAIN", "UVW", "STATE", "DATA", "FLAG", "WEIGHT_SPECTRUM"])
+def test_columns_match_taql(tables_pair, name):
+    table, reference = tables_pair
+
+    selection = table.select(ANTENNA1=[1, 5], SCAN_NUMBER=(2, 4))
+    expected = query(reference, "ANTENNA1 IN [1, 5] && SCAN_NUMBER >= 2 && SCAN_NUMBER <= 4")
+
+    assert expected.nrows() > 0
+    np.testing.assert_array_equal(selection[name], np.asarray(expected.getcol(name)))
+
+
+def test_cell_selection(tables_pair):
+    table, reference = tables_pair
+
+    selection = table.select(STATE="state_2")
+    expected = np.asarray(query(reference, "STATE == 'state_2'").getcol("DATA"))
+
+    np.testing.assert_array_equal(selection["DATA", 3:9, 0], expected[:, 3:9, 0])
+
+
+def test_read_columns(tables_pair):
+    table, reference = tables_pair
+
+    selection = table.select(TIME=(None, 4.9e9 + 30.0))
+    values = selection.read_columns(["TIME", "INTERVAL", "FLAG"], workers=2)
+    expected = query(reference, "TIME <= 4.9e9 + 30.0")
+
+    for name in ["TIME", "INTERVAL", "FLAG"]:
+        np.testing.assert_array_equal(values[name], expected.getcol(name))
+
+
+def test_chained_selection_matches_single_selection(tables_pair):
+    table, _ = tables_pair
+
+    chained = table.select(SCAN_NUMBER=[1, 3]).select(ANTENNA1=4).select(FLAG_ROW=False)
+    single = table.select(SCAN_NUMBER=[1, 3], ANTENNA1=4, FLAG_ROW=False)
+
+    assert chained.ranges == single.ranges
+
+
+def test_invalid_predicates_raise(tables_pair):
+    table, _ = tables_pair
+
+    with pytest.raises(KeyError):
+        table.select(FIELD_ID=0)
+
+    with pytest.raises(NotImplementedError):
+        table.select(UVW=0.0)
+
+    with pytest.raises(ValueError):
+        table.select(TIME=(0.0, 1.0, 2.0))
+
+    with pytest.raises(ValueError):
+        table.select(TIME=lambda values: values[:10] > 0)
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from mio import reader
+from mio.core import shared
+
+
+def column_sum(descriptor: shared.SharedArray) -> float:
+    try:
+        return float(descriptor.attach().sum())
+
+    finally:
+        shared.detach(descriptor)
+
+
+def exists(name: str) -> bool:
+    try:
+        shared_memory.SharedMemory(name=name).close()
+
+    except FileNotFoundError:
+        return False
+
+    return True
+
+
+@pytest.fixture
+def blocks():
+    with shared.SharedBlocks() as owner:
+        yield owner
+
+
+def test_read_shared_matches_columns(blocks, synthetic_ms):
+    path, generator = synthetic_ms(nrows=3000, nchannels=8)
+    rows = np.arange(100, 2900, 3)
+
+    with reader.open(path) as table:
+        descriptors = table.read_shared(["TIME", "UVW", "SCAN_NUMBER", "DATA", "FLAG"], rows=rows, blocks=blocks)
+
+    assert len(blocks) == 1
+    assert len(shared.block_names(descriptors)) == 1
+
+    for name, descriptor in descriptors.items():
+        assert descriptor.offset % shared.ALIGNMENT == 0
+        np.testing.assert_array_equal(descriptor.attach(), generator.values(name, rows), err_msg=name)
+
+
+def test_read_shared_strings(blocks, casacore_main):
+    tables = pytest.importorskip("casacore.tables")
+    reference = tables.table(casacore_main, ack=False)
+
+    try:
+        with reader.open(casacore_main) as table:
+            descriptors = table.read_shared(["NAME", "STATE"], blocks=blocks)
+
+        for name, descriptor in descriptors.items():
+            np.testing.assert_array_equal(descriptor.attach(), np.asarray(reference.getcol(name)), err_msg=name)
+
+    finally:
+        reference.close()
+
+
+def test_columns_without_fixed_shape_raise(blocks, casacore_main):
+    with reader.open(casacore_main) as table, pytest.raises(ValueError):
+        table.read_shared(["TIME", "VAR"], blocks=blocks)
+
+    assert len(blocks) == 0
+
+
+def test_blocks_outlive_their_tasks(blocks, synthetic_ms):
+    path, generator = synthetic_ms(nrows=2000, nchannels=4)
+
+    with reader.open(path) as table:
+        descriptors = table.read_shared(["TIME", "UVW"], blocks=blocks)
+
+    name = descriptors["TIME"].name
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = {column: blocks.track(executor.submit(column_sum, descriptor), descriptor)
+                   for column, descriptor in descriptors.items()}
+
+        # The owner hands its own reference over to the tasks.
+        blocks.release(descriptors)
+
+        results = {column: future.result() for column, future in futures.items()}
+
+    rows = np.arange(generator.nrows)
+
+    for column, result in results.items():
+        assert result == pytest.approx(generator.values(column, rows).sum())
+
+    assert len(blocks) == 0
+    assert not exists(name)
+
+
+def test_reference_counting(blocks):
+    descriptors, arrays = blocks.allocate({"a": (np.int32, (10,)), "b": (np.complex64, (3, 4))})
+    name = descriptors["a"].name
+
+    arrays["a"][:] = np.arange(10)
+
+    assert descriptors["b"].offset % shared.ALIGNMENT == 0
+    np.testing.assert_array_equal(descriptors["a"].attach(), np.arange(10))
+
+    blocks.retain(descriptors, count=2)
+    blocks.release(descriptors)
+    blocks.release(descriptors)
+
+    assert exists(name)
+
+    blocks.release(descriptors)
+
+    assert not exists(name)
+
+    with pytest.raises(KeyError):
+        blocks.retain(descriptors)
+
+    # Releasing a block that is gone already is a no-op.
+    blocks.release(descriptors)
+
+
+def test_close_unlinks_every_block():
+    owner = shared.SharedBlocks()
+    names = [next(iter(owner.allocate({"a": (np.float64, (8,))})[0].values())).name for _ in range(3)]
+
+    owner.close()
+
+    assert len(owner) == 0
+    assert not any(exists(name) for name in names)
@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+
+from mio import reader
+from mio.core import stats
+
+SECTIONS = ["header", "keywords", "private keywords", "columns", "data managers"]
+
+MANAGERS = [
+    "StandardStorageManager 0", "IncrementalStorageManager 1", "TiledShapeStorageManager 2",
+    "TiledColumnStorageManager 3"
+]
+
+
+def children(tree: dict) -> dict:
+    return {child["name"]: child for child in tree["children"]}
+
+
+def check_totals(tree: dict):
+    """
+    Counters of every section include those of its child sections.
+    """
+    for child in tree["children"]:
+        check_totals(child)
+
+    for counter in stats.COUNTERS:
+        assert tree[counter] >= sum(child[counter] for child in tree["children"])
+
+
+@pytest.mark.parametrize("memory_map", [True, False], ids=["mapped", "buffered"])
+def test_table_dat_sections(casacore_main, memory_map):
+    io_stats = stats.IOStats()
+
+    with reader.open(casacore_main, memory_map=memory_map, stats=io_stats) as table:
+        columns = table.columns
+
+        # Column data is read through the data manager files, only table.dat is instrumented.
+        nbytes = io_stats.bytes
+        table["DATA"][:100]
+
+        assert io_stats.bytes == nbytes
+
+    tree = io_stats.tree()
+    check_totals(tree)
+
+    (name, table_section), = children(tree).items()
+    sections = children(table_section)
+
+    assert name == table.path.name
+    assert list(sections) == SECTIONS
+    assert list(children(sections["columns"])) == columns
+    assert list(children(sections["data managers"])) == MANAGERS
+
+    assert table_section["calls"] == 1
+    assert all(section["bytes"] > 0 and section["reads"] > 0 for section in sections.values())
+    assert table_section["bytes"] == io_stats.bytes
+    assert io_stats.seeks == table_section["seeks"] > 0
+
+
+def test_mapped_and_buffered_reads_are_counted_alike(casacore_main):
+    counters = []
+
+    for memory_map in [True, False]:
+        io_stats = stats.IOStats()
+        reader.open(casacore_main, memory_map=memory_map, stats=io_stats).close()
+
+        counters.append((io_stats.bytes, io_stats.reads, io_stats.seeks))
+
+    assert counters[0] == counters[1]
+
+
+def test_repeated_opens_accumulate(casacore_main):
+    io_stats = stats.IOStats()
+
+    reader.open(casacore_main, stats=io_stats).close()
+    once = io_stats.tree()
+
+    reader.open(casacore_main, stats=io_stats).close()
+    twice = io_stats.tree()
+
+    assert children(twice)[children(once).popitem()[0]]["calls"] == 2
+
+    for counter in stats.COUNTERS:
+        assert twice[counter] == 2 * once[counter]
+
+    io_stats.reset()
+
+    assert io_stats.bytes == io_stats.reads == io_stats.seeks == 0
+    assert io_stats.tree()["children"] == []
+
+
+def test_sections_are_kept_per_thread():
+    io_stats = stats.IOStats()
+    barrier = threading.Barrier(4)
+
+    def work(name: str):
+        with io_stats.section(name):
+            # All threads are inside their own section while they record.
+            barrier.wait()
+
+            for _ in range(100):
+                io_stats.record(3)
+                io_stats.record_seek()
+
+    threads = [threading.Thread(target=work, args=(f"thread {number}",)) for number in range(4)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    sections = children(io_stats.tree())
+
+    assert sorted(sections) == [f"thread {number}" for number in range(4)]
+    assert all(section["bytes"] == 300 and section["reads"] == section["seeks"] == 100 for section in sections.values())
+    assert io_stats.bytes == 1200
+
+
+def test_renamed_sections():
+    io_stats = stats.IOStats()
+
+    for name in ["TIME", "DATA", "TIME"]:
+        with io_stats.section("columns"):
+            with io_stats.section("column") as section:
+                with io_stats.section("keywords"):
+                    io_stats.record(8)
+
+                section.name = name
+
+    columns = children(children(io_stats.tree())["columns"])
+
+    # Renaming to the name of an existing node accumulates into it.
+    assert list(columns) == ["TIME", "DATA"]
+    assert columns["TIME"]["calls"] == 2 and columns["TIME"]["bytes"] == 16
+    assert children(columns["TIME"])["keywords"]["calls"] == 2
+    assert columns["DATA"]["calls"] == 1 and columns["DATA"]["bytes"] == 8
+
+    report = io_stats.report().splitlines()
+
+    assert report[0].startswith("total:") and report[0].endswith("24 bytes, 3 reads, 0 seeks")
+    assert report[1].startswith("  columns:") and report[2].startswith("    TIME:")
+
+
+def test_disabled_sections():
+    assert stats.section(None, "header") is stats.DISABLED
+
+    with stats.section(None, "header"):
+        with stats.section(None, "keywords"):
+            pass
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from mio import reader
+from mio.core import stats
+
+tables = pytest.importorskip("casacore.tables")
+
+NANTENNAS = 12
+
+
+@pytest.fixture(scope="module")
+def measurement_set(tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp("subtables").joinpath("observation.ms"))
+
+    tables.default_ms(path).close()
+
+    with tables.table(f"{path}/ANTENNA", readonly=False, ack=False) as antenna:
+        antenna.addrows(NANTENNAS)
+        antenna.putcol("NAME", [f"ea{number:02d}" for number in range(NANTENNAS)])
+        antenna.putcol("POSITION", np.random.default_rng(2).normal(size=(NANTENNAS, 3)) * 1e6)
+        antenna.putcol("DISH_DIAMETER", np.full(NANTENNAS, 25.0))
+
+    with tables.table(f"{path}/SPECTRAL_WINDOW", readonly=False, ack=False) as window:
+        window.addrows(2)
+        window.putcol("NUM_CHAN", np.array([64, 64], dtype=np.int32))
+        window.putcol("REF_FREQUENCY", np.array([1.4e9, 1.5e9]))
+
+    return path
+
+
+def subtable_names(path: str) -> list:
+    with tables.table(path, ack=False) as reference:
+        return sorted(subtable.rstrip("/").split("/")[-1] for subtable in reference.getsubtables())
+
+
+def check_subtables(subtables: dict, path: str):
+    """
+    Compare the columns of the subtables with python-casacore.
+    """
+    for name, table in subtables.items():
+        with tables.table(f"{path}/{name}", ack=False) as reference:
+            assert table.nrows == reference.nrows(), name
+
+            for column in table.readable_columns():
+                if reference.nrows() > 0:
+                    np.testing.assert_array_equal(
+                        table[column][:], np.asarray(reference.getcol(column)), err_msg=f"{name}/{column}"
+                    )
+
+
+def test_subtables_are_opened_on_access(measurement_set):
+    with reader.open(measurement_set) as table:
+        assert sorted(table.subtables) == subtable_names(measurement_set)
+        assert len(table.subtables.tables) == 0
+
+        antenna = table.subtables["ANTENNA"]
+
+        assert list(table.subtables.tables) == ["ANTENNA"]
+        assert table.subtables["ANTENNA"] is antenna
+        assert antenna["NAME"][:].tolist() == [f"ea{number:02d}" for number in range(NANTENNAS)]
+
+        with pytest.raises(KeyError):
+            table.subtables["SYSCAL"]
+
+    assert len(table.subtables.tables) == 0
+
+
+@pytest.mark.parametrize("processes", [False, True], ids=["threads", "processes"])
+def test_prefetch_matches_casacore(measurement_set, processes):
+    with reader.open(measurement_set) as table:
+        # Subtables opened before the prefetch are kept.
+        antenna = table.subtables["ANTENNA"]
+
+        subtables = table.prefetch_subtables(workers=3, processes=processes)
+
+        assert sorted(subtables) == subtable_names(measurement_set)
+        assert subtables["ANTENNA"] is antenna
+        assert all(table.subtables[name] is subtable for name, subtable in subtables.items())
+
+        check_subtables(subtables, measurement_set)
+
+
+def test_prefetch_with_threads_shares_the_instrumentation(measurement_set):
+    io_stats = stats.IOStats()
+
+    with reader.open(measurement_set, stats=io_stats) as table:
+        table.prefetch_subtables(workers=4)
+
+    sections = {child["name"]: child for child in io_stats.tree()["children"]}
+
+    for name in subtable_names(measurement_set):
+        assert sections[name]["bytes"] > 0, name
+
+
+def test_prefetch_with_processes_uses_the_cache(measurement_set, tmp_path):
+    directory = tmp_path.joinpath("cache")
+
+    with reader.open(measurement_set, cache=directory) as table:
+        table.prefetch_subtables(workers=2, processes=True)
+
+    assert len(list(directory.glob("*.mio"))) == len(subtable_names(measurement_set)) + 1
+
+    io_stats = stats.IOStats()
+
+    with reader.open(measurement_set, cache=directory, stats=io_stats) as table:
+        check_subtables(table.prefetch_subtables(workers=2), measurement_set)
+
+    assert io_stats.bytes == 0
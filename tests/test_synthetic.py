@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from mio import reader
+
+
+def test_columns_match_generator(synthetic_main):
+    path, generator = synthetic_main
+    rows = np.arange(generator.nrows)
+
+    with reader.open(path) as table:
+        assert table.nrows == generator.nrows
+        assert table.columns == [column.name for column in generator.columns]
+
+        for name in table.columns:
+            np.testing.assert_array_equal(table[name][:], generator.values(name, rows), err_msg=name)
+
+
+def test_random_rows_match_generator(synthetic_main):
+    path, generator = synthetic_main
+    rows = np.random.default_rng(1).integers(0, generator.nrows, 200)
+
+    with reader.open(path) as table:
+        for name in table.columns:
+            np.testing.assert_array_equal(table[name][rows], generator.values(name, rows), err_msg=name)
+
+
+def test_nested_keywords(synthetic_main):
+    path, generator = synthetic_main
+
+    with reader.open(path) as table:
+        keywords = table.keywords
+
+    assert keywords["MS_VERSION"] == 2.0
+    assert keywords["SYNTHETIC"].records["LEVEL"] == 1
+    assert keywords["SYNTHETIC"].records["CHILD"].records["NAME"] == "level_2"
+
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_casacore_reads_synthetic_tables(synthetic_ms, endian):
+    tables = pytest.importorskip("casacore.tables")
+
+    path, generator = synthetic_ms(nrows=1500, nchannels=8, bucket_size=2048, endian=endian)
+    rows = np.arange(generator.nrows)
+
+    reference = tables.table(str(path), ack=False)
+
+    try:
+        for name in reference.colnames():
+            np.testing.assert_array_equal(reference.getcol(name), generator.values(name, rows), err_msg=name)
+
+    finally:
+        reference.close()
+
+
+def test_multiple_tile_rows_and_buckets(synthetic_ms):
+    path, generator = synthetic_ms(nrows=20000, nchannels=4, bucket_size=1024, tile_shape=(4, 4, 100))
+
+    with reader.open(path) as table:
+        assert len(table["TIME"].manager.row_boundaries("TIME")) > 10
+        assert len(table["DATA"].manager.row_boundaries("DATA")) > 10
+
+        rows = slice(9950, 10250)
+        expected = generator.values("DATA", np.arange(20000)[rows])
+
+        np.testing.assert_array_equal(table["DATA"][rows], expected)